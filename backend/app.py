@@ -37,6 +37,17 @@ def create_app():
     app.register_blueprint(chatbot_bp, url_prefix="/api/chatbot") 
     app.register_blueprint(history_bp, url_prefix="/api/history") # Add this line
     
+    # Models load lazily on first use. With PRELOAD_MODELS they are loaded and
+    # warmed up here instead; under `gunicorn --preload` this runs once in the
+    # master so forked workers share the loaded models.
+    from model_registry import registry
+    if app.config.get("PRELOAD_MODELS"):
+        registry.warmup()
+    
+    # Replaced model files are loaded, smoke-tested and swapped in by a
+    # background thread, without restarting workers
+    registry.start_watcher(app.config.get("MODEL_WATCH_INTERVAL", 0))
+    
     # Root test route
     @app.route("/")
     def index():
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item inference requests into batches.
+
+    Request threads call submit() with one preprocessed input and block on the
+    returned Future. A single background thread drains the queue, waiting at
+    most max_wait_ms for up to max_batch_size items, runs one forward pass on
+    the stacked batch and hands each row of the output back to its caller.
+
+    Items can carry a context (e.g. the model snapshot they must run on),
+    passed to predict_fn as its second argument; only items with the same
+    context are batched together.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=16, max_wait_ms=10, name="batcher"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms) / 1000.0)
+        self.name = name
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_batch_seen = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+        self._total_infer = 0.0
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def submit(self, item, context=None):
+        """Queue a single input (without batch dimension) and return a Future."""
+        future = Future()
+        with self._cond:
+            self._ensure_started()
+            self._queue.append((item, future, time.perf_counter(), context))
+            self._cond.notify()
+        return future
+
+    def predict(self, item, timeout=None, context=None):
+        """Convenience wrapper: submit and wait for the result."""
+        return self.submit(item, context).result(timeout=timeout)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _collect(self):
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            if self._stopped and not self._queue:
+                return []
+
+            # Wait for the batch to fill up, but never longer than max_wait
+            # measured from the arrival of the oldest request.
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._stopped:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Items of another context stay queued, in order, for the next batch
+            context = self._queue[0][3]
+            batch = []
+            deferred = []
+            while self._queue and len(batch) < self.max_batch_size:
+                entry = self._queue.popleft()
+                (batch if entry[3] is context else deferred).append(entry)
+            self._queue.extendleft(reversed(deferred))
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                if self._stopped:
+                    return
+                continue
+
+            started = time.perf_counter()
+            items = [entry[0] for entry in batch]
+            futures = [entry[1] for entry in batch]
+
+            try:
+                outputs = self.predict_fn(np.stack(items), batch[0][3])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                outputs = None
+
+            finished = time.perf_counter()
+            if outputs is not None:
+                for i, future in enumerate(futures):
+                    future.set_result(outputs[i])
+
+            self._record(batch, started, finished)
+
+    def _record(self, batch, started, finished):
+        waits = [started - entry[2] for entry in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._total_wait += sum(waits)
+            self._max_wait_seen = max(self._max_wait_seen, max(waits))
+            self._total_infer += finished - started
+
+    def stats(self):
+        with self._stats_lock:
+            batches = self._batches or 1
+            items = self._items or 1
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "queue_depth": len(self._queue),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_batch_size": round(self._items / batches, 2),
+                "largest_batch": self._max_batch_seen,
+                "avg_queue_wait_ms": round(self._total_wait / items * 1000, 2),
+                "max_queue_wait_ms": round(self._max_wait_seen * 1000, 2),
+                "avg_inference_ms": round(self._total_infer / batches * 1000, 2),
+            }
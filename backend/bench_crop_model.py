@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from compact_forest import CompactForest, compile_forest
+
+# Value ranges of the crop dataset, in model input order
+# (N, P, K, temperature, humidity, ph, rainfall)
+FEATURE_LOW = np.array([0, 5, 5, 8, 14, 3.5, 20])
+FEATURE_HIGH = np.array([140, 145, 205, 44, 100, 10, 300])
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(FEATURE_LOW, FEATURE_HIGH, size=(n, len(FEATURE_LOW)))
+
+
+def check_parity(pipeline, compact, X):
+    expected = pipeline.predict_proba(X)
+    actual = compact.predict_proba(X)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)))
+    print(f"Parity on {len(X)} rows: max probability difference {max_diff:.2e}, top-1 agreement {agreement:.4%}")
+    return max_diff, agreement
+
+
+def time_call(fn, X, min_seconds=0.5):
+    fn(X)  # warm up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1000
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python bench_crop_model.py <model.joblib> [compact.npz]")
+        sys.exit(1)
+
+    saved_data = joblib.load(sys.argv[1])
+    pipeline = saved_data["pipeline"]
+    if len(sys.argv) > 2 and os.path.exists(sys.argv[2]):
+        compact = CompactForest.load(sys.argv[2])
+    else:
+        compact = CompactForest(compile_forest(pipeline, saved_data["label_encoder"], saved_data["features"]))
+
+    print("=" * 50)
+    check_parity(pipeline, compact, random_inputs(max(BATCH_SIZES)))
+
+    print("=" * 50)
+    print(f"{'batch':>8} {'sklearn ms':>12} {'compact ms':>12} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        X = random_inputs(size, seed=size)
+        sklearn_ms = time_call(pipeline.predict_proba, X)
+        compact_ms = time_call(compact.predict_proba, X)
+        print(f"{size:>8} {sklearn_ms:>12.3f} {compact_ms:>12.3f} {sklearn_ms / compact_ms:>7.1f}x")
@@ -0,0 +1,143 @@
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from market_processing import to_frame, filter_crop_frame, price_history_frame, history_records, filter_crop_records, build_price_history
+
+COMMODITIES = ["Wheat", "Rice", "Maize", "Tomato", "Potato", "Onion", "Cotton", "Dry Chillies", "Banana - Green"]
+RECORD_COUNTS = [200, 2000, 10000, 100000, 1000000]
+
+
+def random_records(n, seed=0):
+    """A synthetic AgMarkNet dump: string prices, a few invalid ones, about two years of dates."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    dates = [(start + timedelta(days=int(day))).strftime("%d/%m/%Y") for day in range(730)]
+    modal = rng.uniform(500, 6000, n).round(0).astype(int).astype(str)
+    modal[rng.random(n) < 0.02] = "NR"
+    commodity = rng.integers(0, len(COMMODITIES), n)
+    date = rng.integers(0, len(dates), n)
+    market = rng.integers(0, 500, n)
+    return [{
+        "state": "Andhra Pradesh",
+        "district": "Guntur",
+        "market": f"Market {market[i]}",
+        "commodity": COMMODITIES[commodity[i]],
+        "arrival_date": dates[date[i]],
+        "min_price": "400",
+        "max_price": "7000",
+        "modal_price": modal[i],
+    } for i in range(n)]
+
+
+def legacy_history(records, api_crops, crop):
+    """
+    The per-record loops the market routes used before (filter_crop_records,
+    process_real_data and their helpers), for parity and comparison.
+    """
+    def is_valid_price(price_str):
+        try:
+            price = float(price_str)
+            return price > 0 and price < 1000000
+        except:
+            return False
+
+    def is_valid_date(date_str):
+        try:
+            datetime.strptime(date_str, "%d/%m/%Y")
+            return True
+        except:
+            return False
+
+    crop_records = []
+    for record in records:
+        try:
+            commodity = record.get("commodity", "").lower()
+            if any(name.lower() in commodity for name in api_crops) or crop in commodity:
+                crop_records.append(record)
+        except Exception:
+            continue
+
+    price_history = []
+    for record in crop_records:
+        modal_price = record.get("modal_price", "0")
+        min_price = record.get("min_price", "0")
+        max_price = record.get("max_price", "0")
+        date_str = record.get("arrival_date", "")
+        if modal_price and is_valid_price(modal_price):
+            price_value = float(modal_price)
+        elif min_price and max_price and is_valid_price(min_price) and is_valid_price(max_price):
+            price_value = (float(min_price) + float(max_price)) / 2
+        else:
+            price_value = None
+        if price_value and date_str and is_valid_date(date_str):
+            price_history.append({
+                "date": date_str,
+                "price": round(price_value, 2),
+                "market": record.get("market", "Unknown Market"),
+                "state": record.get("state", "Unknown State"),
+                "district": record.get("district", "Unknown District"),
+                "commodity": record.get("commodity", crop),
+            })
+
+    unique_dates = {}
+    for record in price_history:
+        if record["date"] not in unique_dates or record["price"] > unique_dates[record["date"]]["price"]:
+            unique_dates[record["date"]] = record
+    price_history = list(unique_dates.values())
+    price_history.sort(key=lambda x: datetime.strptime(x["date"], "%d/%m/%Y"))
+    return price_history
+
+
+def columnar_history(records, api_crops, crop):
+    return price_history_frame(filter_crop_frame(to_frame(records), api_crops, crop), crop)
+
+
+def loop_history(records, api_crops, crop):
+    """The path live API records take (lists of dicts)"""
+    return build_price_history(filter_crop_records(records, api_crops, crop), crop)
+
+
+def time_call(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or RECORD_COUNTS
+    api_crops, crop = ["Wheat"], "wheat"
+
+    print("=" * 50)
+    records = random_records(20000, seed=1)
+    expected = legacy_history(records, api_crops, crop)
+    actual = history_records(columnar_history(records, api_crops, crop))
+    mismatches = sum(
+        (a["date"], a["price"], a["market"]) != (b["date"], b["price"], b["market"])
+        for a, b in zip(expected, actual)
+    )
+    print(f"Parity on {len(records)} records: {len(expected)} vs {len(actual)} dates, {mismatches} mismatches")
+    looped = loop_history(records, api_crops, crop)
+    print(f"Loop path matches the columnar path: {looped == actual}")
+
+    print("=" * 50)
+    # "frame s" is building the DataFrame from dicts, which pulls from the
+    # local store skip; "columnar s" is the processing itself. "loop s" is
+    # the path lists of API records take
+    print(f"{'records':>9} {'legacy s':>10} {'loop s':>9} {'frame s':>9} {'columnar s':>11} {'speedup':>8} {'w/ frame':>9}")
+    for n in counts:
+        records = random_records(n, seed=n)
+        legacy_s = time_call(legacy_history, records, api_crops, crop, repeat=1)
+        loop_s = time_call(loop_history, records, api_crops, crop)
+        frame_s = time_call(to_frame, records, repeat=1)
+        columnar_s = time_call(columnar_history, to_frame(records), api_crops, crop)
+        print(
+            f"{n:>9} {legacy_s:>10.4f} {loop_s:>9.4f} {frame_s:>9.4f} {columnar_s:>11.4f} "
+            f"{legacy_s / columnar_s:>7.1f}x {legacy_s / (frame_s + columnar_s):>8.1f}x"
+        )
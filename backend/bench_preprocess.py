@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from image_preprocess import legacy_preprocess, preprocess
+
+# Sample leaf images shipped with the frontend
+SAMPLE_IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "images")
+
+
+def load_samples(folder):
+    image_extensions = ('.jpg', '.jpeg', '.png')
+    samples = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(image_extensions):
+            with open(os.path.join(folder, name), "rb") as f:
+                samples.append((name, f.read()))
+    return samples
+
+
+def time_path(fn, samples, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for _, data in samples:
+            fn(data)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeats * len(samples)) * 1000
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else SAMPLE_IMAGES_DIR
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    samples = load_samples(folder)
+    if not samples:
+        print(f"No images found in {folder}")
+        sys.exit(1)
+
+    total_mb = sum(len(data) for _, data in samples) / (1024 * 1024)
+    print(f"Benchmarking {len(samples)} images ({total_mb:.1f} MB) from {folder}, {repeats} repeats")
+    print("=" * 50)
+
+    # Warm up both paths once
+    time_path(legacy_preprocess, samples, 1)
+    time_path(preprocess, samples, 1)
+
+    legacy_ms = time_path(legacy_preprocess, samples, repeats)
+    fast_ms = time_path(preprocess, samples, repeats)
+
+    print(f"Legacy path: {legacy_ms:.2f} ms/image")
+    print(f"Fast path:   {fast_ms:.2f} ms/image")
+    print(f"Speedup:     {legacy_ms / fast_ms:.2f}x")
+
+    # Pixel-level difference between the two paths
+    diffs = [
+        float(np.mean(np.abs(legacy_preprocess(data) - preprocess(data))))
+        for _, data in samples
+    ]
+    print(f"Mean absolute pixel difference: {np.mean(diffs):.4f} (max per image {np.max(diffs):.4f})")
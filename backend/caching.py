@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU cache with a fixed number of entries. With a ttl
+    (seconds), entries older than that are treated as missing and dropped.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                value, expires_at = self._data[key]
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expired += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+class SWRCache:
+    """
+    Cache for values fetched from slow upstream services.
+
+    Entries are fresh for ttl seconds. For stale_ttl seconds after that they
+    are still served while a single background refresh runs
+    (stale-while-revalidate). Concurrent misses for the same key share one
+    fetch, and when a fetch fails the last known value is served instead of
+    the error, however old it is.
+
+    ttl_for, when given, returns the fresh ttl of a particular value, for
+    values that should be refetched sooner than the rest (partial results).
+    """
+
+    def __init__(self, ttl, stale_ttl=0, maxsize=1024, workers=4, name="swr", ttl_for=None):
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self._entries = LRUCache(maxsize)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-refresh")
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.stale_on_error = 0
+
+    def get(self, key, fetch):
+        return self.get_entry(key, fetch)[0]
+
+    def get_entry(self, key, fetch):
+        """
+        Returns (value, fetched_at) for key, calling fetch() (no arguments)
+        when the cached value is missing or too old to serve.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.time() - entry[1]
+            ttl = self.ttl_for(entry[0]) if self.ttl_for else self.ttl
+            if age < ttl:
+                self.hits += 1
+                return entry
+            if age < ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return entry
+
+        self.misses += 1
+        try:
+            return self._fetch(key, fetch)
+        except Exception:
+            self.errors += 1
+            if entry is not None:
+                self.stale_on_error += 1
+                return entry
+            raise
+
+    def _fetch(self, key, fetch):
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            self.coalesced += 1
+            return future.result()
+
+        try:
+            entry = (fetch(), time.time())
+            self._entries.set(key, entry)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def warm(self, key, fetch, max_age=0):
+        """
+        Fetches key now unless its cached value is younger than max_age
+        seconds. Used by prefetchers to keep entries from going stale.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] < max_age:
+            return entry
+        return self._fetch(key, fetch)
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._inflight:
+                return
+        self._executor.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key, fetch):
+        self.refreshes += 1
+        try:
+            self._fetch(key, fetch)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error refreshing {self.name} entry {key}: {e}")
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "stale_on_error": self.stale_on_error,
+            "hit_rate": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+        }
\ No newline at end of file
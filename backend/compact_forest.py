@@ -0,0 +1,168 @@
+import sys
+
+import numpy as np
+
+# Upper bound on (rows x trees x classes) leaf values gathered at once
+_CHUNK_ELEMENTS = 4_000_000
+
+
+def _split_pipeline(pipeline):
+    """
+    Returns (mean, scale, forest) for a StandardScaler + RandomForest pipeline
+    (or a bare forest), with identity scaling when there is no scaler.
+    """
+    steps = [step for _, step in pipeline.steps] if hasattr(pipeline, "steps") else [pipeline]
+    forest = steps[-1]
+    mean = np.zeros(forest.n_features_in_)
+    scale = np.ones(forest.n_features_in_)
+    if len(steps) > 2 or (len(steps) == 2 and type(steps[0]).__name__ != "StandardScaler"):
+        raise ValueError("Only a StandardScaler can be folded into the trees")
+    if len(steps) == 2:
+        scaler = steps[0]
+        if scaler.mean_ is not None:
+            mean = scaler.mean_
+        if scaler.scale_ is not None:
+            scale = scaler.scale_
+    return mean, scale, forest
+
+
+def compile_forest(pipeline, label_encoder, features):
+    """
+    Flattens a fitted random forest into contiguous arrays, one row per node
+    across all trees:
+
+      feature, threshold   split of each node (raw, unscaled feature units)
+      left, right          global index of each child
+      value                class probabilities of each node
+
+    The StandardScaler is folded into the thresholds ((x - mean) / scale <= t
+    is x <= t * scale + mean), so inputs are used as they arrive. Leaves
+    point to themselves with an infinite threshold, which lets every row walk
+    the same number of steps regardless of where it stops.
+    """
+    mean, scale, forest = _split_pipeline(pipeline)
+    features_col, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        feature = np.where(is_leaf, 0, tree.feature)
+        threshold = np.where(is_leaf, np.inf, tree.threshold * scale[feature] + mean[feature])
+        left = np.where(is_leaf, node_ids, tree.children_left) + offset
+        right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+
+        features_col.append(feature)
+        thresholds.append(threshold)
+        lefts.append(left)
+        rights.append(right)
+        values.append(value / totals)
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        "feature": np.concatenate(features_col).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "value": np.concatenate(values).astype(np.float32),
+        "roots": np.array(roots, dtype=np.int32),
+        "max_depth": np.int32(max_depth),
+        "classes": np.asarray(label_encoder.inverse_transform(forest.classes_)).astype(str),
+        "features": np.asarray(features, dtype=str),
+    }
+
+
+def save_compact(path, arrays):
+    np.savez_compressed(path, **arrays)
+
+
+class CompactForest:
+    """
+    Pure-NumPy evaluator for arrays produced by compile_forest. All rows walk
+    all trees together: each of the max_depth steps is one gather and one
+    comparison over a (rows, trees) index matrix, with none of sklearn's
+    per-call validation or per-tree dispatch.
+    """
+
+    def __init__(self, arrays):
+        self.feature = np.ascontiguousarray(arrays["feature"])
+        self.threshold = np.ascontiguousarray(arrays["threshold"])
+        self.value = np.ascontiguousarray(arrays["value"])
+        self.roots = np.ascontiguousarray(arrays["roots"]).astype(np.intp)
+        self.max_depth = int(arrays["max_depth"])
+        self.classes_ = np.asarray(arrays["classes"])
+        self.features = [str(f) for f in arrays["features"]]
+        self.n_features = len(self.features)
+
+        # Children interleaved so one gather picks either side
+        left = np.asarray(arrays["left"], dtype=np.intp)
+        right = np.asarray(arrays["right"], dtype=np.intp)
+        self.children = np.stack([left, right], axis=1).ravel()
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def leaves(self, X):
+        """
+        Global leaf index reached by every row in every tree. (row, tree)
+        pairs that reach a leaf are retired every few steps, so deep
+        branches do not keep the whole batch walking.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n, n_trees = X.shape[0], len(self.roots)
+        flat = X.ravel()
+        nodes = np.tile(self.roots, n)
+        row_offsets = np.repeat(np.arange(n, dtype=np.intp) * self.n_features, n_trees)
+        positions = np.arange(n * n_trees)
+        out = np.empty_like(nodes)
+        for step in range(self.max_depth):
+            go_right = flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+            if step % 3 == 2 or step == self.max_depth - 1:
+                done = self.is_leaf[nodes]
+                out[positions[done]] = nodes[done]
+                active = ~done
+                nodes, row_offsets, positions = nodes[active], row_offsets[active], positions[active]
+                if not len(nodes):
+                    break
+        # Only reached for a forest of single-leaf trees
+        out[positions] = nodes
+        return out.reshape(n, n_trees)
+
+    def predict_proba(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        n_trees = len(self.roots)
+        chunk = max(1, _CHUNK_ELEMENTS // (n_trees * self.value.shape[1]))
+        proba = np.empty((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start in range(0, X.shape[0], chunk):
+            nodes = self.leaves(X[start:start + chunk])
+            proba[start:start + chunk] = self.value[nodes].sum(axis=1, dtype=np.float64)
+        proba /= n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+if __name__ == "__main__":
+    # Compile an existing joblib artifact: python compact_forest.py <model.joblib> <out.npz>
+    import joblib
+
+    if len(sys.argv) != 3:
+        print("Usage: python compact_forest.py <model.joblib> <out.npz>")
+        sys.exit(1)
+    saved_data = joblib.load(sys.argv[1])
+    arrays = compile_forest(saved_data["pipeline"], saved_data["label_encoder"], saved_data["features"])
+    save_compact(sys.argv[2], arrays)
+    print(f"Saved compact model ({len(arrays['feature'])} nodes, {len(arrays['roots'])} trees) to: {sys.argv[2]}")
@@ -13,7 +13,66 @@ class Config:
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"  # Use FLASK_DEBUG instead of FLASK_ENV
     WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
     MARKET_API_KEY = os.getenv("MARKET_API_KEY")
+    HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))  # pooled connections per upstream host
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.3"))  # seconds, doubled per retry
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "16"))
+    MARKET_TIMEOUT = float(os.getenv("MARKET_TIMEOUT", "15"))
+    MARKET_HTTP_WORKERS = int(os.getenv("MARKET_HTTP_WORKERS", "6"))  # AgMarkNet calls in flight per process
+    MARKET_CACHE_TTL = int(os.getenv("MARKET_CACHE_TTL", "1800"))  # seconds
+    MARKET_STALE_TTL = int(os.getenv("MARKET_STALE_TTL", "21600"))  # served stale while refreshing
+    MARKET_SNAPSHOT_PULL_LIMIT = int(os.getenv("MARKET_SNAPSHOT_PULL_LIMIT", "2000"))  # records in the shared upstream pull
+    MARKET_SNAPSHOT_PARTIAL_TTL = int(os.getenv("MARKET_SNAPSHOT_PARTIAL_TTL", "120"))  # seconds, for snapshots missing crops
+    MARKET_SNAPSHOT_CONCURRENCY = int(os.getenv("MARKET_SNAPSHOT_CONCURRENCY", "2"))  # crops fetched at once (3 calls each)
+    MARKET_INGEST_INTERVAL = int(os.getenv("MARKET_INGEST_INTERVAL", "21600"))  # seconds between runs of `python market_ingest.py --loop`
+    MARKET_STORE_CHECK_INTERVAL = int(os.getenv("MARKET_STORE_CHECK_INTERVAL", "60"))  # seconds between checks for newly ingested prices
+    MARKET_INGEST_PAGE_SIZE = int(os.getenv("MARKET_INGEST_PAGE_SIZE", "500"))
+    MARKET_INGEST_TIMEOUT = float(os.getenv("MARKET_INGEST_TIMEOUT", "30"))
+    WEATHER_CURRENT_TTL = int(os.getenv("WEATHER_CURRENT_TTL", "600"))  # seconds
+    WEATHER_FORECAST_TTL = int(os.getenv("WEATHER_FORECAST_TTL", "3600"))
+    WEATHER_STALE_TTL = int(os.getenv("WEATHER_STALE_TTL", "3600"))  # served stale while refreshing
+    WEATHER_TIMEOUT = float(os.getenv("WEATHER_TIMEOUT", "5"))
+    WEATHER_BULK_MAX_DISTRICTS = int(os.getenv("WEATHER_BULK_MAX_DISTRICTS", "500"))
+    WEATHER_BULK_CONCURRENCY = int(os.getenv("WEATHER_BULK_CONCURRENCY", "8"))
+    WEATHER_PREFETCH = os.getenv("WEATHER_PREFETCH", "False").lower() == "true"  # web workers only
+    WEATHER_PREFETCH_TOP_N = int(os.getenv("WEATHER_PREFETCH_TOP_N", "50"))  # 0 disables the prefetcher
+    WEATHER_PREFETCH_HOURS = os.getenv("WEATHER_PREFETCH_HOURS", "5-9")  # local hours, e.g. "5-9" or "5,6,12"
+    WEATHER_PREFETCH_INTERVAL = int(os.getenv("WEATHER_PREFETCH_INTERVAL", "540"))  # seconds
     ML_MODEL_PATH = os.getenv("ML_MODEL_PATH", "./ml_models/crop_model.pkl")
-    PEST_MODEL_PATH = os.getenv("PEST_MODEL_PATH", "./ml_models/pest_model.h5")
+    PEST_MODEL_PATH = os.getenv("PEST_MODEL_PATH", "plant_disease_model_final.h5")
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "./uploads")
+    PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "False").lower() == "true"
+    MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))  # seconds, 0 disables hot reload
+    RECOMMEND_TOP_N = int(os.getenv("RECOMMEND_TOP_N", "3"))
+    RECOMMEND_BATCH_MAX_ROWS = int(os.getenv("RECOMMEND_BATCH_MAX_ROWS", "10000"))
+    CROP_MODEL_BACKEND = os.getenv("CROP_MODEL_BACKEND", "auto")  # sklearn, compact or auto
+    CROP_COMPACT_MODEL_PATH = os.getenv("CROP_COMPACT_MODEL_PATH", "./ml_models/crop_model_compact.npz")
+    CROP_COMPACT_MAX_ROWS = int(os.getenv("CROP_COMPACT_MAX_ROWS", "256"))  # auto: larger batches use sklearn
+    SUITABILITY_CACHE_TTL = int(os.getenv("SUITABILITY_CACHE_TTL", "3600"))  # seconds
+    RECOMMEND_CACHE_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", "4096"))
+    RECOMMEND_CACHE_TTL = int(os.getenv("RECOMMEND_CACHE_TTL", "86400"))  # seconds
+    RECOMMEND_CACHE_BATCH_ROWS = int(os.getenv("RECOMMEND_CACHE_BATCH_ROWS", "32"))  # larger batches only read the cache
+    PEST_MODEL_BACKEND = os.getenv("PEST_MODEL_BACKEND", "keras")  # keras, tflite or onnx
+    PEST_TFLITE_PATH = os.getenv("PEST_TFLITE_PATH", "plant_disease_model.tflite")
+    PEST_ONNX_PATH = os.getenv("PEST_ONNX_PATH", "plant_disease_model.onnx")
+    PEST_NUM_THREADS = int(os.getenv("PEST_NUM_THREADS", "0")) or None
+    PEST_BATCH_SIZE = int(os.getenv("PEST_BATCH_SIZE", "16"))
+    PEST_BATCH_WAIT_MS = float(os.getenv("PEST_BATCH_WAIT_MS", "10"))
+    PEST_PREDICT_TIMEOUT = float(os.getenv("PEST_PREDICT_TIMEOUT", "30"))
+    PEST_CACHE_SIZE = int(os.getenv("PEST_CACHE_SIZE", "2048"))
+    PEST_CACHE_RETENTION_HOURS = int(os.getenv("PEST_CACHE_RETENTION_HOURS", "168"))  # rows of other model versions
+    PEST_PREVIEW_SIZE = int(os.getenv("PEST_PREVIEW_SIZE", "384"))
+    PEST_CALIBRATION_PATH = os.getenv("PEST_CALIBRATION_PATH", "pest_calibration.json")
+    PEST_TOP_K = int(os.getenv("PEST_TOP_K", "3"))
+    PEST_REVIEW_THRESHOLD = float(os.getenv("PEST_REVIEW_THRESHOLD", "0.6"))
+    PEST_MAX_IMAGE_PIXELS = int(os.getenv("PEST_MAX_IMAGE_PIXELS", "48000000"))
+    PEST_BATCH_MAX_IMAGES = int(os.getenv("PEST_BATCH_MAX_IMAGES", "50"))
+    PEST_DECODE_WORKERS = int(os.getenv("PEST_DECODE_WORKERS", "4"))
+    PEST_JOB_DB = os.getenv("PEST_JOB_DB", "./uploads/pest_jobs.sqlite3")
+    PEST_JOB_WORKERS = int(os.getenv("PEST_JOB_WORKERS", "2"))
+    PEST_JOB_RETENTION_HOURS = int(os.getenv("PEST_JOB_RETENTION_HOURS", "24"))
+    PEST_JOB_MAX_WAIT = float(os.getenv("PEST_JOB_MAX_WAIT", "30"))
+    # Comma-separated hosts job callbacks may be posted to; empty allows any public host
+    PEST_CALLBACK_ALLOWED_HOSTS = {host.strip().lower() for host in os.getenv("PEST_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
\ No newline at end of file
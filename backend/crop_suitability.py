@@ -0,0 +1,271 @@
+# crop_suitability.py
+"""
+District-level crop suitability tables.
+
+An offline job (`python crop_suitability.py`, e.g. nightly from cron) runs
+the crop model over a grid of N/P/K values for every (district, season, soil
+type) cell that occurs in the farmers table and stores the top crops of each
+grid point in crop_suitability. The recommend blueprint then answers coarse
+queries and whole-district rankings from an in-memory copy of those rows.
+"""
+import itertools
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from caching import LRUCache
+from models import db, Farmer, Recommendation, CropSuitability
+
+SEASONS = ("kharif", "rabi", "zaid")
+
+# Typical seasonal weather (placeholder values), used for districts without
+# enough recorded submissions for the season
+SEASON_PROFILES = {
+    "kharif": {"temperature": 28.0, "humidity": 80.0, "rainfall": 200.0},
+    "rabi": {"temperature": 20.0, "humidity": 60.0, "rainfall": 50.0},
+    "zaid": {"temperature": 32.0, "humidity": 50.0, "rainfall": 40.0},
+}
+
+# Typical pH per soil type (placeholder values)
+SOIL_PH = {
+    "alluvial": 7.0, "black": 7.8, "red": 6.2, "laterite": 5.5,
+    "sandy": 6.5, "loamy": 6.8, "clay": 7.2, "clayey": 7.2,
+}
+DEFAULT_SOIL_PH = 6.8
+UNKNOWN_SOIL = "unknown"
+
+# Nutrient levels (kg/ha) spanning the training data
+NUTRIENT_GRID = {
+    "n": (20, 50, 80, 110, 140),
+    "p": (10, 40, 70, 100, 130),
+    "k": (15, 40, 80, 150, 200),
+}
+
+# Crops kept per grid point
+SUITABILITY_TOP_N = 5
+
+# filled_inputs sources of values taken from the tables or SEASON_PROFILES
+PROFILE_SOURCES = ("district_profile", "season_profile")
+
+# Submissions needed before a district's own weather replaces the profile
+MIN_WEATHER_SAMPLES = 5
+
+
+def normalize(value):
+    return (value or "").strip().lower()
+
+
+def snap_to_grid(field, value):
+    levels = np.asarray(NUTRIENT_GRID[field])
+    return int(levels[np.abs(levels - float(value)).argmin()])
+
+
+def seasonal_weather(days=365):
+    """
+    Median temperature, humidity and rainfall per (district, season) from the
+    recommendations farmers submitted in the last `days` days.
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = db.session.query(Farmer.district, Recommendation.input_json).join(
+        Recommendation, Recommendation.farmer_id == Farmer.id
+    ).filter(Recommendation.created_at >= since).all()
+
+    samples = {}
+    for district, inputs in rows:
+        if not district or not isinstance(inputs, dict):
+            continue
+        season = normalize(inputs.get("season")) or "kharif"
+        # Values the recommender filled in from these same profiles would
+        # only feed them back
+        filled = inputs.get("filled_inputs") or {}
+        if any(filled.get(field) in PROFILE_SOURCES for field in ("temperature", "humidity", "rainfall")):
+            continue
+        try:
+            values = [float(inputs[field]) for field in ("temperature", "humidity", "rainfall")]
+        except (KeyError, TypeError, ValueError):
+            continue
+        samples.setdefault((normalize(district), season), []).append(values)
+
+    weather = {}
+    for key, values in samples.items():
+        if len(values) >= MIN_WEATHER_SAMPLES:
+            temperature, humidity, rainfall = np.median(np.array(values), axis=0)
+            weather[key] = {"temperature": temperature, "humidity": humidity, "rainfall": rainfall}
+    return weather
+
+
+def build_tables(predict_proba, model_version=None):
+    """
+    Recomputes every suitability cell. predict_proba takes an (n, 7) matrix in
+    model input order and returns (crop names, probabilities). Returns the
+    number of rows written.
+    """
+    pairs = db.session.query(Farmer.district, Farmer.soil_type).filter(
+        Farmer.district.isnot(None)
+    ).distinct().all()
+    soils = {}
+    for district, soil_type in pairs:
+        if normalize(district):
+            soils.setdefault(normalize(district), set()).add(normalize(soil_type) or UNKNOWN_SOIL)
+
+    weather = seasonal_weather()
+    grid = np.array(list(itertools.product(*NUTRIENT_GRID.values())), dtype=float)
+
+    records = []
+    for district, soil_types in sorted(soils.items()):
+        # One model pass per district covering all its seasons and soil types
+        cells = []
+        blocks = []
+        for season, soil_type in itertools.product(SEASONS, sorted(soil_types)):
+            profile = weather.get((district, season), SEASON_PROFILES[season])
+            ph = SOIL_PH.get(soil_type, DEFAULT_SOIL_PH)
+            block = np.empty((len(grid), 7))
+            block[:, :3] = grid
+            block[:, 3] = profile["temperature"]
+            block[:, 4] = profile["humidity"]
+            block[:, 5] = ph
+            block[:, 6] = profile["rainfall"]
+            blocks.append(block)
+            cells.extend((season, soil_type) for _ in range(len(grid)))
+
+        X = np.vstack(blocks)
+        crop_names, probabilities = predict_proba(X)
+        top_n = min(SUITABILITY_TOP_N, probabilities.shape[1])
+        candidates = np.argpartition(-probabilities, top_n - 1, axis=1)[:, :top_n]
+        candidate_probs = np.take_along_axis(probabilities, candidates, axis=1)
+        order = np.argsort(-candidate_probs, axis=1)
+        top_indices = np.take_along_axis(candidates, order, axis=1)
+        top_probs = np.take_along_axis(candidate_probs, order, axis=1)
+
+        for row, (season, soil_type) in enumerate(cells):
+            n, p, k, temperature, humidity, ph, rainfall = X[row]
+            records.append({
+                "district": district,
+                "season": season,
+                "soil_type": soil_type,
+                "n": int(n), "p": int(p), "k": int(k),
+                "temperature": round(float(temperature), 2),
+                "humidity": round(float(humidity), 2),
+                "ph": float(ph),
+                "rainfall": round(float(rainfall), 2),
+                "ranking_json": [
+                    [str(crop_names[i]), round(float(prob), 4)]
+                    for i, prob in zip(top_indices[row], top_probs[row]) if prob > 0
+                ],
+                "model_version": model_version,
+            })
+
+    # Replace the previous tables in one transaction
+    CropSuitability.query.delete()
+    if records:
+        db.session.execute(CropSuitability.__table__.insert(), records)
+    db.session.commit()
+    return len(records)
+
+
+class SuitabilityIndex:
+    """
+    Per-process copy of the suitability tables. A district's cells are
+    loaded with one indexed query on first use and kept for ttl seconds, so
+    lookups after that are dictionary reads.
+    """
+
+    def __init__(self, maxsize=512, ttl=3600):
+        self.cells = LRUCache(maxsize, ttl=ttl)
+        self.rankings = LRUCache(maxsize * 4, ttl=ttl)
+
+    def district_cells(self, district):
+        key = normalize(district)
+        cells = self.cells.get(key)
+        if cells is None:
+            cells = {}
+            for row in CropSuitability.query.filter_by(district=key).all():
+                cells[(row.season, row.soil_type, row.n, row.p, row.k)] = {
+                    "season": row.season,
+                    "soil_type": row.soil_type,
+                    "n": row.n, "p": row.p, "k": row.k,
+                    "temperature": row.temperature,
+                    "humidity": row.humidity,
+                    "ph": row.ph,
+                    "rainfall": row.rainfall,
+                    "ranking": row.ranking_json,
+                    "model_version": row.model_version,
+                }
+            # Districts without tables aren't cached, so a table built after
+            # the first miss is picked up on the next lookup
+            if cells:
+                self.cells.set(key, cells)
+        return cells
+
+    def lookup(self, district, season, soil_type, n, p, k):
+        """
+        The cell nearest to the given nutrients, or None when the district,
+        season or soil type has no table.
+        """
+        cells = self.district_cells(district)
+        key = (normalize(season), normalize(soil_type) or UNKNOWN_SOIL,
+               snap_to_grid("n", n), snap_to_grid("p", p), snap_to_grid("k", k))
+        return cells.get(key)
+
+    def district_weather(self, district, season):
+        """
+        Typical weather the district's tables were built with for the season
+        ({temperature, humidity, rainfall}), or None.
+        """
+        for cell in self.district_cells(district).values():
+            if cell["season"] == normalize(season):
+                return {field: cell[field] for field in ("temperature", "humidity", "rainfall")}
+        return None
+
+    def district_ranking(self, district, season, soil_type=None):
+        """
+        Crops ranked by their mean probability over all nutrient grid points
+        of the district (restricted to one soil type when given), with the
+        share of grid points where each crop ranks first.
+        """
+        key = (normalize(district), normalize(season), normalize(soil_type))
+        ranking = self.rankings.get(key)
+        if ranking is not None:
+            return ranking
+
+        selected = [
+            cell for (cell_season, cell_soil, _, _, _), cell in self.district_cells(district).items()
+            if cell_season == key[1] and (not key[2] or cell_soil == key[2])
+        ]
+        totals = {}
+        firsts = {}
+        for cell in selected:
+            for position, (crop, prob) in enumerate(cell["ranking"]):
+                totals[crop] = totals.get(crop, 0.0) + prob
+                if position == 0:
+                    firsts[crop] = firsts.get(crop, 0) + 1
+        ranking = [
+            {
+                "crop": crop,
+                "score": round(total / len(selected), 4),
+                "top_share": round(firsts.get(crop, 0) / len(selected), 4),
+            }
+            for crop, total in sorted(totals.items(), key=lambda item: -item[1])
+        ]
+        if ranking:
+            self.rankings.set(key, ranking)
+        return ranking
+
+    def clear(self):
+        self.cells.clear()
+        self.rankings.clear()
+
+
+if __name__ == "__main__":
+    from app import create_app
+    from model_registry import registry
+    from routes.recommend import predict_crop_proba
+
+    app = create_app()
+    with app.app_context():
+        saved_data, version = registry.snapshot("crop")
+        if not saved_data:
+            print("Crop model is not available, suitability tables not built")
+            raise SystemExit(1)
+        count = build_tables(lambda X: predict_crop_proba(X, saved_data), model_version=version)
+        print(f"Saved {count} suitability cells (model version {version})")
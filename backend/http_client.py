@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP client. One pooled requests.Session keeps TCP/TLS
+    connections to each upstream alive between calls, with at most
+    max_per_host connections per host (further requests wait for a free
+    one). Every request gets a default timeout, and idempotent requests
+    are retried with exponential backoff on connection errors and 429/5xx
+    responses.
+
+    gather() and first() run several calls concurrently on a shared thread
+    pool.
+    """
+
+    def __init__(self, max_per_host=10, max_hosts=20, retries=2, backoff=0.3, timeout=10, workers=16):
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts, pool_maxsize=max_per_host, pool_block=True, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-client")
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def gather(self, *calls):
+        """
+        Runs zero-argument callables concurrently and returns their results in
+        order. The first exception (in call order) is re-raised.
+        """
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def first(self, calls, accept=bool, timeout=None):
+        """
+        Runs zero-argument callables concurrently and returns the first
+        result for which accept(result) is true, or None when none is
+        accepted within timeout seconds. Calls that raise are skipped; the
+        remaining ones are left to finish in the background.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        pending = {self._executor.submit(call) for call in calls}
+        while pending:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Concurrent upstream call failed: {e}")
+                    continue
+                if accept(result):
+                    for other in pending:
+                        other.cancel()
+                    return result
+        return None
+
+
+# Shared by all blueprints
+http_client = HttpClient(
+    max_per_host=Config.HTTP_MAX_PER_HOST,
+    retries=Config.HTTP_RETRIES,
+    backoff=Config.HTTP_BACKOFF,
+    timeout=Config.HTTP_TIMEOUT,
+    workers=Config.HTTP_WORKERS
+)
+
+# AgMarkNet calls are slow and retried, so they run on their own pool and
+# can't starve the weather calls of the shared one
+market_http_client = HttpClient(
+    max_per_host=Config.HTTP_MAX_PER_HOST,
+    retries=Config.HTTP_RETRIES,
+    backoff=Config.HTTP_BACKOFF,
+    timeout=Config.MARKET_TIMEOUT,
+    workers=Config.MARKET_HTTP_WORKERS
+)
@@ -0,0 +1,82 @@
+import io
+import threading
+
+import numpy as np
+from PIL import Image
+
+# Input size the plant disease model was trained on
+MODEL_INPUT_SIZE = (160, 160)
+
+# Default cap on decoded pixels (about a 48 MP photo)
+DEFAULT_MAX_PIXELS = 48_000_000
+
+_local = threading.local()
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload would decode to more pixels than allowed."""
+
+
+def open_image(data, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    Opens image bytes lazily and rejects decompression bombs before any pixel
+    data is decoded (Image.open only parses the header).
+    """
+    img = Image.open(io.BytesIO(data))
+    width, height = img.size
+    if max_pixels and width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"Image is {width}x{height} ({width * height} pixels), limit is {max_pixels}"
+        )
+    return img
+
+
+def decode_image(data, min_size=MODEL_INPUT_SIZE, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    Decodes an upload to RGB at the smallest resolution that still covers
+    min_size. JPEGs use draft mode, so the DCT decoder scales by 1/2, 1/4 or
+    1/8 while decoding instead of producing full-resolution pixels that would
+    be thrown away by the resize.
+    """
+    img = open_image(data, max_pixels=max_pixels)
+    if img.format == "JPEG":
+        img.draft("RGB", min_size)
+    return img.convert("RGB")
+
+
+def _input_buffer(size):
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or buffer.shape[:2] != (size[1], size[0]):
+        buffer = np.empty((size[1], size[0], 3), dtype=np.float32)
+        _local.buffer = buffer
+    return buffer
+
+
+def to_model_input(img, out=None, size=MODEL_INPUT_SIZE):
+    """
+    Resizes a decoded RGB image and writes the normalized float32 pixels into
+    out. Without out, a per-thread preallocated buffer is reused, so the caller
+    must copy (np.stack does) before preprocessing the next image on the same
+    thread.
+    """
+    if img.size != size:
+        img = img.resize(size, Image.BILINEAR, reducing_gap=2.0)
+    if out is None:
+        out = _input_buffer(size)
+    np.multiply(np.asarray(img, dtype=np.uint8), np.float32(1.0 / 255.0), out=out, casting="unsafe")
+    return out
+
+
+def preprocess(data, out=None, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    Bytes to model input in one step.
+    """
+    return to_model_input(decode_image(data, max_pixels=max_pixels), out=out)
+
+
+def legacy_preprocess(data):
+    """
+    Previous full-resolution path, kept for benchmarks and parity checks.
+    """
+    img = Image.open(io.BytesIO(data)).convert("RGB").resize(MODEL_INPUT_SIZE)
+    return np.array(img, dtype=np.float32) / 255.0
@@ -0,0 +1,236 @@
+# market_ingest.py
+"""
+Local store of AgMarkNet mandi prices.
+
+MarketIngestor pages through the AgMarkNet resource and upserts new and
+changed records into market_prices, so the market endpoints answer from
+indexed range queries instead of a live upstream call. Ingestion runs in
+its own process, never inside the web workers:
+
+    python market_ingest.py           # one incremental run, e.g. from cron
+    python market_ingest.py --loop    # every MARKET_INGEST_INTERVAL seconds
+    python market_ingest.py --full    # re-page the whole resource
+"""
+import threading
+import time
+from datetime import datetime
+
+from http_client import market_http_client
+from models import db, MarketPrice
+
+# Column lengths of market_prices
+FIELD_LENGTHS = {"state": 64, "district": 64, "market": 128, "commodity": 128, "variety": 128, "grade": 64}
+
+
+def parse_price(value):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if 0 < price < 1000000 else None
+
+
+def parse_record(record):
+    """
+    One AgMarkNet record as a market_prices row, or None when it has no valid
+    arrival date or price.
+    """
+    try:
+        arrival_date = datetime.strptime(record.get("arrival_date", ""), "%d/%m/%Y").date()
+    except ValueError:
+        return None
+    min_price = parse_price(record.get("min_price"))
+    max_price = parse_price(record.get("max_price"))
+    modal_price = parse_price(record.get("modal_price"))
+    if modal_price is None and min_price is not None and max_price is not None:
+        modal_price = (min_price + max_price) / 2
+    if modal_price is None:
+        return None
+
+    row = {
+        field: (record.get(field) or "").strip()[:length]
+        for field, length in FIELD_LENGTHS.items()
+    }
+    if not row["commodity"]:
+        return None
+    row.update({
+        "arrival_date": arrival_date,
+        "min_price": min_price,
+        "max_price": max_price,
+        "modal_price": modal_price,
+        "updated_at": datetime.utcnow(),
+    })
+    return row
+
+
+def record_key(row):
+    return (row["commodity"], row["variety"], row["grade"], row["market"], row["district"], row["state"], row["arrival_date"])
+
+
+def record_prices(row):
+    return (row["min_price"], row["max_price"], row["modal_price"])
+
+
+def changed_rows(rows):
+    """
+    The rows that are not stored yet or whose prices differ from the stored
+    ones, looked up with one query per page.
+    """
+    if not rows:
+        return []
+    stored = db.session.query(
+        MarketPrice.commodity, MarketPrice.variety, MarketPrice.grade, MarketPrice.market,
+        MarketPrice.district, MarketPrice.state, MarketPrice.arrival_date,
+        MarketPrice.min_price, MarketPrice.max_price, MarketPrice.modal_price
+    ).filter(
+        MarketPrice.commodity.in_({row["commodity"] for row in rows}),
+        MarketPrice.market.in_({row["market"] for row in rows}),
+        MarketPrice.arrival_date.in_({row["arrival_date"] for row in rows})
+    ).all()
+    stored = {tuple(record[:7]): tuple(record[7:]) for record in stored}
+    return [row for row in rows if stored.get(record_key(row)) != record_prices(row)]
+
+
+def upsert_prices(rows):
+    """
+    Inserts rows into market_prices, updating the prices of records already
+    stored (same commodity, variety, grade, market, district, state and
+    date). Committed with the caller's session.
+    """
+    if not rows:
+        return
+    table = MarketPrice.__table__
+    updated = ("min_price", "max_price", "modal_price", "updated_at")
+    if db.engine.dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        statement = statement.on_duplicate_key_update({
+            column: statement.inserted[column] for column in updated
+        })
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["commodity", "variety", "grade", "market", "district", "state", "arrival_date"],
+            set_={column: statement.excluded[column] for column in updated}
+        )
+    db.session.execute(statement, rows)
+
+
+class MarketIngestor:
+    """
+    Pages through the AgMarkNet resource, newest arrival dates first, and
+    upserts the new and changed records of every page into market_prices,
+    committing page by page so an interrupted run keeps what it loaded.
+
+    Runs are incremental: the newest arrival date stored when the run starts
+    is the watermark, and paging stops at the first page that is entirely
+    stored already and older than the watermark. Unchanged records are not
+    rewritten, so updated_at tells when prices last changed. A full run
+    pages through everything.
+    """
+
+    def __init__(self, base_url, api_key, page_size=500, interval=0, timeout=30):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.page_size = page_size
+        self.interval = interval
+        self.timeout = timeout
+        self._run_lock = threading.Lock()
+        self.runs = 0
+        self.last_run = None
+        self.last_stored = 0
+        self.last_error = None
+
+    def fetch_page(self, offset):
+        response = market_http_client.get(self.base_url, params={
+            "api-key": self.api_key,
+            "format": "json",
+            "limit": self.page_size,
+            "offset": offset,
+            "sort[arrival_date]": "desc",
+        }, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def run_once(self, max_pages=None, full=False):
+        """
+        Ingests new and changed records (every page when full, at most
+        max_pages) and returns the number of records stored. Must run inside
+        an app context.
+        """
+        with self._run_lock:
+            offset = 0
+            pages = 0
+            stored = 0
+            try:
+                watermark = None if full else db.session.query(db.func.max(MarketPrice.arrival_date)).scalar()
+                while True:
+                    data = self.fetch_page(offset)
+                    records = data.get("records", [])
+                    rows = [row for row in map(parse_record, records) if row]
+                    changed = changed_rows(rows)
+                    upsert_prices(changed)
+                    db.session.commit()
+
+                    stored += len(changed)
+                    offset += len(records)
+                    pages += 1
+                    total = int(data.get("total") or 0)
+                    if not records or offset >= total or (max_pages and pages >= max_pages):
+                        break
+                    if watermark is not None and not changed and all(row["arrival_date"] < watermark for row in rows):
+                        print(f"Reached records stored before {watermark}, stopping")
+                        break
+                self.last_error = None
+            except Exception as e:
+                db.session.rollback()
+                self.last_error = str(e)
+                print(f"Error ingesting market prices at offset {offset}: {e}")
+
+            self.runs += 1
+            self.last_run = time.time()
+            self.last_stored = stored
+            print(f"Ingested {stored} market price records from {pages} pages")
+
+        return stored
+
+    def run_forever(self, app):
+        """Runs an incremental ingestion every interval seconds, in this process."""
+        while True:
+            try:
+                with app.app_context():
+                    self.run_once()
+            except Exception as e:
+                print(f"Error in scheduled market ingestion: {e}")
+            time.sleep(self.interval)
+
+    def stats(self):
+        """Runs made by this process (the ingestion process, not web workers)."""
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "last_stored": self.last_stored,
+            "last_error": self.last_error,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app import create_app
+    from routes.market import market_ingestor
+
+    parser = argparse.ArgumentParser(description="Ingest AgMarkNet prices into market_prices")
+    parser.add_argument("--loop", action="store_true", help="keep running every MARKET_INGEST_INTERVAL seconds")
+    parser.add_argument("--full", action="store_true", help="page through the whole resource")
+    parser.add_argument("--max-pages", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app()
+    if args.loop:
+        market_ingestor.run_forever(app)
+    else:
+        with app.app_context():
+            market_ingestor.run_once(max_pages=args.max_pages, full=args.full)
@@ -0,0 +1,336 @@
+"""
+Columnar processing of AgMarkNet records.
+
+The market endpoints turn raw records (or rows from market_prices) into a
+price history: match the crop's commodity names, coerce and validate the
+prices, drop rows without a valid arrival date, keep the highest price per
+date and sort by date. Stored ranges, which arrive as DataFrames, go
+through whole-column pandas operations once they are large enough; lists of
+API records go through a plain loop, which beats building a DataFrame from
+them (see bench_market_processing.py).
+"""
+import math
+import re
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+MAX_PRICE = 1000000  # rupees per quintal, anything above is a data entry error
+DATE_FORMAT = "%d/%m/%Y"
+
+# DataFrame rows from which the pandas path beats converting them to dicts
+# for the loop
+COLUMNAR_MIN_ROWS = 1000
+
+TEXT_DEFAULTS = {
+    "market": "Unknown Market",
+    "state": "Unknown State",
+    "district": "Unknown District",
+}
+
+# Spellings used by AgMarkNet that differ from our crop names
+EXTRA_NEEDLES = {
+    "chilli": ["chilli", "chili"],
+    "corn": ["maize", "corn"],
+}
+
+
+def _by_unique(column, convert, fill_value=np.nan):
+    """
+    convert() applied to the distinct values of a column only and broadcast
+    back (missing values become fill_value). Commodity names, dates and
+    prices repeat across markets, so this avoids parsing the same string
+    thousands of times.
+    """
+    codes, uniques = pd.factorize(column)
+    converted = np.asarray(convert(pd.Series(uniques)))
+    result = pd.api.extensions.take(converted, codes, allow_fill=True, fill_value=fill_value)
+    return pd.Series(result, index=column.index)
+
+
+def to_frame(records):
+    """Records (dicts) as a DataFrame; a DataFrame is returned unchanged."""
+    if isinstance(records, pd.DataFrame):
+        return records
+    return pd.DataFrame.from_records(records)
+
+
+def crop_needles(api_crops, crop):
+    needles = [name.lower() for name in api_crops] + [crop.lower()] + EXTRA_NEEDLES.get(crop.lower(), [])
+    return list(dict.fromkeys(needle for needle in needles if needle))
+
+
+def commodity_mask(frame, api_crops, crop):
+    """
+    Boolean mask of the rows whose commodity contains any of the crop's names
+    (case-insensitive substring match).
+    """
+    if "commodity" not in frame or frame.empty:
+        return pd.Series(False, index=frame.index)
+    needles = crop_needles(api_crops, crop)
+    if not needles:
+        return pd.Series(False, index=frame.index)
+    pattern = re.compile("|".join(re.escape(needle) for needle in needles))
+    return _by_unique(frame["commodity"], lambda names: [
+        isinstance(name, str) and bool(pattern.search(name.lower())) for name in names
+    ], fill_value=False)
+
+
+def filter_crop_frame(frame, api_crops, crop):
+    return frame[commodity_mask(frame, api_crops, crop)]
+
+
+def use_columnar(records):
+    return isinstance(records, pd.DataFrame) and len(records) >= COLUMNAR_MIN_ROWS
+
+
+def filter_crop_records(records, api_crops, crop):
+    """
+    Records whose commodity contains any of the crop's names: a DataFrame for
+    large DataFrames, a list of dicts otherwise.
+    """
+    if use_columnar(records):
+        return filter_crop_frame(records, api_crops, crop)
+    if isinstance(records, pd.DataFrame):
+        records = records.to_dict("records")
+    needles = crop_needles(api_crops, crop)
+    return [
+        record for record in records
+        if isinstance(record.get("commodity"), str) and any(needle in record["commodity"].lower() for needle in needles)
+    ]
+
+
+def _price_column(frame, column):
+    if column not in frame:
+        return pd.Series(np.nan, index=frame.index)
+    prices = _by_unique(frame[column], lambda values: pd.to_numeric(values, errors="coerce").astype(float))
+    return prices.where((prices > 0) & (prices < MAX_PRICE))
+
+
+def _arrival_column(frame):
+    if "arrival_date" not in frame:
+        return pd.Series(pd.NaT, index=frame.index)
+    dates = frame["arrival_date"]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return _by_unique(dates, lambda values: pd.to_datetime(values, format=DATE_FORMAT, errors="coerce"))
+
+
+def price_history_frame(frame, crop):
+    """
+    One row per arrival date, sorted by date, with columns arrival (datetime),
+    price, market, state, district and commodity. The price is the modal
+    price or, when that is invalid, the mean of min and max price; on dates
+    with several records the highest price wins (the first one on a tie).
+    """
+    frame = to_frame(frame)
+    price = _price_column(frame, "modal_price")
+    missing = price.isna()
+    if missing.any():
+        fallback = frame[missing]
+        price[missing] = (_price_column(fallback, "min_price") + _price_column(fallback, "max_price")) / 2
+
+    history = pd.DataFrame({
+        "arrival": _arrival_column(frame),
+        "price": price.round(2),
+    }, index=frame.index)
+    for column, default in TEXT_DEFAULTS.items():
+        history[column] = frame[column].fillna(default) if column in frame else default
+    history["commodity"] = frame["commodity"].fillna(crop) if "commodity" in frame else crop
+
+    history = history[history["price"].notna() & history["arrival"].notna()]
+    history["position"] = np.arange(len(history))
+    history = history.sort_values(["price", "position"], ascending=[False, True])
+    history = history.drop_duplicates("arrival", keep="first")
+    history = history.sort_values("arrival", kind="mergesort")
+    return history.drop(columns="position").reset_index(drop=True)
+
+
+def history_records(history):
+    """Rows of a price history frame in the API's price_history format."""
+    records = history.assign(date=history["arrival"].dt.strftime(DATE_FORMAT)).drop(columns="arrival")
+    return records[["date", "price", "market", "state", "district", "commodity"]].to_dict("records")
+
+
+def _valid_price(value):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if 0 < price < MAX_PRICE else None
+
+
+def _arrival(value, parsed):
+    if isinstance(value, (datetime, date)):
+        return value if not pd.isna(value) else None
+    if not isinstance(value, str):
+        return None
+    if value not in parsed:
+        try:
+            parsed[value] = datetime.strptime(value, DATE_FORMAT)
+        except ValueError:
+            parsed[value] = None
+    return parsed[value]
+
+
+def _text(value, default):
+    return default if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def build_price_history(records, crop):
+    """
+    The API's price_history entries (date, price, market, state, district,
+    commodity) for records or a DataFrame of them, with the same rules as
+    price_history_frame: one entry per arrival date, sorted by date.
+    """
+    if use_columnar(records):
+        return history_records(price_history_frame(records, crop))
+    if isinstance(records, pd.DataFrame):
+        records = records.to_dict("records")
+
+    parsed = {}
+    best = {}
+    for record in records:
+        price = _valid_price(record.get("modal_price"))
+        if price is None:
+            low, high = _valid_price(record.get("min_price")), _valid_price(record.get("max_price"))
+            price = (low + high) / 2 if low is not None and high is not None else None
+        arrival = _arrival(record.get("arrival_date"), parsed)
+        if price is None or arrival is None:
+            continue
+        price = round(price, 2)
+        # Highest price per date wins, the first one on a tie
+        if arrival not in best or price > best[arrival][1]:
+            best[arrival] = (record, price)
+
+    return [{
+        "date": arrival.strftime(DATE_FORMAT),
+        "price": price,
+        "market": _text(record.get("market"), TEXT_DEFAULTS["market"]),
+        "state": _text(record.get("state"), TEXT_DEFAULTS["state"]),
+        "district": _text(record.get("district"), TEXT_DEFAULTS["district"]),
+        "commodity": _text(record.get("commodity"), crop),
+    } for arrival, (record, price) in sorted(best.items(), key=lambda item: item[0])]
+
+
+# Units accepted in analytics windows such as "7d", "12w", "6m" or "1y"
+WINDOW_UNITS = {"d": 1, "w": 7, "m": 30, "y": 365}
+MAX_WINDOW_DAYS = 3650
+MARKET_KEYS = ["state", "district", "market"]
+
+
+def parse_window(window):
+    """Days in a window such as "30d" or "1y"; raises ValueError when malformed."""
+    match = re.fullmatch(r"(\d+)\s*([dwmy])", (window or "").strip().lower())
+    if not match:
+        raise ValueError(f"Invalid window '{window}', expected e.g. 7d, 30d or 1y")
+    days = int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+    if not 0 < days <= MAX_WINDOW_DAYS:
+        raise ValueError(f"Window must be between 1 and {MAX_WINDOW_DAYS} days")
+    return days
+
+
+def _number(value):
+    return None if pd.isna(value) else round(float(value), 2)
+
+
+def price_analytics(frame, rolling_days=7):
+    """
+    Rolling means, volatility, spreads and min/max/modal aggregations for
+    every market in a frame of stored prices (columns arrival_date, state,
+    district, market, min_price, max_price, modal_price) at once.
+
+    Markets report over their own observations; the daily series aggregates
+    across markets (median modal price, lowest min and highest max price,
+    and the spread between the dearest and cheapest market). Volatility is
+    the standard deviation of price changes between consecutive
+    observations, in percent.
+    """
+    frame = frame.assign(arrival=pd.to_datetime(frame["arrival_date"]))
+    for column in MARKET_KEYS:
+        frame[column] = frame[column].fillna("")
+    rolling_window = f"{rolling_days}D"
+
+    # One row per market and day (varieties and grades averaged)
+    daily = frame.groupby(MARKET_KEYS + ["arrival"], sort=True).agg(
+        min_price=("min_price", "min"),
+        max_price=("max_price", "max"),
+        modal_price=("modal_price", "mean"),
+    )
+    daily["spread"] = daily["max_price"] - daily["min_price"]
+    daily["change"] = daily.groupby(level=MARKET_KEYS)["modal_price"].pct_change() * 100
+
+    # Dates x markets, for rolling means over calendar days
+    modal = daily["modal_price"].unstack(MARKET_KEYS).sort_index()
+    rolling = modal.rolling(rolling_window, min_periods=1).mean()
+    latest_rolling = rolling.where(modal.notna()).ffill().iloc[-1]
+
+    by_market = daily.groupby(level=MARKET_KEYS)
+    markets = by_market.agg(
+        min_price=("min_price", "min"),
+        max_price=("max_price", "max"),
+        modal_mean=("modal_price", "mean"),
+        modal_median=("modal_price", "median"),
+        avg_spread=("spread", "mean"),
+        volatility=("change", "std"),
+        days=("modal_price", "count"),
+    )
+    last = daily.reset_index("arrival").groupby(level=MARKET_KEYS).last()
+    markets["latest_price"] = last["modal_price"]
+    markets["latest_date"] = last["arrival"]
+    markets["rolling_mean"] = latest_rolling
+    markets = markets.sort_values("latest_price", ascending=False)
+
+    by_date = daily.groupby(level="arrival")
+    national = pd.DataFrame({
+        "min_price": by_date["min_price"].min(),
+        "max_price": by_date["max_price"].max(),
+        "modal_price": by_date["modal_price"].median(),
+        "market_spread": by_date["modal_price"].max() - by_date["modal_price"].min(),
+        "markets": by_date["modal_price"].count(),
+    }).sort_index()
+    national["rolling_mean"] = national["modal_price"].rolling(rolling_window, min_periods=1).mean()
+    national_change = national["modal_price"].pct_change() * 100
+
+    return {
+        "start": national.index[0].strftime(DATE_FORMAT),
+        "end": national.index[-1].strftime(DATE_FORMAT),
+        "rolling_days": rolling_days,
+        "records": len(frame),
+        "markets_count": len(markets),
+        "overall": {
+            "min_price": _number(daily["min_price"].min()),
+            "max_price": _number(daily["max_price"].max()),
+            "modal_mean": _number(daily["modal_price"].mean()),
+            "modal_median": _number(daily["modal_price"].median()),
+            "latest_price": _number(national["modal_price"].iloc[-1]),
+            "rolling_mean": _number(national["rolling_mean"].iloc[-1]),
+            "volatility": _number(national_change.std()),
+            "avg_market_spread": _number(national["market_spread"].mean()),
+        },
+        "daily": [{
+            "date": date.strftime(DATE_FORMAT),
+            "min_price": _number(row.min_price),
+            "max_price": _number(row.max_price),
+            "modal_price": _number(row.modal_price),
+            "rolling_mean": _number(row.rolling_mean),
+            "market_spread": _number(row.market_spread),
+            "markets": int(row.markets),
+        } for date, row in zip(national.index, national.itertuples())],
+        "markets": [{
+            "state": state,
+            "district": district,
+            "market": market,
+            "min_price": _number(row.min_price),
+            "max_price": _number(row.max_price),
+            "modal_mean": _number(row.modal_mean),
+            "modal_median": _number(row.modal_median),
+            "latest_price": _number(row.latest_price),
+            "latest_date": row.latest_date.strftime(DATE_FORMAT),
+            "rolling_mean": _number(row.rolling_mean),
+            "volatility": _number(row.volatility),
+            "avg_spread": _number(row.avg_spread),
+            "days": int(row.days),
+        } for (state, district, market), row in zip(markets.index, markets.itertuples())],
+    }
\ No newline at end of file
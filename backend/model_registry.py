@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+
+
+def _rss_bytes():
+    """
+    Current resident set size of this process, or None where unavailable.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class ModelEntry:
+    def __init__(self, name, loader, warmup=None, version=None, watch=None, on_swap=None):
+        self.name = name
+        self.loader = loader
+        self.warmup_fn = warmup
+        self.version_fn = version
+        self.watch_fn = watch
+        self.on_swap = on_swap
+        self.lock = threading.Lock()
+        self.reload_lock = threading.Lock()
+
+        # Model and its version live in one tuple, so swapping in a reloaded
+        # model is a single reference assignment and readers never see a
+        # model paired with another model's version
+        self.current = (None, None)
+        self.loaded = False
+        self.error = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.memory_bytes = None
+        self.warmed_up = False
+        self.warmup_seconds = None
+        self.signature = None
+        self.reloads = 0
+        self.reload_error = None
+
+    @property
+    def model(self):
+        return self.current[0]
+
+    @property
+    def version(self):
+        return self.current[1]
+
+
+class ModelRegistry:
+    """
+    Loads models lazily on first use instead of as an import side effect.
+
+    Each model is registered with a loader (returning the model, or raising)
+    and optionally a warmup function that runs a dummy inference and a
+    version function. warmup() loads everything eagerly; calling it from
+    create_app under `gunicorn --preload` loads the models once in the master
+    process so forked workers share the pages copy-on-write.
+
+    Models registered with a watch function (returning their artifact paths)
+    are hot-reloaded: a background thread polls the files' mtime and size,
+    loads a changed artifact next to the serving one, smoke-tests it with the
+    warmup inference and swaps it in. Requests already holding the previous
+    model finish on it.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._watch_interval = 0
+        self._watcher_pid = None
+        self._watch_lock = threading.Lock()
+
+    def register(self, name, loader, warmup=None, version=None, watch=None, on_swap=None):
+        self._entries[name] = ModelEntry(
+            name, loader, warmup=warmup, version=version, watch=watch, on_swap=on_swap
+        )
+
+    def _signature(self, entry):
+        return _file_signature(entry.watch_fn()) if entry.watch_fn else None
+
+    def _load(self, entry):
+        # Taken before loading, so a file replaced mid-load is picked up by
+        # the next check
+        entry.signature = self._signature(entry)
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = entry.loader()
+            entry.error = None
+        except Exception as e:
+            print(f"❌ Error loading model '{entry.name}': {e}")
+            model = None
+            entry.error = str(e)
+        entry.load_seconds = time.perf_counter() - started
+        rss_after = _rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            entry.memory_bytes = max(0, rss_after - rss_before)
+        version = entry.version_fn() if entry.version_fn and model is not None else None
+        entry.current = (model, version)
+        entry.loaded_at = time.time()
+        entry.loaded = True
+
+    def get(self, name):
+        """
+        Returns the model, loading it on first use. A model whose loader failed
+        is returned as None (callers fall back to their demo behaviour) and is
+        not retried on every request.
+        """
+        return self.snapshot(name)[0]
+
+    def snapshot(self, name):
+        """
+        Returns (model, version) as one consistent pair, for callers that
+        record which version produced a prediction.
+        """
+        self._ensure_watcher()
+        entry = self._entries[name]
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(entry)
+        return entry.current
+
+    def version(self, name):
+        return self.snapshot(name)[1]
+
+    def is_loaded(self, name):
+        return self._entries[name].loaded
+
+    def reload(self, name):
+        """
+        Loads the model's artifact again in the calling thread, runs the warmup
+        inference on it as a smoke test and only then swaps it in. A failed
+        load or smoke test keeps the current model serving. Returns True when
+        a new model was swapped in.
+        """
+        entry = self._entries[name]
+        with entry.reload_lock:
+            signature = self._signature(entry)
+            version = entry.version_fn() if entry.version_fn else None
+            if entry.model is not None and version is not None and version == entry.version:
+                # Touched or copied over with identical content
+                entry.signature = signature
+                return False
+
+            started = time.perf_counter()
+            try:
+                model = entry.loader()
+                if entry.warmup_fn is not None:
+                    entry.warmup_fn(model)
+            except Exception as e:
+                print(f"❌ Reload of model '{name}' failed, keeping the current version: {e}")
+                entry.reload_error = str(e)
+                # Not retried until the file changes again
+                entry.signature = signature
+                return False
+
+            with entry.lock:
+                entry.current = (model, version)
+                entry.signature = signature
+                entry.loaded = True
+                entry.error = None
+                entry.reload_error = None
+                entry.warmed_up = entry.warmup_fn is not None
+                entry.load_seconds = time.perf_counter() - started
+                entry.loaded_at = time.time()
+                entry.reloads += 1
+            print(f"✅ Model '{name}' reloaded (version {version})")
+
+        if entry.on_swap is not None:
+            entry.on_swap()
+        return True
+
+    def check(self):
+        """
+        Reloads every loaded model whose watched files changed since it was
+        loaded.
+        """
+        for name, entry in list(self._entries.items()):
+            if entry.loaded and entry.watch_fn and self._signature(entry) != entry.signature:
+                self.reload(name)
+
+    def start_watcher(self, interval):
+        """
+        Polls the watched model files every interval seconds (0 disables).
+        Threads do not survive a fork, so each worker process starts its own
+        watcher on first use.
+        """
+        self._watch_interval = interval
+        self._ensure_watcher()
+
+    def _ensure_watcher(self):
+        if not self._watch_interval or self._watcher_pid == os.getpid():
+            return
+        with self._watch_lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+            thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            thread.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self._watch_interval)
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking model files: {e}")
+
+    def warmup(self, names=None):
+        """
+        Loads the given (default: all) models and runs their warmup inference
+        so the first real request does not pay for lazy initialisation.
+        """
+        for name in names or list(self._entries):
+            entry = self._entries[name]
+            model = self.get(name)
+            if model is None or entry.warmup_fn is None or entry.warmed_up:
+                continue
+            started = time.perf_counter()
+            try:
+                entry.warmup_fn(model)
+                entry.warmed_up = True
+            except Exception as e:
+                print(f"❌ Warmup failed for model '{name}': {e}")
+            entry.warmup_seconds = time.perf_counter() - started
+
+    def stats(self):
+        result = {}
+        for name, entry in self._entries.items():
+            result[name] = {
+                "loaded": entry.loaded,
+                "available": entry.model is not None,
+                "version": entry.version,
+                "error": entry.error,
+                "loaded_at": entry.loaded_at,
+                "load_seconds": round(entry.load_seconds, 3) if entry.load_seconds is not None else None,
+                "memory_mb": round(entry.memory_bytes / (1024 * 1024), 1) if entry.memory_bytes is not None else None,
+                "warmed_up": entry.warmed_up,
+                "warmup_seconds": round(entry.warmup_seconds, 3) if entry.warmup_seconds is not None else None,
+                "reloads": entry.reloads,
+                "reload_error": entry.reload_error,
+                "watched_files": [path for path, _, _ in entry.signature] if entry.signature else [],
+                "pid": os.getpid(),
+            }
+        return result
+
+
+# Shared by all blueprints
+registry = ModelRegistry()
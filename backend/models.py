@@ -52,6 +52,7 @@ class Recommendation(db.Model):
     farmer_id = db.Column(db.Integer, db.ForeignKey('farmers.id'), nullable=False)
     input_json = db.Column(db.JSON, nullable=False)
     recommended_json = db.Column(db.JSON, nullable=False)
+    model_version = db.Column(db.String(64))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class SoilTest(db.Model):
@@ -76,4 +77,65 @@ class PestReport(db.Model):
     predicted_label = db.Column(db.String(128))
     confidence = db.Column(db.Numeric(5, 2))
     advisory_json = db.Column(db.JSON)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    needs_review = db.Column(db.Boolean, default=False, index=True)
+    model_version = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class PestResultCache(db.Model):
+    __tablename__ = 'pest_result_cache'
+    __table_args__ = (
+        db.UniqueConstraint('content_hash', 'model_version', name='uq_pest_cache_hash_version'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)
+    model_version = db.Column(db.String(64), nullable=False)
+    image_path = db.Column(db.String(512))
+    predicted_label = db.Column(db.String(128))
+    confidence = db.Column(db.Float)
+    advisory_json = db.Column(db.JSON)
+    predictions_json = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CropSuitability(db.Model):
+    __tablename__ = 'crop_suitability'
+    __table_args__ = (
+        db.UniqueConstraint('district', 'season', 'soil_type', 'n', 'p', 'k', name='uq_crop_suitability_cell'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    district = db.Column(db.String(255), nullable=False)
+    season = db.Column(db.String(16), nullable=False)
+    soil_type = db.Column(db.String(64), nullable=False)
+    n = db.Column(db.SmallInteger, nullable=False)
+    p = db.Column(db.SmallInteger, nullable=False)
+    k = db.Column(db.SmallInteger, nullable=False)
+    temperature = db.Column(db.Float)
+    humidity = db.Column(db.Float)
+    ph = db.Column(db.Float)
+    rainfall = db.Column(db.Float)
+    ranking_json = db.Column(db.JSON, nullable=False)
+    model_version = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MarketPrice(db.Model):
+    __tablename__ = 'market_prices'
+    __table_args__ = (
+        db.UniqueConstraint('commodity', 'variety', 'grade', 'market', 'district', 'state', 'arrival_date', name='uq_market_price_record'),
+        db.Index('idx_market_prices_commodity_date', 'commodity', 'arrival_date'),
+        db.Index('idx_market_prices_updated', 'updated_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    state = db.Column(db.String(64), nullable=False, default='')
+    district = db.Column(db.String(64), nullable=False, default='')
+    market = db.Column(db.String(128), nullable=False, default='')
+    commodity = db.Column(db.String(128), nullable=False)
+    variety = db.Column(db.String(128), nullable=False, default='')
+    grade = db.Column(db.String(64), nullable=False, default='')
+    arrival_date = db.Column(db.Date, nullable=False)
+    min_price = db.Column(db.Float)
+    max_price = db.Column(db.Float)
+    modal_price = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,590 @@
+from types import MappingProxyType
+
+# Enhanced disease information with specific organic and chemical treatments
+disease_info = {
+    "Corn_(maize)___Cercospora_leaf_spot Gray_leaf_spot": {
+        "precautions": [
+            "Use resistant hybrids when available",
+            "Rotate crops with non-host crops for at least 2 years",
+            "Plow under crop residue to reduce fungus survival",
+            "Apply fungicides when necessary",
+            "Avoid continuous corn planting in the same field"
+        ],
+        "pests": ["Cercospora zeae-maydis (fungus)"],
+        "common_name": "Gray Leaf Spot of Corn",
+        "symptoms": "Rectangular, gray to tan lesions on leaves that are bounded by leaf veins",
+        "organic": "Apply neem oil extract or copper-based fungicides. Use bio-control agents like Trichoderma.",
+        "chemical": "Apply azoxystrobin or pyraclostrobin-based fungicides at first sign of disease."
+    },
+    "Corn_(maize)___Common_rust_": {
+        "precautions": [
+            "Plant resistant hybrids",
+            "Apply fungicides early in the disease cycle",
+            "Avoid late planting in areas with history of rust",
+            "Remove volunteer corn plants that can harbor the disease"
+        ],
+        "pests": ["Puccinia sorghi (fungus)"],
+        "common_name": "Common Rust of Corn",
+        "symptoms": "Small, circular to elongated cinnamon-brown pustules on both leaf surfaces",
+        "organic": "Use sulfur dust or copper-based sprays. Maintain proper plant spacing for air circulation.",
+        "chemical": "Apply triazole-based fungicides like propiconazole when pustules first appear."
+    },
+    "Corn_(maize)___Northern_Leaf_Blight": {
+        "precautions": [
+            "Use resistant hybrids",
+            "Practice crop rotation with non-host crops",
+            "Till under crop debris to reduce inoculum",
+            "Apply fungicides when necessary"
+        ],
+        "pests": ["Exserohilum turcicum (fungus)"],
+        "common_name": "Northern Corn Leaf Blight",
+        "symptoms": "Long, elliptical, gray-green lesions that turn tan as they mature",
+        "organic": "Apply baking soda solution (1 tbsp per gallon of water) or garlic extract spray.",
+        "chemical": "Use strobilurin or triazole fungicides like trifloxystrobin or tebuconazole."
+    },
+    "Corn_(maize)___healthy": {
+        "precautions": [
+            "Maintain proper plant nutrition",
+            "Practice crop rotation",
+            "Monitor regularly for early signs of disease",
+            "Use certified disease-free seeds"
+        ],
+        "pests": ["None"],
+        "common_name": "Healthy Corn Plant",
+        "symptoms": "No visible disease symptoms",
+        "organic": "Continue good agricultural practices. No treatment needed.",
+        "chemical": "No chemical treatment required for healthy plants."
+    },
+    "Potato___Early_blight": {
+        "precautions": [
+            "Use resistant varieties when available",
+            "Apply fungicides preventatively",
+            "Avoid overhead irrigation to reduce leaf wetness",
+            "Remove and destroy infected plant debris"
+        ],
+        "pests": ["Alternaria solani (fungus)"],
+        "common_name": "Early Blight of Potato",
+        "symptoms": "Concentric rings in lesions that resemble target spots, primarily on older leaves",
+        "organic": "Spray with compost tea or baking soda solution. Use copper-based fungicides.",
+        "chemical": "Apply chlorothalonil or mancozeb-based fungicides every 7-10 days."
+    },
+    "Potato___Late_blight": {
+        "precautions": [
+            "Plant certified disease-free seed potatoes",
+            "Apply fungicides before disease appears",
+            "Destroy cull piles and volunteer plants",
+            "Avoid overhead irrigation when possible"
+        ],
+        "pests": ["Phytophthora infestans (oomycete)"],
+        "common_name": "Late Blight of Potato",
+        "symptoms": "Water-soaked lesions that expand rapidly, white fungal growth under humid conditions",
+        "organic": "Apply copper sulfate or hydrogen peroxide solution. Remove infected plants immediately.",
+        "chemical": "Use metalaxyl or mancozeb-based systemic fungicides as preventive measure."
+    },
+    "Potato___healthy": {
+        "precautions": [
+            "Maintain proper soil fertility",
+            "Practice crop rotation",
+            "Use certified disease-free seed potatoes",
+            "Monitor for pests regularly"
+        ],
+        "pests": ["None"],
+        "common_name": "Healthy Potato Plant",
+        "symptoms": "No visible disease symptoms",
+        "organic": "Maintain current organic practices. No treatment needed.",
+        "chemical": "No chemical treatment required."
+    },
+    "Tomato___Bacterial_spot": {
+        "precautions": [
+            "Use disease-free certified seeds",
+            "Apply copper-based bactericides preventatively",
+            "Avoid working with plants when they are wet",
+            "Practice crop rotation with non-host crops"
+        ],
+        "pests": ["Xanthomonas campestris pv. vesicatoria (bacteria)"],
+        "common_name": "Bacterial Spot of Tomato",
+        "symptoms": "Small, water-soaked spots that become dark and scabby, often with yellow halos",
+        "organic": "Use copper bactericides or hydrogen peroxide sprays. Apply compost tea for plant immunity.",
+        "chemical": "Apply streptomycin or oxytetracycline-based antibiotics in severe cases."
+    },
+    "Tomato___Early_blight": {
+        "precautions": [
+            "Stake plants to improve air circulation",
+            "Apply fungicides preventatively",
+            "Remove lower leaves as plant grows",
+            "Mulch to prevent soil splashing onto leaves"
+        ],
+        "pests": ["Alternaria solani (fungus)"],
+        "common_name": "Early Blight of Tomato",
+        "symptoms": "Target-like concentric rings in lesions, often starting on lower leaves",
+        "organic": "Spray with neem oil or baking soda solution. Use copper fungicides for control.",
+        "chemical": "Apply chlorothalonil or mancozeb-based fungicides at 7-10 day intervals."
+    },
+    "Tomato___Late_blight": {
+        "precautions": [
+            "Apply fungicides before disease appears",
+            "Remove and destroy infected plants immediately",
+            "Avoid overhead irrigation",
+            "Choose resistant varieties when available"
+        ],
+        "pests": ["Phytophthora infestans (oomycete)"],
+        "common_name": "Late Blight of Tomato",
+        "symptoms": "Water-soaked lesions that expand rapidly, white fungal growth under leaves in humidity",
+        "organic": "Apply copper-based fungicides or hydrogen peroxide. Remove infected plants promptly.",
+        "chemical": "Use metalaxyl or chlorothalonil-based systemic fungicides preventatively."
+    },
+    "Tomato___Leaf_Mold": {
+        "precautions": [
+            "Maintain good air circulation in greenhouse settings",
+            "Reduce humidity through proper ventilation",
+            "Apply fungicides preventatively",
+            "Remove infected leaves promptly"
+        ],
+        "pests": ["Passalora fulva (fungus)"],
+        "common_name": "Leaf Mold of Tomato",
+        "symptoms": "Yellowish spots on upper leaf surfaces with olive-green mold on undersides",
+        "organic": "Improve ventilation. Spray with potassium bicarbonate or sulfur-based fungicides.",
+        "chemical": "Apply chlorothalonil or mancozeb-based fungicides at first sign of infection."
+    },
+    "Tomato___Septoria_leaf_spot": {
+        "precautions": [
+            "Apply fungicides at first sign of disease",
+            "Remove infected leaves and destroy them",
+            "Avoid overhead watering",
+            "Stake plants to improve air circulation"
+        ],
+        "pests": ["Septoria lycopersici (fungus)"],
+        "common_name": "Septoria Leaf Spot of Tomato",
+        "symptoms": "Small, circular spots with dark borders and light centers, often with black pycnidia",
+        "organic": "Use copper fungicides or neem oil. Remove and destroy infected leaves.",
+        "chemical": "Apply chlorothalonil or mancozeb-based fungicides every 7-10 days."
+    },
+    "Tomato___Spider_mites Two-spotted_spider_mite": {
+        "precautions": [
+            "Release predatory mites",
+            "Apply miticides when infestation is detected",
+            "Increase humidity to discourage mite reproduction",
+            "Remove heavily infested leaves"
+        ],
+        "pests": ["Tetranychus urticae (mite)"],
+        "common_name": "Two-Spotted Spider Mite on Tomato",
+        "symptoms": "Stippling on leaves, fine webbing, leaf yellowing and eventual defoliation",
+        "organic": "Release Phytoseiulus persimilis predatory mites. Spray with neem oil or insecticidal soap.",
+        "chemical": "Apply abamectin or spiromesifen-based miticides when mites are detected."
+    },
+    "Tomato___Target_Spot": {
+        "precautions": [
+            "Apply fungicides preventatively",
+            "Remove infected plant debris after harvest",
+            "Practice crop rotation with non-host crops",
+            "Improve air circulation through proper spacing"
+        ],
+        "pests": ["Corynespora cassiicola (fungus)"],
+        "common_name": "Target Spot of Tomato",
+        "symptoms": "Circular spots with concentric rings resembling a target, often with yellow halos",
+        "organic": "Use copper-based fungicides or baking soda sprays. Improve plant spacing.",
+        "chemical": "Apply chlorothalonil or mancozeb-based fungicides preventatively."
+    },
+    "Tomato___Tomato_Yellow_Leaf_Curl_Virus": {
+        "precautions": [
+            "Use resistant varieties when available",
+            "Control whitefly populations with insecticides",
+            "Remove infected plants to reduce virus source",
+            "Use reflective mulches to deter whiteflies"
+        ],
+        "pests": ["Bemisia tabaci (whitefly) - vector", "Tomato yellow leaf curl virus"],
+        "common_name": "Tomato Yellow Leaf Curl Virus",
+        "symptoms": "Upward curling of leaves, yellowing of leaf margins, stunted growth",
+        "organic": "Use yellow sticky traps for whiteflies. Spray with neem oil. Remove infected plants.",
+        "chemical": "Apply imidacloprid or thiamethoxam systemic insecticides for whitefly control."
+    },
+    "Tomato___Tomato_mosaic_virus": {
+        "precautions": [
+            "Use virus-free certified seeds",
+            "Disinfect tools regularly with bleach solution",
+            "Control aphid populations",
+            "Remove and destroy infected plants"
+        ],
+        "pests": ["Various aphid species - vectors", "Tomato mosaic virus"],
+        "common_name": "Tomato Mosaic Virus",
+        "symptoms": "Mottled light and dark green patterns on leaves, leaf distortion, reduced fruit yield",
+        "organic": "Use milk spray (1 part milk to 9 parts water). Control aphids with neem oil.",
+        "chemical": "No effective chemical treatment. Focus on prevention and vector control."
+    },
+    "Tomato___healthy": {
+        "precautions": [
+            "Maintain proper plant nutrition",
+            "Practice crop rotation",
+            "Monitor regularly for early signs of disease",
+            "Use certified disease-free seeds"
+        ],
+        "pests": ["None"],
+        "common_name": "Healthy Tomato Plant",
+        "symptoms": "No visible disease symptoms",
+        "organic": "Continue current organic practices. No treatment required.",
+        "chemical": "No chemical treatment needed for healthy plants."
+    }
+}
+
+# Enhanced Telugu translations for all diseases with complete pest translations
+telugu_disease_translations = {
+    "Corn_(maize)___Cercospora_leaf_spot Gray_leaf_spot": {
+        "disease_name": "మొక్కజొన్న ___ సెర్కోస్పోరా ఆకు మచ్చ బూడిద ఆకు మచ్చ",
+        "common_name": "మొక్కజొన్న బూడిద ఆకు మచ్చ",
+        "symptoms": "ఆకులపై దీర్ఘచతురస్రాకార, బూడిద నుండి టాన్ రంగు మచ్చలు",
+        "prevention": [
+            "అందుబాటులో ఉన్నప్పుడు నిరోధక సంకరాలను ఉపయోగించండి",
+            "కనీసం 2 సంవత్సరాలు నాన్-హోస్ట్ పంటలతో పంటలను తిప్పండి",
+            "ఫంగస్ మనుగడను తగ్గించడానికి పంట శేషాన్ని దున్నండి",
+            "అవసరమైతే ఫంగిసైడ్లను వర్తించండి",
+            "అదే పొలంలో నిరంతరం మొక్కజొన్న నాటకం నివారించండి"
+        ],
+        "pests": ["సెర్కోస్పోరా జియే-మేడిస్ (ఫంగస్)"],
+        "organic": "నీం ఆయిల్ ఎక్స్ట్రాక్ట్ లేదా రాగి-ఆధారిత ఫంగిసైడ్లను వర్తించండి. ట్రైకోడెర్మా వంటి బయో-కంట్రోల్ ఏజెంట్లను ఉపయోగించండి.",
+        "chemical": "వ్యాధి యొక్క మొదటి సంకేతంలో అజాక్సిస్ట్రోబిన్ లేదా పైరాక్లోస్ట్రోబిన్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Corn_(maize)___Common_rust_": {
+        "disease_name": "మొక్కజొన్న ___ సాధారణ తుప్పు",
+        "common_name": "మొక్కజొన్న సాధారణ తుప్పు",
+        "symptoms": "ఆకుల రెండు ఉపరితలాలపై చిన్న, వృత్తాకార నుండి పొడవాటి దాల్చినచెక్క-బ్రౌన్ పస్ట్యూల్స్",
+        "prevention": [
+            "నిరోధక సంకరాలను నాటండి",
+            "వ్యాధి చక్రం ప్రారంభంలో ఫంగిసైడ్లను వర్తించండి",
+            "తుప్పు చరిత్ర ఉన్న ప్రాంతాలలో తరువాత నాటకం నివారించండి",
+            "వ్యాధిని కలిగి ఉండే స్వచ్ఛంద మొక్కజొన్న మొక్కలను తీసివేయండి"
+        ],
+        "pests": ["పక్సినియా సోర్ఘి (ఫంగస్)"],
+        "organic": "సల్ఫర్ డస్ట్ లేదా రాగి-ఆధారిత స్ప్రేలను ఉపయోగించండి. గాలి ప్రసరణ కోసం సరైన మొక్కల దూరం నిర్వహించండి.",
+        "chemical": "పస్ట్యూల్స్ మొదట కనిపించినప్పుడు ప్రోపికోనాజోల్ వంటి ట్రయాజోల్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Corn_(maize)___Northern_Leaf_Blight": {
+        "disease_name": "మొక్కజొన్న ___ ఉత్తర ఆకు బ్లైట్",
+        "common_name": "మొక్కజొన్న ఉత్తర ఆకు బ్లైట్",
+        "symptoms": "పొడవాటి, దీర్ఘవృత్తాకార, బూడిద-ఆకుపచ్చ మచ్చలు, పరిపక్వత చెందినకొద్దీ టాన్గా మారతాయి",
+        "prevention": [
+            "నిరోధక సంకరాలను ఉపయోగించండి",
+            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి",
+            "ఇనోక్యులమ్ను తగ్గించడానికి పంట శిధిలాలను దున్నండి",
+            "అవసరమైతే ఫంగిసైడ్లను వర్తించండి"
+        ],
+        "pests": ["ఎక్స్సెరోహిలమ్ టర్సికమ్ (ఫంగస్)"],
+        "organic": "బేకింగ్ సోడా ద్రావణం (1 టీస్పూన్ ప్రతి గ్యాలన్ నీటికి) లేదా వెల్లుల్లి ఎక్స్ట్రాక్ట్ స్ప్రే వర్తించండి.",
+        "chemical": "స్ట్రోబిలూరిన్ లేదా ట్రయాజోల్ ఫంగిసైడ్లను ఉపయోగించండి."
+    },
+    "Corn_(maize)___healthy": {
+        "disease_name": "మొక్కజొన్న ఆరోగ్యకరమైన",
+        "common_name": "ఆరోగ్యకరమైన మొక్కజొన్న మొక్క",
+        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
+        "prevention": [
+            "సరైన మొక్క పోషణను నిర్వహించండి",
+            "పంట భ్రమణం అభ్యసించండి",
+            "వ్యాధి యొక్క ప్రారంభ సంకేతాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి",
+            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తనాలను ఉపయోగించండి"
+        ],
+        "pests": ["ఏవీ లేవు"],
+        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
+        "chemical": "ఆరోగ్యకరమైన మొక్కలకు రసాయన చికిత్స అవసరం లేదు."
+    },
+    "Potato___Early_blight": {
+        "disease_name": "బంగాళాదుంప ___ ప్రారంభ బ్లైట్",
+        "common_name": "బంగాళాదుంప ప్రారంభ బ్లైట్",
+        "symptoms": "లక్ష్యం మచ్చలను పోలిన మచ్చలలో కేంద్రిక వలయాలు, ప్రధానంగా పాత ఆకులపై",
+        "prevention": [
+            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఉపయోగించండి",
+            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
+            "ఆకు తడి తగ్గించడానికి ఓవర్హెడ్ నీటిపారుదల నివారించండి",
+            "సోకిన మొక్కల శిధిలాలను తీసివేసి నాశనం చేయండి"
+        ],
+        "pests": ["ఆల్టర్నేరియా సోలాని (ఫంగస్)"],
+        "organic": "కంపోస్ట్ టీ లేదా బేకింగ్ సోడా ద్రావణంతో స్ప్రే చేయండి. రాగి-ఆధారిత ఫంగిసైడ్లను ఉపయోగించండి.",
+        "chemical": "ప్రతి 7-10 రోజులకు క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Potato___Late_blight": {
+        "disease_name": "బంగాళాదుంప ___ లేట్ బ్లైట్",
+        "common_name": "బంగాళాదుంప లేట్ బ్లైట్",
+        "symptoms": "వేగంగా విస్తరించే నీటి-soaked మచ్చలు, తడి పరిస్థితులలో తెలుపు ఫంగల్ వృద్ధి",
+        "prevention": [
+            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తన బంగాళాదుంపలను నాటండి",
+            "వ్యాధి కనిపించే ముందు ఫంగిసైడ్లను వర్తించండి",
+            "కల్ పైల్స్ మరియు స్వచ్ఛంద మొక్కలను నాశనం చేయండి",
+            "సాధ్యమైనప్పుడు ఓవర్హెడ్ నీటిపారుదల నివారించండి"
+        ],
+        "pests": ["ఫైటోఫ్తోరా ఇన్ఫెస్టాన్స్ (ఊమైసీట్)"],
+        "organic": "రాగి సల్ఫేట్ లేదా హైడ్రోజన్ పెరాక్సైడ్ ద్రావణాన్ని వర్తించండి. సోకిన మొక్కలను వెంటనే తీసివేయండి.",
+        "chemical": "నివారణ చర్యగా మెటలాక్సిల్ లేదా మ్యాంకోజెబ్-ఆధారిత సిస్టమిక్ ఫంగిసైడ్లను ఉపయోగించండి."
+    },
+    "Potato___healthy": {
+        "disease_name": "బంగాళాదుంప ఆరోగ్యకరమైన",
+        "common_name": "ఆరోగ్యకరమైన బంగాళాదుంప మొక్క",
+        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
+        "prevention": [
+            "సరైన న ch సారాన్ని నిర్వహించండి",
+            "పంట భ్రమణం అభ్యసించండి",
+            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తన బంగాళాదుంపలను ఉపయోగించండి",
+            "కీటకాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి"
+        ],
+        "pests": ["ఏవీ లేవు"],
+        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
+        "chemical": "రసాయన చికిత్స అవసరం లేదు."
+    },
+    "Tomato___Bacterial_spot": {
+        "disease_name": "టమాటా ___ బ్యాక్టీరియా స్పాట్",
+        "common_name": "టమాటా బ్యాక్టీరియా మచ్చ",
+        "symptoms": "చిన్న, నీటి-soaked మచ్చలు ముదురుగా మారతాయి, తరచుగా పసుపు రంగు హాలోలతో",
+        "prevention": [
+            "వ్యాధి-ఉచిత ధృవీకరించిన విత్తనాలను ఉపయోగించండి",
+            "నివారణగా రాగి-ఆధారిత బాక్టీరిసైడ్లను వర్తించండి",
+            "మొక్కలు తడిగా ఉన్నప్పుడు వాటితో పని చేయకండి",
+            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి"
+        ],
+        "pests": ["జాంతోమోనాస్ క్యాంపెస్ట్రిస్ పి.వి. వెసికటోరియా (బాక్టీరియా)"],
+        "organic": "రాగి బాక్టీరిసైడ్లు లేదా హైడ్రోజన్ పెరాక్సైడ్ స్ప్రేలను ఉపయోగించండి. మొక్క రోగనిరోధక శక్తి కోసం కంపోస్ట్ టీని వర్తించండి.",
+        "chemical": "తీవ్రమైన సందర్భాలలో స్ట్రెప్టోమైసిన్ లేదా ఆక్సిటెట్రాసైక్లిన్-ఆధారిత యాంటీబయాటిక్లను వర్తించండి."
+    },
+    "Tomato___Early_blight": {
+        "disease_name": "టమాటా ___ ప్రారంభ బ్లైట్",
+        "common_name": "టమాటా ప్రారంభ బ్లైట్",
+        "symptoms": "లక్ష్యం వలె కనిపించే మచ్చలలో కేంద్రిక వలయాలు, తరచుగా పాత ఆకులపై ప్రారంభమవుతాయి",
+        "prevention": [
+            "గాలి ప్రసరణ మెరుగుపడడానికి మొక్కలను కట్టండి",
+            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
+            "మొక్క పెరిగేకొద్దీ దిగువ ఆకులను తీసివేయండి",
+            "న ch గిని ఆకులపై చెరగకుండా న ch పెట్టండి"
+        ],
+        "pests": ["ఆల్టర్నేరియా సోలాని (ఫంగస్)"],
+        "organic": "నీం ఆయిల్ లేదా బేకింగ్ సోడా ద్రావణంతో స్ప్రే చేయండి. నియంత్రణ కోసం రాగి ఫంగిసైడ్లను ఉపయోగించండి.",
+        "chemical": "7-10 రోజుల Intervals లో క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Late_blight": {
+        "disease_name": "టమాటా ___ లేట్ బ్లైట్",
+        "common_name": "టమాటా లేట్ బ్లైట్",
+        "symptoms": "వేగంగా విస్తరించే నీటి-soaked మచ్చలు, తడి పరిస్థితులలో ఆకుల క్రింద తెలుపు ఫంగల్ వృద్ధి",
+        "prevention": [
+            "వ్యాధి కనిపించే ముందు ఫంగిసైడ్లను వర్తించండి",
+            "సోకిన మొక్కలను వెంటనే తీసివేసి నాశనం చేయండి",
+            "ఓవర్హెడ్ నీటిపారుదల నివారించండి",
+            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఎంచుకోండి"
+        ],
+        "pests": ["ఫైటోఫ్తోరా ఇన్ఫెస్టాన్స్ (ఊమైసీట్)"],
+        "organic": "రాగి సల్ఫేట్ లేదా హైడ్రోజన్ పెరాక్సైడ్ ద్రావణాన్ని వర్తించండి. సోకిన మొక్కలను వెంటనే తీసివేయండి.",
+        "chemical": "నివారణ చర్యగా మెటలాక్సిల్ లేదా క్లోరోథాలోనిల్-ఆధారిత సిస్టమిక్ ఫంగిసైడ్లను ఉపయోగించండి."
+    },
+    "Tomato___Leaf_Mold": {
+        "disease_name": "టమాటా ___ ఆకు తుప్పు",
+        "common_name": "టమాటా ఆకు తుప్పు",
+        "symptoms": "ఆకుల పై ఉపరితలాలపై పసుపు రంగు మచ్చలు, కింది భాగాలలో ఆలివ్-గ్రీన్ తుప్పు",
+        "prevention": [
+            "గ్రీన్హౌస్ సెట్టింగ్స్లో మంచి గాలి ప్రసరణను నిర్వహించండి",
+            "సరైన వెంటిలేషన్ ద్వారా తేమను తగ్గించండి",
+            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
+            "సోకిన ఆకులను తక్షణం తీసివేయండి"
+        ],
+        "pests": ["పాసలోరా ఫుల్వా (ఫంగస్)"],
+        "organic": "వెంటిలేషన్ను మెరుగుపరచండి. పొటాషియం బైకార్బోనేట్ లేదా సల్ఫర్-ఆధారిత ఫంగిసైడ్లతో స్ప్రే చేయండి.",
+        "chemical": "ఇన్ఫెక్షన్ యొక్క మొదటి సంకేతంలో క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Septoria_leaf_spot": {
+        "disease_name": "టమాటా ___ సెప్టోరియా ఆకు మచ్చ",
+        "common_name": "టమాటా సెప్టోరియా ఆకు మచ్చ",
+        "symptoms": "చిన్న, వృత్తాకార మచ్చలు ముదురు సరిహద్దులతో మరియు తేలికపాటి కేంద్రాలతో, తరచుగా నల్ల పైక్నిడియాతో",
+        "prevention": [
+            "వ్యాధి యొక్క మొదటి సంకేతంలో ఫంగిసైడ్లను వర్తించండి",
+            "సోకిన ఆకులను తీసివేసి వాటిని నాశనం చేయండి",
+            "ఓవర్హెడ్ నీటిపారుదల నివారించండి",
+            "గాలి ప్రసరణ మెరుగుపడడానికి మొక్కలను కట్టండి"
+        ],
+        "pests": ["సెప్టోరియా లైకోపెర్సికి (ఫంగస్)"],
+        "organic": "రాగి ఫంగిసైడ్లు లేదా నీం ఆయిల్ను ఉపయోగించండి. సోకిన ఆకులను తీసివేసి నాశనం చేయండి.",
+        "chemical": "ప్రతి 7-10 రోజులకు క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Spider_mites Two-spotted_spider_mite": {
+        "disease_name": "టమాటా ___ స్పైడర్ మైట్స్ టూ-స్పాటెడ్ స్పైడర్ మైట్",
+        "common_name": "టమాటా పై రెండు చుక్కల స్పైడర్ మైట్",
+        "symptoms": "ఆకులపై స్టిప్లింగ్, సూక్ష్మ జాలకం, ఆకు పసుపు రంగు మరియు చివరికి ఆకుల రాల్చడం",
+        "prevention": [
+            "ప్రెడేటరీ మైట్స్ను విడుదల చేయండి",
+            "ఇన్ఫెస్టేషన్ గుర్తించబడినప్పుడు మైటిసైడ్లను వర్తించండి",
+            "మైట్ పునరుత్పత్తిని నిరుత్సాహపరచడానికి తేమను పెంచండి",
+            "భారీగా సోకిన ఆకులను తీసివేయండి"
+        ],
+        "pests": ["టెట్రానిచస్ urticae (మైట్)"],
+        "organic": "ఫైటోసియులస్ పెర్సిమిలిస్ ప్రెడేటరీ మైట్స్ను విడుదల చేయండి. నీం ఆయిల్ లేదా ఇన్సెక్టిసైడల్ సోప్తో స్ప్రే చేయండి.",
+        "chemical": "మైట్స్ గుర్తించబడినప్పుడు అబామెక్టిన్ లేదా స్పైరోమెసిఫెన్-ఆధారిత మైటిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Target_Spot": {
+        "disease_name": "టమాటా ___ టార్గెట్ స్పాట్",
+        "common_name": "టమాటా టార్గెట్ స్పాట్",
+        "symptoms": "లక్ష్యాన్ని పోలి ఉండే కేంద్రిక వలయాలు కలిగిన వృత్తాకార మచ్చలు, తరచుగా పసుపు రంగు హాలోలతో",
+        "prevention": [
+            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
+            "పంట తర్వాత సోకిన మొక్కల శిధిలాలను తీసివేయండి",
+            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి",
+            "సరైన దూరం ద్వారా గాలి ప్రసరణను మెరుగుపరచండి"
+        ],
+        "pests": ["కోరినెస్పోరా కాసిసికోలా (ఫంగస్)"],
+        "organic": "రాగి-ఆధారిత ఫంగిసైడ్లు లేదా బేకింగ్ సోడా స్ప్రేలను ఉపయోగించండి. మొక్కల దూరాన్ని మెరుగుపరచండి.",
+        "chemical": "నివారణగా క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Tomato_Yellow_Leaf_Curl_Virus": {
+        "disease_name": "టమాటా ___ టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్",
+        "common_name": "టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్",
+        "symptoms": "ఆకుల పైకి వంకరలు, ఆకుల అంచుల పసుపు రంగు, నిలిచిన వృద్ధి",
+        "prevention": [
+            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఉపయోగించండి",
+            "ఇన్సెక్టిసైడ్లతో వైట్ఫ్లై జనాభాను నియంత్రించండి",
+            "వైరస్ మూలాన్ని తగ్గించడానికి సోకిన మొక్కలను తీసివేయండి",
+            "వైట్ఫ్లైలను నిరుత్సాహపరచడానికి రిఫ్లెక్టివ్ మల్చ్లను ఉపయోగించండి"
+        ],
+        "pests": ["బెమిసియా టాబాసి (వైట్ఫ్లై) - వెక్టర్", "టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్"],
+        "organic": "వైట్ఫ్లైల కోసం పసుపు స్టికీ ట్రాప్లను ఉపయోగించండి. నీం ఆయిల్తో స్ప్రే చేయండి. సోకిన మొక్కలను తీసివేయండి.",
+        "chemical": "వైట్ఫ్లై నియంత్రణ కోసం ఇమిడాక్లోప్రిడ్ లేదా థియామెథోక్సామ్ సిస్టమిక్ ఇన్సెక్టిసైడ్లను వర్తించండి."
+    },
+    "Tomato___Tomato_mosaic_virus": {
+        "disease_name": "టమాటా ___ టమాటా మొజైక్ వైరస్",
+        "common_name": "టమాటా మొజైక్ వైరస్",
+        "symptoms": "ఆకులపై మచ్చల తేలికపాటి మరియు ముదురు ఆకుపచ్చ నమూనాలు, ఆకు వికృతీకరణ, తగ్గిన పండ్ల దిగుబడి",
+        "prevention": [
+            "వైరస్-ఉచిత ధృవీకరించిన విత్తనాలను ఉపయోగించండి",
+            "బ్లీచ్ సొల్యూషన్తో సాధనాలను క్రమం తప్పకుండా శుభ్రపరచండి",
+            "ఆఫిడ్ జనాభాను నియంత్రించండి",
+            "సోకిన మొక్కలను తీసివేసి నాశనం చేయండి"
+        ],
+        "pests": ["వివిధ ఆఫిడ్ ప్రజాతులు - వెక్టర్లు", "టమాటా మొజైక్ వైరస్"],
+        "organic": "పాల స్ప్రే (1 భాగం పాలు 9 భాగాలు నీరు) ఉపయోగించండి. నీం ఆయిల్తో ఆఫిడ్లను నియంత్రించండి.",
+        "chemical": "ప్రభావవంతమైన రసాయన చికిత్స లేదు. నివారణ మరియు వెక్టర్ నియంత్రణపై దృష్టి పెట్టండి."
+    },
+    "Tomato___healthy": {
+        "disease_name": "టమాటా ఆరోగ్యకరమైన",
+        "common_name": "ఆరోగ్యకరమైన టమాటా మొక్క",
+        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
+        "prevention": [
+            "సరైన మొక్క పోషణను నిర్వహించండి",
+            "పంట భ్రమణం అభ్యసించండి",
+            "వ్యాధి యొక్క ప్రారంభ సంకేతాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి",
+            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తనాలను ఉపయోగించండి"
+        ],
+        "pests": ["ఏవీ లేవు"],
+        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
+        "chemical": "ఆరోగ్యకరమైన మొక్కలకు రసాయన చికిత్స అవసరం లేదు."
+    }
+}
+
+# Shown when the model predicts a label without an advisory entry
+UNKNOWN_ADVISORY = {
+    "precautions": ["Consult local agricultural officer for specific advice"],
+    "pests": ["Unknown pest"],
+    "common_name": "Unknown Disease",
+    "symptoms": "Unknown symptoms",
+    "organic": "Use organic methods like neem oil, biocontrol agents, and cultural practices",
+    "chemical": "Consult with agricultural expert for appropriate chemical treatments"
+}
+
+# Common translations
+common_translations = {
+    "None": "ఏవీ లేవు",
+    "Unknown Disease": "తెలియని వ్యాధి",
+    "Unknown symptoms": "తెలియని లక్షణాలు",
+    "Unknown pest": "తెలియని కీటకం",
+    "Use organic methods like neem oil, biocontrol agents, and cultural practices": "నీం ఆయిల్, జీవ నియంత్రణ ఏజెంట్లు మరియు సాంస్కృతిక పద్ధతుల వంటి సేంద్రీయ పద్ధతులను ఉపయోగించండి",
+    "Consult with agricultural expert for appropriate chemical treatments": "సరైన రసాయన చికిత్సల కోసం వ్యవసాయ నిపుణునితో సంప్రదించండి"
+}
+
+# Per-language translation tables, keyed by language code. Adding a language
+# only adds an entry here; lookups stay a single dict fetch.
+TRANSLATIONS = {
+    "te": telugu_disease_translations,
+}
+
+# Field pairs (English advisory key, translated key) aligned for reverse lookups
+_ALIGNED_FIELDS = [
+    ("common_name", "common_name"),
+    ("symptoms", "symptoms"),
+    ("organic", "organic"),
+    ("chemical", "chemical"),
+    ("precautions", "prevention"),
+    ("pests", "pests"),
+]
+
+
+def _build_phrase_index(table):
+    """
+    English phrase -> translated phrase, built by aligning every advisory field
+    with its translation. Translated phrases map to themselves.
+    """
+    index = dict(common_translations)
+    for label, translated in table.items():
+        english = disease_info.get(label, {})
+        for en_key, tr_key in _ALIGNED_FIELDS:
+            en_value, tr_value = english.get(en_key), translated.get(tr_key)
+            if isinstance(en_value, list) and isinstance(tr_value, list):
+                index.update(zip(en_value, tr_value))
+                index.update((v, v) for v in tr_value)
+            elif isinstance(en_value, str) and isinstance(tr_value, str):
+                index[en_value] = tr_value
+                index[tr_value] = tr_value
+    return index
+
+
+_PHRASE_INDEX = {lang: _build_phrase_index(table) for lang, table in TRANSLATIONS.items()}
+
+
+def translate(text, language="te"):
+    """
+    O(1) phrase translation; unknown phrases are returned unchanged.
+    """
+    return _PHRASE_INDEX.get(language, {}).get(text, text)
+
+
+def translate_to_telugu(text):
+    return translate(text, "te")
+
+
+def _build_translation(label, info, language):
+    translated = dict(TRANSLATIONS[language].get(label, {}))
+    if not translated:
+        translated = {
+            "disease_name": translate(label, language),
+            "common_name": translate(info["common_name"], language),
+            "symptoms": translate(info["symptoms"], language),
+            "prevention": [translate(precaution, language) for precaution in info["precautions"]],
+            "pests": [translate(pest, language) for pest in info["pests"]],
+        }
+    # Ensure we have all required fields
+    translated.setdefault("organic", translate(info["organic"], language))
+    translated.setdefault("chemical", translate(info["chemical"], language))
+    return translated
+
+
+def _build_advisory(label, info):
+    advisory = {
+        "organic": info["organic"],
+        "chemical": info["chemical"],
+        "prevention": info["precautions"],
+        "pests": info["pests"],
+        "common_name": info["common_name"],
+        "symptoms": info["symptoms"],
+    }
+    # Translations keep the response shape the frontend expects ("telugu" key)
+    advisory["telugu"] = _build_translation(label, info, "te")
+    return advisory
+
+
+# Full advisory response per label, built once at import. Treat as read-only:
+# the same objects are returned to every request.
+ADVISORIES = MappingProxyType({
+    label: _build_advisory(label, info) for label, info in disease_info.items()
+})
+
+_UNKNOWN = {}
+
+
+def get_advisory(label):
+    """
+    Prebuilt advisory payload (with translations) for a predicted label.
+    """
+    advisory = ADVISORIES.get(label)
+    if advisory is None:
+        advisory = _UNKNOWN.get(label)
+        if advisory is None:
+            advisory = _UNKNOWN.setdefault(label, _build_advisory(label, UNKNOWN_ADVISORY))
+    return advisory
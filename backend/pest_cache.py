@@ -0,0 +1,184 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from caching import LRUCache
+from models import db, PestResultCache
+
+
+def content_hash(data):
+    """
+    SHA-256 of the uploaded bytes, used as the content address of an image.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def artifact_version(path):
+    """
+    Short content hash of a model artifact, so that cached results are tied to
+    the exact weights that produced them.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def image_exists(path):
+    return not path or os.path.exists(path)
+
+
+class DetectionCache:
+    """
+    Two-tier cache of pest detection results keyed by (image hash, model version).
+
+    The in-memory LRU tier answers repeated uploads within a worker, and the
+    pest_result_cache table keeps results across restarts and workers. Since
+    entries are keyed by model version, a retrained artifact never serves
+    stale predictions; rows of other versions are only purged once they are
+    older than retention_hours, so workers of a rolling deploy running
+    different versions don't wipe each other's entries.
+    """
+
+    PURGE_INTERVAL = 3600  # seconds
+
+    def __init__(self, maxsize=2048, retention_hours=168):
+        self.memory = LRUCache(maxsize)
+        self.retention_hours = retention_hours
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+        self.db_hits = 0
+
+    def _purge_stale(self, model_version):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.PURGE_INTERVAL
+        cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+        try:
+            PestResultCache.query.filter(
+                PestResultCache.model_version != model_version,
+                PestResultCache.created_at < cutoff
+            ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error purging stale pest cache rows: {e}")
+
+    def get(self, image_hash, model_version):
+        if not model_version:
+            return None
+        self._purge_stale(model_version)
+
+        key = (image_hash, model_version)
+        entry = self.memory.get(key)
+        if entry is not None:
+            if image_exists(entry["image_path"]):
+                return entry
+            # The image was deleted with its last report (possibly by another
+            # worker), so the entry is treated as a miss
+            self.memory.pop(key)
+
+        row = PestResultCache.query.filter_by(
+            content_hash=image_hash, model_version=model_version
+        ).first()
+        if row is None:
+            return None
+        if not image_exists(row.image_path):
+            # Removed with the caller's session so that the fresh result can
+            # be stored under the same key
+            db.session.delete(row)
+            db.session.flush()
+            return None
+
+        entry = {
+            "predicted_label": row.predicted_label,
+            "confidence": row.confidence,
+            "advisory": row.advisory_json,
+            "image_path": row.image_path,
+            "predictions": row.predictions_json,
+        }
+        self.memory.set(key, entry)
+        self.db_hits += 1
+        return entry
+
+    def set(self, image_hash, model_version, predicted_label, confidence, advisory, image_path, predictions=None):
+        if not model_version:
+            return
+        entry = {
+            "predicted_label": predicted_label,
+            "confidence": confidence,
+            "advisory": advisory,
+            "image_path": image_path,
+            "predictions": predictions,
+        }
+        self.memory.set((image_hash, model_version), entry)
+
+        # The row is added to the caller's session and committed with the report
+        try:
+            with db.session.begin_nested():
+                db.session.add(PestResultCache(
+                    content_hash=image_hash,
+                    model_version=model_version,
+                    image_path=image_path,
+                    predicted_label=predicted_label,
+                    confidence=confidence,
+                    advisory_json=advisory,
+                    predictions_json=predictions,
+                ))
+        except IntegrityError:
+            # Another worker stored the same image first
+            pass
+
+    def set_many(self, model_version, rows):
+        """
+        Stores several results at once; rows are tuples of (image_hash,
+        predicted_label, confidence, advisory, image_path, predictions). The
+        table insert skips hashes already stored (by another worker, or twice
+        in rows) with INSERT IGNORE on MySQL and ON CONFLICT DO NOTHING
+        elsewhere, and is committed with the caller's session.
+        """
+        if not model_version or not rows:
+            return
+        records = []
+        for image_hash, predicted_label, confidence, advisory, image_path, predictions in rows:
+            self.memory.set((image_hash, model_version), {
+                "predicted_label": predicted_label,
+                "confidence": confidence,
+                "advisory": advisory,
+                "image_path": image_path,
+                "predictions": predictions,
+            })
+            records.append({
+                "content_hash": image_hash,
+                "model_version": model_version,
+                "image_path": image_path,
+                "predicted_label": predicted_label,
+                "confidence": confidence,
+                "advisory_json": advisory,
+                "predictions_json": predictions,
+            })
+        table = PestResultCache.__table__
+        dialect = db.engine.dialect.name
+        if dialect == "mysql":
+            statement = table.insert().prefix_with("IGNORE")
+        else:
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(table).on_conflict_do_nothing(index_elements=["content_hash", "model_version"])
+        db.session.execute(statement, records)
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats["db_hits"] = self.db_hits
+        return stats
@@ -0,0 +1,247 @@
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from http_client import http_client
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class CallbackRejected(ValueError):
+    """Raised for callback URLs the server must not post to."""
+
+
+def validate_callback_url(url, allowed_hosts=()):
+    """
+    Checks that a job callback URL is http(s) and points at the public
+    internet: with an allowlist the host must be on it, and every address
+    the host resolves to must be globally routable (no loopback, private,
+    link-local or cloud metadata addresses). Raises CallbackRejected.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise CallbackRejected("callback_url must be an http(s) URL")
+    host = parts.hostname.lower()
+    if allowed_hosts and host not in allowed_hosts:
+        raise CallbackRejected(f"callback_url host {host} is not allowed")
+
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError) as e:
+        raise CallbackRejected(f"callback_url host {host} cannot be resolved: {e}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if not ip.is_global or ip.is_multicast:
+            raise CallbackRejected(f"callback_url host {host} resolves to a non-public address")
+
+
+class JobQueue:
+    """
+    Durable job queue backed by a local SQLite file, so async pest detection
+    needs no external broker.
+
+    Any number of worker threads (in any number of processes sharing the file)
+    claim jobs with an IMMEDIATE transaction, run the handler inside a Flask
+    context and store the JSON result. Callers can long-poll a job with
+    wait(); an optional callback URL receives the result as a POST when the
+    job finishes. Callback URLs are checked with validate_callback_url when
+    the job is submitted and again before delivery, since DNS can change in
+    between.
+    """
+
+    def __init__(self, db_path, handler, num_workers=2, retention_hours=24, stale_after=300, poll_interval=0.5,
+                 callback_hosts=()):
+        self.db_path = db_path
+        self.handler = handler
+        self.callback_hosts = callback_hosts
+        self.num_workers = max(1, int(num_workers))
+        self.retention = retention_hours * 3600
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+
+        self._app = None
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    farmer_id TEXT,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    callback_url TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def start(self, app):
+        """Starts the worker threads once per process."""
+        with self._start_lock:
+            if self._threads:
+                return
+            self._app = app
+            self._recover()
+            for i in range(self.num_workers):
+                thread = threading.Thread(target=self._work, name=f"pest-job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _recover(self):
+        # Jobs left running by a crashed process go back to the queue,
+        # and finished jobs past the retention window are dropped
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ? AND started_at < ?",
+                (QUEUED, RUNNING, time.time() - self.stale_after),
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - self.retention),
+            )
+
+    def enqueue(self, payload, farmer_id=None, callback_url=None):
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, farmer_id, status, payload, callback_url, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, str(farmer_id) if farmer_id is not None else None, QUEUED,
+                 json.dumps(payload), callback_url, time.time()),
+            )
+        with self._cond:
+            self._cond.notify()
+        return job_id
+
+    def _claim(self):
+        with self._connect() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                    (RUNNING, time.time(), row["id"]),
+                )
+                conn.execute("COMMIT")
+                return dict(row)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+        with self._cond:
+            self._cond.notify_all()
+
+    def _work(self):
+        while not self._stopped:
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"Error claiming pest job: {e}")
+                job = None
+
+            if job is None:
+                with self._cond:
+                    self._cond.wait(self.poll_interval)
+                continue
+
+            try:
+                # A bare request context (which also pushes the app context)
+                # lets handlers use url_for outside a real request
+                with self._app.test_request_context():
+                    result = self.handler(json.loads(job["payload"]))
+                self._finish(job["id"], DONE, result=result)
+            except Exception as e:
+                print(f"Error in pest job {job['id']}: {e}")
+                self._finish(job["id"], FAILED, error=str(e))
+
+            if job["callback_url"]:
+                self._deliver(job["id"], job["callback_url"])
+
+    def validate_callback(self, callback_url):
+        validate_callback_url(callback_url, self.callback_hosts)
+
+    def _deliver(self, job_id, callback_url):
+        try:
+            self.validate_callback(callback_url)
+            # Redirects could point anywhere, so they are not followed
+            http_client.post(callback_url, json=self.get(job_id), timeout=10, allow_redirects=False)
+        except Exception as e:
+            print(f"Error delivering pest job {job_id} to {callback_url}: {e}")
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "farmer_id": row["farmer_id"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+
+    def wait(self, job_id, timeout):
+        """
+        Long-polls a job until it finishes or timeout seconds pass. Local
+        workers wake waiters directly; jobs finished by other processes are
+        picked up on the next poll of the database.
+        """
+        deadline = time.time() + max(0.0, timeout)
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return job
+            with self._cond:
+                self._cond.wait(min(remaining, self.poll_interval))
+
+    def stop(self):
+        self._stopped = True
+        with self._cond:
+            self._cond.notify_all()
@@ -0,0 +1,112 @@
+import os
+import numpy as np
+
+
+class KerasBackend:
+    """
+    Runs the original .h5 model through full TensorFlow/Keras.
+    """
+    name = "keras"
+
+    def __init__(self, model_path):
+        import tensorflow as tf
+        self.model_path = model_path
+        self.model = tf.keras.models.load_model(model_path)
+
+    def predict(self, batch):
+        return self.model.predict(batch, verbose=0)
+
+
+class TFLiteBackend:
+    """
+    Runs an exported .tflite artifact. Prefers the standalone tflite_runtime
+    package and only falls back to tf.lite when it is not installed.
+    Handles both float and int8-quantized input/output tensors.
+    """
+    name = "tflite"
+
+    def __init__(self, model_path, num_threads=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_detail = self.interpreter.get_input_details()[0]
+        self.output_detail = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self.input_detail["shape"][0])
+
+    def _resize(self, batch_size):
+        if batch_size != self._batch_size:
+            shape = list(self.input_detail["shape"])
+            shape[0] = batch_size
+            self.interpreter.resize_tensor_input(self.input_detail["index"], shape)
+            self.interpreter.allocate_tensors()
+            self.input_detail = self.interpreter.get_input_details()[0]
+            self.output_detail = self.interpreter.get_output_details()[0]
+            self._batch_size = batch_size
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        self._resize(batch.shape[0])
+
+        input_dtype = self.input_detail["dtype"]
+        if input_dtype != np.float32:
+            scale, zero_point = self.input_detail["quantization"]
+            batch = np.round(batch / scale + zero_point).astype(input_dtype)
+
+        self.interpreter.set_tensor(self.input_detail["index"], batch)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self.output_detail["index"])
+
+        if self.output_detail["dtype"] != np.float32:
+            scale, zero_point = self.output_detail["quantization"]
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+class ONNXBackend:
+    """
+    Runs an exported .onnx artifact through onnxruntime on CPU.
+    """
+    name = "onnx"
+
+    def __init__(self, model_path, num_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.model_path = model_path
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+BACKENDS = {
+    "keras": KerasBackend,
+    "tflite": TFLiteBackend,
+    "onnx": ONNXBackend,
+}
+
+
+def load_backend(name, model_path, num_threads=None):
+    """
+    Creates the inference backend selected by name ("keras", "tflite" or "onnx").
+    """
+    name = (name or "keras").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown pest model backend: {name}")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Pest model artifact not found: {model_path}")
+    if name == "keras":
+        return KerasBackend(model_path)
+    return BACKENDS[name](model_path, num_threads=num_threads)
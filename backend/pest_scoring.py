@@ -0,0 +1,96 @@
+import json
+import os
+
+import numpy as np
+
+_EPS = 1e-12
+
+
+def apply_temperature(probs, temperature=1.0):
+    """
+    Temperature-scales a batch of softmax outputs. The model ends in a softmax,
+    so its log-probabilities are the logits up to a per-row constant, which
+    the softmax below cancels out.
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    if temperature == 1.0:
+        return probs
+    logits = np.log(np.clip(probs, _EPS, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    scaled = np.exp(logits)
+    scaled /= scaled.sum(axis=1, keepdims=True)
+    return scaled
+
+
+def top_k(probs, k):
+    """
+    Indices and probabilities of the k most likely classes for every row,
+    sorted by descending probability. Uses argpartition, so only the k
+    winners per row are sorted.
+    """
+    probs = np.asarray(probs)
+    k = max(1, min(int(k), probs.shape[1]))
+    candidates = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    candidate_probs = np.take_along_axis(probs, candidates, axis=1)
+    order = np.argsort(-candidate_probs, axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1)
+    return indices, np.take_along_axis(candidate_probs, order, axis=1)
+
+
+def negative_log_likelihood(probs, labels, temperature):
+    scaled = apply_temperature(probs, temperature)
+    picked = scaled[np.arange(len(labels)), labels]
+    return float(-np.mean(np.log(np.clip(picked, _EPS, 1.0))))
+
+
+def fit_temperature(probs, labels, low=0.05, high=10.0, steps=200):
+    """
+    Fits the calibration temperature by minimizing the negative log-likelihood
+    of held-out labels over a log-spaced grid, then refining around the best
+    grid point.
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    grid = np.geomspace(low, high, steps)
+    losses = [negative_log_likelihood(probs, labels, t) for t in grid]
+    best = int(np.argmin(losses))
+
+    lo = grid[max(best - 1, 0)]
+    hi = grid[min(best + 1, steps - 1)]
+    fine = np.linspace(lo, hi, 50)
+    fine_losses = [negative_log_likelihood(probs, labels, t) for t in fine]
+    return float(fine[int(np.argmin(fine_losses))])
+
+
+def expected_calibration_error(probs, labels, bins=10):
+    probs = np.asarray(probs)
+    labels = np.asarray(labels)
+    confidence = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == labels
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    bin_ids = np.clip(np.digitize(confidence, edges[1:-1]), 0, bins - 1)
+    error = 0.0
+    for b in range(bins):
+        mask = bin_ids == b
+        if mask.any():
+            error += mask.mean() * abs(confidence[mask].mean() - correct[mask].mean())
+    return float(error)
+
+
+def load_temperature(path):
+    """
+    Reads the fitted temperature from the calibration file, defaulting to 1.0
+    (no scaling) when the file is missing or unreadable.
+    """
+    if not path or not os.path.exists(path):
+        return 1.0
+    try:
+        with open(path) as f:
+            return float(json.load(f).get("temperature", 1.0))
+    except Exception as e:
+        print(f"Error reading calibration file {path}: {e}")
+        return 1.0
+
+
+def save_temperature(path, temperature, **metrics):
+    with open(path, "w") as f:
+        json.dump({"temperature": temperature, **metrics}, f, indent=2)
@@ -4,6 +4,8 @@ from PIL import Image
 import os
 import matplotlib.pyplot as plt
 import random
+import sys
+from pest_scoring import top_k, fit_temperature, negative_log_likelihood, expected_calibration_error, apply_temperature, save_temperature
 
 # Load the trained model
 model = tf.keras.models.load_model("plant_disease_model_final.h5")
@@ -29,6 +31,9 @@ CLASS_NAMES = [
     'Tomato___healthy'
 ]
 
+# Sample leaf images shipped with the frontend, used for export calibration and parity checks
+SAMPLE_IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "images")
+
 def predict_image(image_path):
     """
     Predict the plant disease from an image
@@ -54,8 +59,8 @@ def predict_image(image_path):
     predicted_label = CLASS_NAMES[predicted_class]
     
     # Get top 3 predictions
-    top3_indices = np.argsort(prediction[0])[-3:][::-1]
-    top3_predictions = [(CLASS_NAMES[i], prediction[0][i]) for i in top3_indices]
+    top3_indices, top3_probs = top_k(prediction, 3)
+    top3_predictions = [(CLASS_NAMES[i], p) for i, p in zip(top3_indices[0], top3_probs[0])]
     
     # Display results
     title = f"Predicted: {predicted_label}\nConfidence: {confidence*100:.2f}%"
@@ -119,8 +124,171 @@ def test_on_specific_images(image_paths):
     
     return results
 
+def load_sample_batch(image_folder, limit=None):
+    """
+    Loads and preprocesses the images in a folder exactly like the API does
+    """
+    image_extensions = ('.jpg', '.jpeg', '.png')
+    paths = sorted(
+        os.path.join(image_folder, f) for f in os.listdir(image_folder)
+        if f.lower().endswith(image_extensions)
+    )
+    if limit:
+        paths = paths[:limit]
+    batch = np.stack([
+        np.array(Image.open(p).convert("RGB").resize((160, 160)), dtype=np.float32) / 255.0
+        for p in paths
+    ])
+    return paths, batch
+
+def export_tflite(output_path="plant_disease_model.tflite", quantize=False, calibration_folder=None):
+    """
+    Exports the Keras model to TFLite. With quantize=True the weights and
+    activations are converted to int8 using the calibration images as the
+    representative dataset.
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantize:
+        _, calibration = load_sample_batch(calibration_folder or SAMPLE_IMAGES_DIR, limit=100)
+
+        def representative_dataset():
+            for img in calibration:
+                yield [img[np.newaxis, ...]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    print(f"Exported TFLite model to: {output_path}")
+    return output_path
+
+def export_onnx(output_path="plant_disease_model.onnx"):
+    """
+    Exports the Keras model to ONNX (requires tf2onnx)
+    """
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None, 160, 160, 3), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=output_path)
+    print(f"Exported ONNX model to: {output_path}")
+    return output_path
+
+def check_parity(backend_name, artifact_path, image_folder=None, tolerance=0.05):
+    """
+    Compares an exported artifact against the .h5 model on the sample images.
+    Reports top-1 agreement and the largest per-class probability difference.
+    """
+    from pest_runtime import load_backend
+
+    paths, batch = load_sample_batch(image_folder or SAMPLE_IMAGES_DIR)
+    reference = model.predict(batch, verbose=0)
+    exported = load_backend(backend_name, artifact_path).predict(batch)
+
+    agree = np.argmax(reference, axis=1) == np.argmax(exported, axis=1)
+    max_diff = float(np.max(np.abs(reference - exported)))
+
+    print(f"Parity check ({backend_name}) on {len(paths)} images")
+    print(f"Top-1 agreement: {agree.mean()*100:.2f}%")
+    print(f"Max probability difference: {max_diff:.4f}")
+    for path, ok in zip(paths, agree):
+        if not ok:
+            print(f"  Mismatch: {os.path.basename(path)}")
+
+    return bool(agree.all() and max_diff <= tolerance)
+
+def label_for_file(filename):
+    """
+    Maps a sample file name such as "Tomato___Early_blight3.JPG" to its class
+    index, or None for images that are not labelled leaf samples
+    """
+    stem = os.path.splitext(filename)[0].rstrip("0123456789")
+    if not stem:
+        return None
+    matches = [i for i, name in enumerate(CLASS_NAMES) if name.startswith(stem)]
+    return matches[0] if len(matches) == 1 else None
+
+def load_labelled_batch(image_folder):
+    """
+    Loads labelled images either from class sub-folders (the training layout)
+    or from flat files named after their class (the public/images layout)
+    """
+    paths, labels = [], []
+    for entry in sorted(os.listdir(image_folder)):
+        full_path = os.path.join(image_folder, entry)
+        if os.path.isdir(full_path) and entry in CLASS_NAMES:
+            for name in sorted(os.listdir(full_path)):
+                if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+                    paths.append(os.path.join(full_path, name))
+                    labels.append(CLASS_NAMES.index(entry))
+        elif entry.lower().endswith(('.jpg', '.jpeg', '.png')):
+            label = label_for_file(entry)
+            if label is not None:
+                paths.append(full_path)
+                labels.append(label)
+
+    batch = np.stack([
+        np.array(Image.open(p).convert("RGB").resize((160, 160)), dtype=np.float32) / 255.0
+        for p in paths
+    ])
+    return paths, batch, np.array(labels)
+
+def calibrate(image_folder, output_path="pest_calibration.json"):
+    """
+    Fits the temperature used by the API to calibrate confidences, by
+    minimizing the negative log-likelihood on a folder of held-out labelled
+    images. The public/images samples are rejected: parity checks run on
+    them, and a temperature fitted on them would be overfitted.
+    """
+    if os.path.realpath(image_folder) == os.path.realpath(SAMPLE_IMAGES_DIR):
+        raise ValueError("Calibrate on held-out images, not the public/images samples used by parity checks")
+    paths, batch, labels = load_labelled_batch(image_folder)
+    probs = model.predict(batch, verbose=0)
+
+    temperature = fit_temperature(probs, labels)
+    before_nll = negative_log_likelihood(probs, labels, 1.0)
+    after_nll = negative_log_likelihood(probs, labels, temperature)
+    before_ece = expected_calibration_error(probs, labels)
+    after_ece = expected_calibration_error(apply_temperature(probs, temperature), labels)
+
+    print(f"Calibrated on {len(paths)} held-out labelled images from {image_folder}")
+    print(f"Temperature: {temperature:.4f}")
+    print(f"NLL: {before_nll:.4f} -> {after_nll:.4f}")
+    print(f"ECE: {before_ece:.4f} -> {after_ece:.4f}")
+
+    save_temperature(output_path, temperature, samples=len(paths), nll=after_nll, ece=after_ece)
+    print(f"Saved calibration to: {output_path}")
+    return temperature
+
 # Example usage
 if __name__ == "__main__":
+    # Export / parity commands:
+    #   python pest_train_model.py export-tflite [--int8]
+    #   python pest_train_model.py export-onnx
+    #   python pest_train_model.py parity tflite plant_disease_model.tflite
+    #   python pest_train_model.py calibrate <held_out_labelled_image_folder>
+    if len(sys.argv) > 1:
+        command = sys.argv[1]
+        if command == "export-tflite":
+            export_tflite(quantize="--int8" in sys.argv)
+        elif command == "export-onnx":
+            export_onnx()
+        elif command == "calibrate":
+            if len(sys.argv) < 3:
+                print("Usage: python pest_train_model.py calibrate <held_out_labelled_image_folder>")
+                sys.exit(2)
+            calibrate(sys.argv[2])
+        elif command == "parity":
+            passed = check_parity(sys.argv[2], sys.argv[3])
+            sys.exit(0 if passed else 1)
+        else:
+            print(f"Unknown command: {command}")
+            sys.exit(2)
+        sys.exit(0)
+
     print("Plant Disease Detection Model Testing")
     print("=" * 40)
     
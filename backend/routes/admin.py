@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from models import db, Farmer, Recommendation, PestReport
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from functools import wraps
+from model_registry import registry
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -57,4 +58,40 @@ def get_admin_stats():  # Changed function name to avoid conflict
         }), 200
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/pest-review', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_pest_review_queue():
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        
+        reports = PestReport.query.filter_by(needs_review=True).order_by(
+            PestReport.created_at.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
+        
+        return jsonify({
+            "reports": [{
+                "id": report.id,
+                "farmer_id": report.farmer_id,
+                "predicted_label": report.predicted_label,
+                "confidence": float(report.confidence) if report.confidence is not None else None,
+                "image_path": report.image_path,
+                "model_version": report.model_version,
+                "created_at": report.created_at.isoformat()
+            } for report in reports.items],
+            "total": reports.total,
+            "pages": reports.pages,
+            "current_page": page
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/models', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_model_stats():
+    return jsonify({"models": registry.stats()}), 200
\ No newline at end of file
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify, send_from_directory, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Recommendation, PestReport, SoilTest
+from models import db, Recommendation, PestReport, SoilTest, PestResultCache
 from datetime import datetime, timedelta
 import os
 import json
@@ -321,16 +321,29 @@ def delete_pest_report(pest_report_id):
                 'message': 'Pest report not found'
             }), 404
         
+        # Images are shared between reports of identical uploads, so the
+        # file (and the cached results pointing at it) only goes with the
+        # last report that references it
+        image_path = pest_report.image_path
+        last_reference = image_path and PestReport.query.filter(
+            PestReport.image_path == image_path,
+            PestReport.id != pest_report.id
+        ).first() is None
+        if last_reference:
+            # Entries still held in workers' memory are dropped on their next
+            # hit, once the file is gone
+            PestResultCache.query.filter_by(image_path=image_path).delete(synchronize_session=False)
+        
+        db.session.delete(pest_report)
+        db.session.commit()
+        
         # Optional: Delete associated image file
-        if pest_report.image_path and os.path.exists(pest_report.image_path):
+        if last_reference and os.path.exists(image_path):
             try:
-                os.remove(pest_report.image_path)
+                os.remove(image_path)
             except Exception as e:
                 print(f"Error deleting image file: {e}")
         
-        db.session.delete(pest_report)
-        db.session.commit()
-        
         return jsonify({
             'success': True,
             'message': 'Pest report deleted successfully'
@@ -1,10 +1,20 @@
-from flask import Blueprint, request, jsonify
-import requests
+from flask import Blueprint, request, jsonify, current_app
+from config import Config
+from http_client import market_http_client
+from caching import SWRCache
+from models import db, MarketPrice
+from market_ingest import MarketIngestor
+from market_processing import filter_crop_records, build_price_history, parse_window, price_analytics
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
+import time
+import threading
 from datetime import datetime, timedelta
 import json
 import random
 import math
+import pandas as pd
 
 market_bp = Blueprint('market', __name__)
 
@@ -28,26 +38,425 @@ CROP_MAPPING = {
     'banana': ['Banana']
 }
 
+# Days of history served per period, counted back from the latest stored
+# arrival date for the crop
+PERIOD_DAYS = {'7days': 7, '30days': 30, '90days': 90, '1year': 365}
+
+# Columns of the stored price queries, in select order
+STORED_COLUMNS = [
+    'arrival_date', 'modal_price', 'min_price', 'max_price', 'market', 'state', 'district', 'commodity', 'updated_at'
+]
+
+# Built responses per (crop, period). Prices change a few times a day, so
+# entries are served stale for hours while one background refresh runs
+market_cache = SWRCache(Config.MARKET_CACHE_TTL, Config.MARKET_STALE_TTL, maxsize=256, name="market")
+
+# Analytics per (crop, window in days, rolling days)
+analytics_cache = SWRCache(Config.MARKET_CACHE_TTL, Config.MARKET_STALE_TTL, maxsize=256, name="market-analytics")
+
+def snapshot_ttl(snapshot):
+    """Snapshots missing some crops are refetched after a short ttl"""
+    items, _ = snapshot
+    return Config.MARKET_CACHE_TTL if len(items) == len(CROP_MAPPING) else Config.MARKET_SNAPSHOT_PARTIAL_TTL
+
+# Snapshot of all crops per period
+snapshot_cache = SWRCache(
+    Config.MARKET_CACHE_TTL, Config.MARKET_STALE_TTL, maxsize=16, name="market-snapshot", ttl_for=snapshot_ttl
+)
+
+def clear_market_caches():
+    market_cache.clear()
+    analytics_cache.clear()
+    snapshot_cache.clear()
+
+# Newest updated_at in market_prices seen by this worker, and when it was read
+store_watermark = {"updated_at": None, "checked_at": 0.0}
+store_watermark_lock = threading.Lock()
+
+def check_store_updates():
+    """
+    Clears this worker's market caches once market_prices has rows newer
+    than the last ones seen. Ingestion runs in its own process
+    (`python market_ingest.py`), so workers find out through the table,
+    checked at most every MARKET_STORE_CHECK_INTERVAL seconds.
+    """
+    now = time.monotonic()
+    with store_watermark_lock:
+        if now - store_watermark["checked_at"] < Config.MARKET_STORE_CHECK_INTERVAL:
+            return
+        store_watermark["checked_at"] = now
+    latest = db.session.query(db.func.max(MarketPrice.updated_at)).scalar()
+    with store_watermark_lock:
+        changed = latest != store_watermark["updated_at"]
+        store_watermark["updated_at"] = latest
+    if changed:
+        clear_market_caches()
+
+# Fills market_prices from AgMarkNet, run by `python market_ingest.py`
+market_ingestor = MarketIngestor(
+    AGMARKNET_BASE_URL,
+    AGMARKNET_API_KEY,
+    page_size=Config.MARKET_INGEST_PAGE_SIZE,
+    interval=Config.MARKET_INGEST_INTERVAL,
+    timeout=Config.MARKET_INGEST_TIMEOUT
+)
+
+# Per-crop upstream races of the snapshot. Each crop races its filter
+# formats on the market HTTP pool, so this caps the snapshot's share of it
+snapshot_executor = ThreadPoolExecutor(max_workers=Config.MARKET_SNAPSHOT_CONCURRENCY, thread_name_prefix="market-snapshot")
+
+# AgMarkNet filter syntaxes; which one works has varied, so they are raced
+FILTER_FORMATS = ['[commodity,{}]', 'commodity,{}', '[("commodity","=","{}")]']
+
+class MarketDataUnavailable(Exception):
+    """Raised when neither the local store nor AgMarkNet has usable prices for a crop."""
+
 @market_bp.route('', methods=['GET'])
 def get_market_prices():
     try:
         crop = request.args.get('crop', 'wheat').lower()
-        period = request.args.get('period', '7days')
+        period = request.args.get('period', '30days')
         
         print(f"Fetching data for crop: {crop}")
         
-        # Try to get real data first
-        market_data = get_real_market_data(crop, period)
-        return jsonify(market_data), 200
+        check_store_updates()
+        app = current_app._get_current_object()
+        return cached_response(market_cache, (crop, period), lambda: build_market_response(app, crop, period))
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify(get_demo_data(crop)), 200
 
+@market_bp.route('/analytics', methods=['GET'])
+def get_market_analytics():
+    """
+    Rolling means, volatility, spreads and min/max/modal prices of a crop
+    across all stored markets over a window (?window=7d, 30d, 1y, ...;
+    ?rolling=<days> for the rolling mean), counted back from the latest
+    stored arrival date.
+    """
+    try:
+        crop = request.args.get('crop', 'wheat').lower()
+        rolling_days = request.args.get('rolling', 7, type=int)
+        try:
+            days = parse_window(request.args.get('window', '30d'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if not 1 <= rolling_days <= days:
+            return jsonify({"error": "rolling must be between 1 and the window length in days"}), 400
+        
+        check_store_updates()
+        app = current_app._get_current_object()
+        return cached_response(
+            analytics_cache, (crop, days, rolling_days),
+            lambda: build_analytics_response(app, crop, days, rolling_days)
+        )
+        
+    except MarketDataUnavailable as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@market_bp.route('/snapshot', methods=['GET'])
+def get_market_snapshot():
+    """
+    Current price and trend of every crop in CROP_MAPPING in one response,
+    for the Market page's overview grid.
+    """
+    try:
+        period = request.args.get('period', '30days')
+        check_store_updates()
+        app = current_app._get_current_object()
+        
+        # Only the live items are cached (partial snapshots for
+        # MARKET_SNAPSHOT_PARTIAL_TTL); crops without data get demo figures
+        # built per request
+        items, last_modified = snapshot_cache.get(period, lambda: build_snapshot(app, period))
+        
+        crops = []
+        for crop in CROP_MAPPING:
+            if crop in items:
+                crops.append(items[crop])
+            else:
+                demo = get_demo_data(crop)
+                crops.append(snapshot_item(crop, demo['price_history'][-7:], len(demo['price_history']), 'demo'))
+        
+        snapshot = {
+            'crops': crops,
+            'count': len(crops),
+            'live_count': len(items),
+            'period': period,
+            'unit': 'per quintal',
+            'last_updated': datetime.now().isoformat()
+        }
+        # Demo figures are placeholders, so only which crops have them goes
+        # into the ETag
+        validated = dict(snapshot, crops=[item if item['crop'] in items else item['crop'] for item in crops])
+        _, etag, _ = with_etag(validated, last_modified)
+        return conditional_response(snapshot, etag, last_modified)
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def build_snapshot(app, period):
+    """
+    ({crop: snapshot item}, last modified) for every crop in CROP_MAPPING.
+    Crops are read from the local store with one query; crops not stored
+    are matched in one pass over a single unfiltered AgMarkNet pull, and
+    only crops still missing after that race their filter formats, at most
+    MARKET_SNAPSHOT_CONCURRENCY crops at a time. The upstream part shares
+    one MARKET_TIMEOUT deadline. Crops left without data are not in the
+    result.
+    """
+    crops = list(CROP_MAPPING)
+    days = PERIOD_DAYS.get(period, 30)
+    deadline = time.monotonic() + Config.MARKET_TIMEOUT
+    
+    with app.app_context():
+        snapshot, stored_modified = stored_snapshot(crops, days)
+    
+    params = {
+        'api-key': AGMARKNET_API_KEY,
+        'format': 'json',
+        'limit': Config.MARKET_SNAPSHOT_PULL_LIMIT,
+        'offset': 0
+    }
+    missing = [crop for crop in crops if crop not in snapshot]
+    if missing:
+        pull = market_http_client.submit(fetch_records, params, timeout=Config.MARKET_TIMEOUT)
+        try:
+            records = pull.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            print(f"Unfiltered AgMarkNet pull failed: {e}")
+            records = []
+        snapshot.update(records_snapshot(records, missing, 'live'))
+    
+    missing = [crop for crop in crops if crop not in snapshot]
+    if missing and time.monotonic() < deadline:
+        races = {
+            crop: snapshot_executor.submit(race_crop_records, crop, params, deadline)
+            for crop in missing
+        }
+        wait(races.values(), timeout=max(0.0, deadline - time.monotonic()))
+        for crop, race in races.items():
+            if race.done() and not race.cancelled() and race.exception() is None:
+                snapshot.update(records_snapshot(race.result(), [crop], 'live'))
+            else:
+                race.cancel()
+    
+    # Newest ingest of the stored crops, or newest arrival date of the rest
+    modified = [parse_arrival(item['last_date']) for item in snapshot.values()]
+    if stored_modified is not None:
+        modified.append(stored_modified)
+    last_modified = max(modified) if modified else None
+    return snapshot, last_modified
+
+def race_crop_records(crop, params, deadline):
+    """Records of the first filter format that returns any for a crop before the deadline"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return []
+    name = CROP_MAPPING.get(crop, [crop.title()])[0]
+    return market_http_client.first(
+        [lambda f=filter_format: fetch_records(dict(params, limit=200, filters=f.format(name)), timeout=remaining)
+         for filter_format in FILTER_FORMATS],
+        timeout=remaining
+    ) or []
+
+def fetch_records(params, timeout=None):
+    """Records of one AgMarkNet call, or [] when the call fails"""
+    try:
+        data = fetch_agmarknet(params, timeout=timeout)
+    except Exception as e:
+        print(f"AgMarkNet call failed: {e}")
+        return []
+    return (data or {}).get('records') or []
+
+def stored_snapshot(crops, days):
+    """
+    (snapshot items, newest ingest time) of the crops found in
+    market_prices, from a single range query over all their commodities.
+    Each crop's window ends at its own latest arrival date.
+    """
+    names = {name for crop in crops for name in CROP_MAPPING.get(crop, [crop.title()])}
+    commodity_filter = db.or_(*[MarketPrice.commodity.like(f'{name}%') for name in names])
+    latest_by_commodity = dict(db.session.query(
+        MarketPrice.commodity, db.func.max(MarketPrice.arrival_date)
+    ).filter(commodity_filter).group_by(MarketPrice.commodity).all())
+    if not latest_by_commodity:
+        return {}, None
+    
+    # Same prefix match as query_stored_prices
+    commodities = {}
+    for crop in crops:
+        prefixes = tuple(name.lower() for name in CROP_MAPPING.get(crop, [crop.title()]))
+        matched = [commodity for commodity in latest_by_commodity if commodity.lower().startswith(prefixes)]
+        if matched:
+            commodities[crop] = matched
+    starts = {
+        crop: max(latest_by_commodity[commodity] for commodity in matched) - timedelta(days=days)
+        for crop, matched in commodities.items()
+    }
+    
+    rows = db.session.query(
+        MarketPrice.arrival_date, MarketPrice.modal_price, MarketPrice.min_price, MarketPrice.max_price,
+        MarketPrice.market, MarketPrice.state, MarketPrice.district, MarketPrice.commodity, MarketPrice.updated_at
+    ).filter(
+        MarketPrice.commodity.in_(list(latest_by_commodity)),
+        MarketPrice.arrival_date > min(starts.values())
+    ).all()
+    frame = pd.DataFrame(rows, columns=STORED_COLUMNS)
+    
+    snapshot = {}
+    arrival = pd.to_datetime(frame['arrival_date'])
+    for crop, matched in commodities.items():
+        selected = frame['commodity'].isin(matched) & (arrival > pd.Timestamp(starts[crop]))
+        crop_frame = frame[selected].assign(arrival_date=arrival[selected])
+        snapshot.update(records_snapshot(crop_frame, [crop], 'live', match=False))
+    return snapshot, last_ingested(frame[frame['commodity'].isin(
+        [commodity for crop in snapshot for commodity in commodities[crop]]
+    )])
+
+def records_snapshot(records, crops, data_quality, match=True):
+    """
+    Snapshot items of the crops with at least 3 price points in records (or
+    a DataFrame of them; the same threshold as process_real_data), matching
+    commodity names first unless match is False.
+    """
+    snapshot = {}
+    for crop in crops:
+        crop_records = filter_crop_records(records, CROP_MAPPING.get(crop, [crop.title()]), crop) if match else records
+        history = build_price_history(crop_records, crop)
+        if len(history) >= 3:
+            snapshot[crop] = snapshot_item(crop, history[-7:], len(history), data_quality)
+    return snapshot
+
+def snapshot_item(crop, recent_history, data_points, data_quality):
+    current_price = recent_history[-1]['price']
+    return {
+        'crop': crop,
+        'current_price': current_price,
+        'current_price_display': f'₹{current_price:,.2f}',
+        'trend': calculate_trend(recent_history),
+        'last_date': recent_history[-1]['date'],
+        'data_points': data_points,
+        'data_quality': data_quality
+    }
+
+def cached_response(cache, key, build):
+    """
+    JSON response for a cached (data, ETag, last modified) entry. Responses
+    carry an ETag and Last-Modified, so the Market page revalidates with a
+    304 instead of downloading the data again.
+    """
+    data, etag, last_modified = cache.get(key, build)
+    return conditional_response(data, etag, last_modified)
+
+def conditional_response(data, etag, last_modified):
+    response = jsonify(data)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def with_etag(data, last_modified):
+    """
+    (data, ETag, last modified). The ETag hashes the prices only, leaving out
+    last_updated, so rebuilds and other workers produce the same validator
+    until the prices change.
+    """
+    prices = {key: value for key, value in data.items() if key != 'last_updated'}
+    body = json.dumps(prices, sort_keys=True, default=str).encode()
+    return data, hashlib.sha1(body).hexdigest(), last_modified
+
+def last_ingested(frame):
+    """Newest ingest time of stored rows, or None for an empty frame"""
+    latest = frame['updated_at'].max() if len(frame) else None
+    return None if latest is None or pd.isna(latest) else pd.Timestamp(latest).to_pydatetime()
+
+def parse_arrival(date_str):
+    return datetime.strptime(date_str, '%d/%m/%Y')
+
+def build_market_response(app, crop, period):
+    """
+    (market data, ETag, last modified) for a crop, from the local store or,
+    for crops not ingested yet, the live API. Last-Modified is the newest
+    ingest time of the stored rows, or the newest arrival date of live data.
+    Runs in the request thread or a background refresh, hence the explicit
+    app context. Demo data is raised as MarketDataUnavailable rather than
+    cached, so the last real answer keeps being served and a recovered
+    upstream shows up on the next request.
+    """
+    with app.app_context():
+        frame = query_stored_prices(crop, PERIOD_DAYS.get(period, 30))
+        if frame is not None:
+            market_data = process_real_data(frame, crop)
+        else:
+            market_data = get_real_market_data(crop, period)
+    if market_data.get('data_quality') == 'demo':
+        raise MarketDataUnavailable(f"No market data available for {crop}")
+    
+    if frame is not None:
+        last_modified = last_ingested(frame)
+    else:
+        last_modified = parse_arrival(market_data['price_history'][-1]['date'])
+    return with_etag(market_data, last_modified)
+
+def build_analytics_response(app, crop, days, rolling_days):
+    """(analytics, ETag, last modified) for a crop from the local store"""
+    with app.app_context():
+        frame = query_stored_prices(crop, days)
+    if frame is None:
+        raise MarketDataUnavailable(f"No stored market prices for {crop}")
+    
+    analytics = price_analytics(frame, rolling_days)
+    analytics.update({
+        'crop': crop,
+        'window_days': days,
+        'unit': 'per quintal',
+        'source': 'AgMarkNet - Government of India',
+        'last_updated': datetime.now().isoformat()
+    })
+    return with_etag(analytics, last_ingested(frame))
+
+def query_stored_prices(crop, days):
+    """
+    Stored records of a crop over the last days days up to its latest
+    arrival date, as a DataFrame, or None when nothing is stored for it.
+    """
+    api_crops = CROP_MAPPING.get(crop, [crop.title()])
+    
+    # Prefix matches keep both queries on idx_market_prices_commodity_date
+    # while still catching names like "Banana - Green"
+    commodity_filter = db.or_(*[MarketPrice.commodity.like(f'{name}%') for name in api_crops])
+    latest = db.session.query(db.func.max(MarketPrice.arrival_date)).filter(commodity_filter).scalar()
+    if latest is None:
+        return None
+    
+    rows = db.session.query(
+        MarketPrice.arrival_date, MarketPrice.modal_price, MarketPrice.min_price, MarketPrice.max_price,
+        MarketPrice.market, MarketPrice.state, MarketPrice.district, MarketPrice.commodity, MarketPrice.updated_at
+    ).filter(
+        commodity_filter,
+        MarketPrice.arrival_date > latest - timedelta(days=days)
+    ).all()
+    print(f"Found {len(rows)} stored records for {crop} since {latest - timedelta(days=days - 1)}")
+    
+    frame = pd.DataFrame(rows, columns=STORED_COLUMNS)
+    frame['arrival_date'] = pd.to_datetime(frame['arrival_date'])
+    return frame
+
+def fetch_agmarknet(params, timeout=None):
+    """One AgMarkNet call: the JSON body, or None on an HTTP error"""
+    response = market_http_client.get(AGMARKNET_BASE_URL, params=params, timeout=timeout or Config.MARKET_TIMEOUT)
+    return response.json() if response.status_code == 200 else None
+
 def get_real_market_data(crop, period):
     """Get real data from AgMarkNet API with improved filtering"""
     try:
         api_crops = CROP_MAPPING.get(crop, [crop.title()])
+        started = time.monotonic()
         
         # Build API parameters - try different filter formats
         params = {
@@ -64,34 +473,21 @@ def get_real_market_data(crop, period):
             f'[("commodity","=","{api_crops[0]}")]'
         ]
         
-        response_data = None
+        # Race the filter formats and take the first one that returns records
+        response_data = market_http_client.first(
+            [lambda f=filter_format: fetch_agmarknet(dict(params, filters=f)) for filter_format in filter_formats],
+            accept=lambda data: bool(data and data.get('records')),
+            timeout=Config.MARKET_TIMEOUT
+        )
         
-        for filter_format in filter_formats:
-            try:
-                params['filters'] = filter_format
-                print(f"Trying filter format: {filter_format}")
-                
-                response = requests.get(AGMARKNET_BASE_URL, params=params, timeout=15)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    records = data.get('records', [])
-                    
-                    if records:
-                        print(f"Found {len(records)} records with filter: {filter_format}")
-                        response_data = data
-                        break
-                        
-            except Exception as e:
-                print(f"Filter format {filter_format} failed: {e}")
-                continue
-        
-        if not response_data:
+        if response_data:
+            print(f"Found {len(response_data['records'])} records with a commodity filter")
+        else:
             print("All filter formats failed, trying without filter...")
-            # Try without filter and filter manually
-            params.pop('filters', None)
-            response = requests.get(AGMARKNET_BASE_URL, params=params, timeout=15)
-            response_data = response.json() if response.status_code == 200 else None
+            # Filter the unfiltered records manually, within what is left of
+            # the timeout window
+            remaining = Config.MARKET_TIMEOUT - (time.monotonic() - started)
+            response_data = fetch_agmarknet(params, timeout=remaining) if remaining > 0 else None
         
         if response_data and 'records' in response_data:
             records = response_data['records']
@@ -101,7 +497,7 @@ def get_real_market_data(crop, period):
             crop_records = filter_crop_records(records, api_crops, crop)
             print(f"Filtered {len(crop_records)} records for {crop}")
             
-            if crop_records:
+            if len(crop_records):
                 return process_real_data(crop_records, crop)
         
         return get_demo_data(crop)
@@ -110,80 +506,19 @@ def get_real_market_data(crop, period):
         print(f"API call failed: {str(e)}")
         return get_demo_data(crop)
 
-def filter_crop_records(records, api_crops, original_crop):
-    """Enhanced filtering to handle different crop name variations"""
-    crop_records = []
-    
-    for record in records:
-        try:
-            commodity = record.get('commodity', '').lower()
-            original_crop_lower = original_crop.lower()
-            
-            # Multiple matching strategies
-            matches = False
-            
-            # Direct match
-            if any(crop.lower() in commodity for crop in api_crops):
-                matches = True
-            # Partial match for common variations
-            elif original_crop_lower in commodity:
-                matches = True
-            # Handle specific cases
-            elif original_crop == 'chilli' and ('chilli' in commodity or 'chili' in commodity):
-                matches = True
-            elif original_crop == 'corn' and ('maize' in commodity or 'corn' in commodity):
-                matches = True
-            
-            if matches:
-                crop_records.append(record)
-                
-        except Exception as e:
-            print(f"Error filtering record: {e}")
-            continue
-    
-    return crop_records
-
 def process_real_data(records, crop):
-    """Process real API data with enhanced error handling"""
-    price_history = []
-    
-    for record in records:
-        try:
-            # Extract price data with better validation
-            modal_price = record.get('modal_price', '0')
-            min_price = record.get('min_price', '0') 
-            max_price = record.get('max_price', '0')
-            date_str = record.get('arrival_date', '')
-            
-            # Clean and validate price data
-            price_value = extract_valid_price(modal_price, min_price, max_price)
-            
-            if price_value and date_str and is_valid_date(date_str):
-                price_history.append({
-                    'date': date_str,
-                    'price': round(price_value, 2),
-                    'market': record.get('market', 'Unknown Market'),
-                    'state': record.get('state', 'Unknown State'),
-                    'district': record.get('district', 'Unknown District'),
-                    'commodity': record.get('commodity', crop)
-                })
-                
-        except Exception as e:
-            print(f"Error processing record: {e}")
-            continue
+    """Price history and trend from API records or a DataFrame of them"""
+    history = build_price_history(records, crop)
     
-    if price_history:
-        # Remove duplicates and sort by date
-        price_history = remove_duplicate_dates(price_history)
-        price_history.sort(key=lambda x: datetime.strptime(x['date'], '%d/%m/%Y'))
-        
-        print(f"Processed {len(price_history)} unique price records")
+    if len(history):
+        print(f"Processed {len(history)} unique price records")
         
         # Ensure we have enough data
-        if len(price_history) < 3:
-            print(f"Not enough data points ({len(price_history)}), using demo data")
+        if len(history) < 3:
+            print(f"Not enough data points ({len(history)}), using demo data")
             return get_demo_data(crop)
         
+        price_history = history[-30:]  # Last 30 entries
         current_price = price_history[-1]['price']
         trend = calculate_trend(price_history)
         
@@ -192,61 +527,19 @@ def process_real_data(records, crop):
             'current_price': current_price,
             'current_price_display': f'₹{current_price:,.2f}',
             'trend': trend,
-            'price_history': price_history[-30:],  # Last 30 entries
+            'price_history': price_history,
             'source': 'AgMarkNet - Government of India',
             'data_quality': 'live',
             'last_updated': datetime.now().isoformat(),
-            'total_records': len(price_history),
+            'total_records': len(history),
             'unit': 'per quintal',
             'location': 'Various Markets across India',
-            'data_points': len(price_history)
+            'data_points': len(history)
         }
     
     print("No valid price data found after processing")
     return get_demo_data(crop)
 
-def extract_valid_price(modal_price, min_price, max_price):
-    """Extract and validate price from multiple fields"""
-    # Try modal price first
-    if modal_price and is_valid_price(modal_price):
-        return float(modal_price)
-    
-    # Try average of min/max
-    if (min_price and max_price and 
-        is_valid_price(min_price) and is_valid_price(max_price)):
-        return (float(min_price) + float(max_price)) / 2
-    
-    return None
-
-def is_valid_price(price_str):
-    """Check if price string is valid"""
-    try:
-        price = float(price_str)
-        return price > 0 and price < 1000000  # Reasonable price range
-    except:
-        return False
-
-def is_valid_date(date_str):
-    """Validate date format"""
-    try:
-        datetime.strptime(date_str, '%d/%m/%Y')
-        return True
-    except:
-        return False
-
-def remove_duplicate_dates(price_history):
-    """Remove duplicate dates, keeping the latest entry for each date"""
-    unique_dates = {}
-    for record in price_history:
-        date_key = record['date']
-        current_price = record['price']
-        
-        # Keep the record with higher price for the same date
-        if date_key not in unique_dates or current_price > unique_dates[date_key]['price']:
-            unique_dates[date_key] = record
-    
-    return list(unique_dates.values())
-
 def calculate_trend(price_history):
     """Calculate price trend based on recent data"""
     if len(price_history) < 2:
@@ -335,7 +628,7 @@ def test_endpoint():
         }
         
         # Test without filter first to see what's available
-        response = requests.get(AGMARKNET_BASE_URL, params=params, timeout=10)
+        response = market_http_client.get(AGMARKNET_BASE_URL, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -383,9 +676,18 @@ def health_check():
     return jsonify({
         'status': 'healthy', 
         'timestamp': datetime.now().isoformat(),
-        'api_key_configured': bool(AGMARKNET_API_KEY)
+        'api_key_configured': bool(AGMARKNET_API_KEY),
+        'ingestion': market_ingestor.stats()
     })
 
+@market_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({
+        'market': market_cache.stats(),
+        'analytics': analytics_cache.stats(),
+        'snapshot': snapshot_cache.stats()
+    }), 200
+
 # Crop list endpoint
 @market_bp.route('/crops', methods=['GET'])
 def get_available_crops():
@@ -1,15 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_from_directory, url_for, current_app
 from werkzeug.utils import secure_filename
 from models import db, PestReport
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from config import Config
+from batching import MicroBatcher
+from pest_runtime import load_backend
+from pest_cache import DetectionCache, content_hash, artifact_version
+from image_preprocess import decode_image, to_model_input, ImageTooLargeError
+from pest_jobs import JobQueue, CallbackRejected
+from pest_scoring import apply_temperature, top_k, load_temperature
+from pest_advisory import get_advisory
+from model_registry import registry
+from routes.admin import admin_required
 import os
 import uuid
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import tensorflow as tf
 import numpy as np
-from PIL import Image
-import io
 import base64
 import random
 
@@ -41,558 +50,292 @@ CLASS_NAMES = [
     'Tomato___healthy'
 ]
 
-# Enhanced disease information with specific organic and chemical treatments
-disease_info = {
-    "Corn_(maize)___Cercospora_leaf_spot Gray_leaf_spot": {
-        "precautions": [
-            "Use resistant hybrids when available",
-            "Rotate crops with non-host crops for at least 2 years",
-            "Plow under crop residue to reduce fungus survival",
-            "Apply fungicides when necessary",
-            "Avoid continuous corn planting in the same field"
-        ],
-        "pests": ["Cercospora zeae-maydis (fungus)"],
-        "common_name": "Gray Leaf Spot of Corn",
-        "symptoms": "Rectangular, gray to tan lesions on leaves that are bounded by leaf veins",
-        "organic": "Apply neem oil extract or copper-based fungicides. Use bio-control agents like Trichoderma.",
-        "chemical": "Apply azoxystrobin or pyraclostrobin-based fungicides at first sign of disease."
-    },
-    "Corn_(maize)___Common_rust_": {
-        "precautions": [
-            "Plant resistant hybrids",
-            "Apply fungicides early in the disease cycle",
-            "Avoid late planting in areas with history of rust",
-            "Remove volunteer corn plants that can harbor the disease"
-        ],
-        "pests": ["Puccinia sorghi (fungus)"],
-        "common_name": "Common Rust of Corn",
-        "symptoms": "Small, circular to elongated cinnamon-brown pustules on both leaf surfaces",
-        "organic": "Use sulfur dust or copper-based sprays. Maintain proper plant spacing for air circulation.",
-        "chemical": "Apply triazole-based fungicides like propiconazole when pustules first appear."
-    },
-    "Corn_(maize)___Northern_Leaf_Blight": {
-        "precautions": [
-            "Use resistant hybrids",
-            "Practice crop rotation with non-host crops",
-            "Till under crop debris to reduce inoculum",
-            "Apply fungicides when necessary"
-        ],
-        "pests": ["Exserohilum turcicum (fungus)"],
-        "common_name": "Northern Corn Leaf Blight",
-        "symptoms": "Long, elliptical, gray-green lesions that turn tan as they mature",
-        "organic": "Apply baking soda solution (1 tbsp per gallon of water) or garlic extract spray.",
-        "chemical": "Use strobilurin or triazole fungicides like trifloxystrobin or tebuconazole."
-    },
-    "Corn_(maize)___healthy": {
-        "precautions": [
-            "Maintain proper plant nutrition",
-            "Practice crop rotation",
-            "Monitor regularly for early signs of disease",
-            "Use certified disease-free seeds"
-        ],
-        "pests": ["None"],
-        "common_name": "Healthy Corn Plant",
-        "symptoms": "No visible disease symptoms",
-        "organic": "Continue good agricultural practices. No treatment needed.",
-        "chemical": "No chemical treatment required for healthy plants."
-    },
-    "Potato___Early_blight": {
-        "precautions": [
-            "Use resistant varieties when available",
-            "Apply fungicides preventatively",
-            "Avoid overhead irrigation to reduce leaf wetness",
-            "Remove and destroy infected plant debris"
-        ],
-        "pests": ["Alternaria solani (fungus)"],
-        "common_name": "Early Blight of Potato",
-        "symptoms": "Concentric rings in lesions that resemble target spots, primarily on older leaves",
-        "organic": "Spray with compost tea or baking soda solution. Use copper-based fungicides.",
-        "chemical": "Apply chlorothalonil or mancozeb-based fungicides every 7-10 days."
-    },
-    "Potato___Late_blight": {
-        "precautions": [
-            "Plant certified disease-free seed potatoes",
-            "Apply fungicides before disease appears",
-            "Destroy cull piles and volunteer plants",
-            "Avoid overhead irrigation when possible"
-        ],
-        "pests": ["Phytophthora infestans (oomycete)"],
-        "common_name": "Late Blight of Potato",
-        "symptoms": "Water-soaked lesions that expand rapidly, white fungal growth under humid conditions",
-        "organic": "Apply copper sulfate or hydrogen peroxide solution. Remove infected plants immediately.",
-        "chemical": "Use metalaxyl or mancozeb-based systemic fungicides as preventive measure."
-    },
-    "Potato___healthy": {
-        "precautions": [
-            "Maintain proper soil fertility",
-            "Practice crop rotation",
-            "Use certified disease-free seed potatoes",
-            "Monitor for pests regularly"
-        ],
-        "pests": ["None"],
-        "common_name": "Healthy Potato Plant",
-        "symptoms": "No visible disease symptoms",
-        "organic": "Maintain current organic practices. No treatment needed.",
-        "chemical": "No chemical treatment required."
-    },
-    "Tomato___Bacterial_spot": {
-        "precautions": [
-            "Use disease-free certified seeds",
-            "Apply copper-based bactericides preventatively",
-            "Avoid working with plants when they are wet",
-            "Practice crop rotation with non-host crops"
-        ],
-        "pests": ["Xanthomonas campestris pv. vesicatoria (bacteria)"],
-        "common_name": "Bacterial Spot of Tomato",
-        "symptoms": "Small, water-soaked spots that become dark and scabby, often with yellow halos",
-        "organic": "Use copper bactericides or hydrogen peroxide sprays. Apply compost tea for plant immunity.",
-        "chemical": "Apply streptomycin or oxytetracycline-based antibiotics in severe cases."
-    },
-    "Tomato___Early_blight": {
-        "precautions": [
-            "Stake plants to improve air circulation",
-            "Apply fungicides preventatively",
-            "Remove lower leaves as plant grows",
-            "Mulch to prevent soil splashing onto leaves"
-        ],
-        "pests": ["Alternaria solani (fungus)"],
-        "common_name": "Early Blight of Tomato",
-        "symptoms": "Target-like concentric rings in lesions, often starting on lower leaves",
-        "organic": "Spray with neem oil or baking soda solution. Use copper fungicides for control.",
-        "chemical": "Apply chlorothalonil or mancozeb-based fungicides at 7-10 day intervals."
-    },
-    "Tomato___Late_blight": {
-        "precautions": [
-            "Apply fungicides before disease appears",
-            "Remove and destroy infected plants immediately",
-            "Avoid overhead irrigation",
-            "Choose resistant varieties when available"
-        ],
-        "pests": ["Phytophthora infestans (oomycete)"],
-        "common_name": "Late Blight of Tomato",
-        "symptoms": "Water-soaked lesions that expand rapidly, white fungal growth under leaves in humidity",
-        "organic": "Apply copper-based fungicides or hydrogen peroxide. Remove infected plants promptly.",
-        "chemical": "Use metalaxyl or chlorothalonil-based systemic fungicides preventatively."
-    },
-    "Tomato___Leaf_Mold": {
-        "precautions": [
-            "Maintain good air circulation in greenhouse settings",
-            "Reduce humidity through proper ventilation",
-            "Apply fungicides preventatively",
-            "Remove infected leaves promptly"
-        ],
-        "pests": ["Passalora fulva (fungus)"],
-        "common_name": "Leaf Mold of Tomato",
-        "symptoms": "Yellowish spots on upper leaf surfaces with olive-green mold on undersides",
-        "organic": "Improve ventilation. Spray with potassium bicarbonate or sulfur-based fungicides.",
-        "chemical": "Apply chlorothalonil or mancozeb-based fungicides at first sign of infection."
-    },
-    "Tomato___Septoria_leaf_spot": {
-        "precautions": [
-            "Apply fungicides at first sign of disease",
-            "Remove infected leaves and destroy them",
-            "Avoid overhead watering",
-            "Stake plants to improve air circulation"
-        ],
-        "pests": ["Septoria lycopersici (fungus)"],
-        "common_name": "Septoria Leaf Spot of Tomato",
-        "symptoms": "Small, circular spots with dark borders and light centers, often with black pycnidia",
-        "organic": "Use copper fungicides or neem oil. Remove and destroy infected leaves.",
-        "chemical": "Apply chlorothalonil or mancozeb-based fungicides every 7-10 days."
-    },
-    "Tomato___Spider_mites Two-spotted_spider_mite": {
-        "precautions": [
-            "Release predatory mites",
-            "Apply miticides when infestation is detected",
-            "Increase humidity to discourage mite reproduction",
-            "Remove heavily infested leaves"
-        ],
-        "pests": ["Tetranychus urticae (mite)"],
-        "common_name": "Two-Spotted Spider Mite on Tomato",
-        "symptoms": "Stippling on leaves, fine webbing, leaf yellowing and eventual defoliation",
-        "organic": "Release Phytoseiulus persimilis predatory mites. Spray with neem oil or insecticidal soap.",
-        "chemical": "Apply abamectin or spiromesifen-based miticides when mites are detected."
-    },
-    "Tomato___Target_Spot": {
-        "precautions": [
-            "Apply fungicides preventatively",
-            "Remove infected plant debris after harvest",
-            "Practice crop rotation with non-host crops",
-            "Improve air circulation through proper spacing"
-        ],
-        "pests": ["Corynespora cassiicola (fungus)"],
-        "common_name": "Target Spot of Tomato",
-        "symptoms": "Circular spots with concentric rings resembling a target, often with yellow halos",
-        "organic": "Use copper-based fungicides or baking soda sprays. Improve plant spacing.",
-        "chemical": "Apply chlorothalonil or mancozeb-based fungicides preventatively."
-    },
-    "Tomato___Tomato_Yellow_Leaf_Curl_Virus": {
-        "precautions": [
-            "Use resistant varieties when available",
-            "Control whitefly populations with insecticides",
-            "Remove infected plants to reduce virus source",
-            "Use reflective mulches to deter whiteflies"
-        ],
-        "pests": ["Bemisia tabaci (whitefly) - vector", "Tomato yellow leaf curl virus"],
-        "common_name": "Tomato Yellow Leaf Curl Virus",
-        "symptoms": "Upward curling of leaves, yellowing of leaf margins, stunted growth",
-        "organic": "Use yellow sticky traps for whiteflies. Spray with neem oil. Remove infected plants.",
-        "chemical": "Apply imidacloprid or thiamethoxam systemic insecticides for whitefly control."
-    },
-    "Tomato___Tomato_mosaic_virus": {
-        "precautions": [
-            "Use virus-free certified seeds",
-            "Disinfect tools regularly with bleach solution",
-            "Control aphid populations",
-            "Remove and destroy infected plants"
-        ],
-        "pests": ["Various aphid species - vectors", "Tomato mosaic virus"],
-        "common_name": "Tomato Mosaic Virus",
-        "symptoms": "Mottled light and dark green patterns on leaves, leaf distortion, reduced fruit yield",
-        "organic": "Use milk spray (1 part milk to 9 parts water). Control aphids with neem oil.",
-        "chemical": "No effective chemical treatment. Focus on prevention and vector control."
-    },
-    "Tomato___healthy": {
-        "precautions": [
-            "Maintain proper plant nutrition",
-            "Practice crop rotation",
-            "Monitor regularly for early signs of disease",
-            "Use certified disease-free seeds"
-        ],
-        "pests": ["None"],
-        "common_name": "Healthy Tomato Plant",
-        "symptoms": "No visible disease symptoms",
-        "organic": "Continue current organic practices. No treatment required.",
-        "chemical": "No chemical treatment needed for healthy plants."
-    }
+MODEL_PATHS = {
+    "keras": Config.PEST_MODEL_PATH,
+    "tflite": Config.PEST_TFLITE_PATH,
+    "onnx": Config.PEST_ONNX_PATH,
 }
 
-# Enhanced Telugu translations for all diseases with complete pest translations
-telugu_disease_translations = {
-    "Corn_(maize)___Cercospora_leaf_spot Gray_leaf_spot": {
-        "disease_name": "మొక్కజొన్న ___ సెర్కోస్పోరా ఆకు మచ్చ బూడిద ఆకు మచ్చ",
-        "common_name": "మొక్కజొన్న బూడిద ఆకు మచ్చ",
-        "symptoms": "ఆకులపై దీర్ఘచతురస్రాకార, బూడిద నుండి టాన్ రంగు మచ్చలు",
-        "prevention": [
-            "అందుబాటులో ఉన్నప్పుడు నిరోధక సంకరాలను ఉపయోగించండి",
-            "కనీసం 2 సంవత్సరాలు నాన్-హోస్ట్ పంటలతో పంటలను తిప్పండి",
-            "ఫంగస్ మనుగడను తగ్గించడానికి పంట శేషాన్ని దున్నండి",
-            "అవసరమైతే ఫంగిసైడ్లను వర్తించండి",
-            "అదే పొలంలో నిరంతరం మొక్కజొన్న నాటకం నివారించండి"
-        ],
-        "pests": ["సెర్కోస్పోరా జియే-మేడిస్ (ఫంగస్)"],
-        "organic": "నీం ఆయిల్ ఎక్స్ట్రాక్ట్ లేదా రాగి-ఆధారిత ఫంగిసైడ్లను వర్తించండి. ట్రైకోడెర్మా వంటి బయో-కంట్రోల్ ఏజెంట్లను ఉపయోగించండి.",
-        "chemical": "వ్యాధి యొక్క మొదటి సంకేతంలో అజాక్సిస్ట్రోబిన్ లేదా పైరాక్లోస్ట్రోబిన్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Corn_(maize)___Common_rust_": {
-        "disease_name": "మొక్కజొన్న ___ సాధారణ తుప్పు",
-        "common_name": "మొక్కజొన్న సాధారణ తుప్పు",
-        "symptoms": "ఆకుల రెండు ఉపరితలాలపై చిన్న, వృత్తాకార నుండి పొడవాటి దాల్చినచెక్క-బ్రౌన్ పస్ట్యూల్స్",
-        "prevention": [
-            "నిరోధక సంకరాలను నాటండి",
-            "వ్యాధి చక్రం ప్రారంభంలో ఫంగిసైడ్లను వర్తించండి",
-            "తుప్పు చరిత్ర ఉన్న ప్రాంతాలలో తరువాత నాటకం నివారించండి",
-            "వ్యాధిని కలిగి ఉండే స్వచ్ఛంద మొక్కజొన్న మొక్కలను తీసివేయండి"
-        ],
-        "pests": ["పక్సినియా సోర్ఘి (ఫంగస్)"],
-        "organic": "సల్ఫర్ డస్ట్ లేదా రాగి-ఆధారిత స్ప్రేలను ఉపయోగించండి. గాలి ప్రసరణ కోసం సరైన మొక్కల దూరం నిర్వహించండి.",
-        "chemical": "పస్ట్యూల్స్ మొదట కనిపించినప్పుడు ప్రోపికోనాజోల్ వంటి ట్రయాజోల్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Corn_(maize)___Northern_Leaf_Blight": {
-        "disease_name": "మొక్కజొన్న ___ ఉత్తర ఆకు బ్లైట్",
-        "common_name": "మొక్కజొన్న ఉత్తర ఆకు బ్లైట్",
-        "symptoms": "పొడవాటి, దీర్ఘవృత్తాకార, బూడిద-ఆకుపచ్చ మచ్చలు, పరిపక్వత చెందినకొద్దీ టాన్గా మారతాయి",
-        "prevention": [
-            "నిరోధక సంకరాలను ఉపయోగించండి",
-            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి",
-            "ఇనోక్యులమ్ను తగ్గించడానికి పంట శిధిలాలను దున్నండి",
-            "అవసరమైతే ఫంగిసైడ్లను వర్తించండి"
-        ],
-        "pests": ["ఎక్స్సెరోహిలమ్ టర్సికమ్ (ఫంగస్)"],
-        "organic": "బేకింగ్ సోడా ద్రావణం (1 టీస్పూన్ ప్రతి గ్యాలన్ నీటికి) లేదా వెల్లుల్లి ఎక్స్ట్రాక్ట్ స్ప్రే వర్తించండి.",
-        "chemical": "స్ట్రోబిలూరిన్ లేదా ట్రయాజోల్ ఫంగిసైడ్లను ఉపయోగించండి."
-    },
-    "Corn_(maize)___healthy": {
-        "disease_name": "మొక్కజొన్న ఆరోగ్యకరమైన",
-        "common_name": "ఆరోగ్యకరమైన మొక్కజొన్న మొక్క",
-        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
-        "prevention": [
-            "సరైన మొక్క పోషణను నిర్వహించండి",
-            "పంట భ్రమణం అభ్యసించండి",
-            "వ్యాధి యొక్క ప్రారంభ సంకేతాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి",
-            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తనాలను ఉపయోగించండి"
-        ],
-        "pests": ["ఏవీ లేవు"],
-        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
-        "chemical": "ఆరోగ్యకరమైన మొక్కలకు రసాయన చికిత్స అవసరం లేదు."
-    },
-    "Potato___Early_blight": {
-        "disease_name": "బంగాళాదుంప ___ ప్రారంభ బ్లైట్",
-        "common_name": "బంగాళాదుంప ప్రారంభ బ్లైట్",
-        "symptoms": "లక్ష్యం మచ్చలను పోలిన మచ్చలలో కేంద్రిక వలయాలు, ప్రధానంగా పాత ఆకులపై",
-        "prevention": [
-            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఉపయోగించండి",
-            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
-            "ఆకు తడి తగ్గించడానికి ఓవర్హెడ్ నీటిపారుదల నివారించండి",
-            "సోకిన మొక్కల శిధిలాలను తీసివేసి నాశనం చేయండి"
-        ],
-        "pests": ["ఆల్టర్నేరియా సోలాని (ఫంగస్)"],
-        "organic": "కంపోస్ట్ టీ లేదా బేకింగ్ సోడా ద్రావణంతో స్ప్రే చేయండి. రాగి-ఆధారిత ఫంగిసైడ్లను ఉపయోగించండి.",
-        "chemical": "ప్రతి 7-10 రోజులకు క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Potato___Late_blight": {
-        "disease_name": "బంగాళాదుంప ___ లేట్ బ్లైట్",
-        "common_name": "బంగాళాదుంప లేట్ బ్లైట్",
-        "symptoms": "వేగంగా విస్తరించే నీటి-soaked మచ్చలు, తడి పరిస్థితులలో తెలుపు ఫంగల్ వృద్ధి",
-        "prevention": [
-            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తన బంగాళాదుంపలను నాటండి",
-            "వ్యాధి కనిపించే ముందు ఫంగిసైడ్లను వర్తించండి",
-            "కల్ పైల్స్ మరియు స్వచ్ఛంద మొక్కలను నాశనం చేయండి",
-            "సాధ్యమైనప్పుడు ఓవర్హెడ్ నీటిపారుదల నివారించండి"
-        ],
-        "pests": ["ఫైటోఫ్తోరా ఇన్ఫెస్టాన్స్ (ఊమైసీట్)"],
-        "organic": "రాగి సల్ఫేట్ లేదా హైడ్రోజన్ పెరాక్సైడ్ ద్రావణాన్ని వర్తించండి. సోకిన మొక్కలను వెంటనే తీసివేయండి.",
-        "chemical": "నివారణ చర్యగా మెటలాక్సిల్ లేదా మ్యాంకోజెబ్-ఆధారిత సిస్టమిక్ ఫంగిసైడ్లను ఉపయోగించండి."
-    },
-    "Potato___healthy": {
-        "disease_name": "బంగాళాదుంప ఆరోగ్యకరమైన",
-        "common_name": "ఆరోగ్యకరమైన బంగాళాదుంప మొక్క",
-        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
-        "prevention": [
-            "సరైన న ch సారాన్ని నిర్వహించండి",
-            "పంట భ్రమణం అభ్యసించండి",
-            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తన బంగాళాదుంపలను ఉపయోగించండి",
-            "కీటకాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి"
-        ],
-        "pests": ["ఏవీ లేవు"],
-        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
-        "chemical": "రసాయన చికిత్స అవసరం లేదు."
-    },
-    "Tomato___Bacterial_spot": {
-        "disease_name": "టమాటా ___ బ్యాక్టీరియా స్పాట్",
-        "common_name": "టమాటా బ్యాక్టీరియా మచ్చ",
-        "symptoms": "చిన్న, నీటి-soaked మచ్చలు ముదురుగా మారతాయి, తరచుగా పసుపు రంగు హాలోలతో",
-        "prevention": [
-            "వ్యాధి-ఉచిత ధృవీకరించిన విత్తనాలను ఉపయోగించండి",
-            "నివారణగా రాగి-ఆధారిత బాక్టీరిసైడ్లను వర్తించండి",
-            "మొక్కలు తడిగా ఉన్నప్పుడు వాటితో పని చేయకండి",
-            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి"
-        ],
-        "pests": ["జాంతోమోనాస్ క్యాంపెస్ట్రిస్ పి.వి. వెసికటోరియా (బాక్టీరియా)"],
-        "organic": "రాగి బాక్టీరిసైడ్లు లేదా హైడ్రోజన్ పెరాక్సైడ్ స్ప్రేలను ఉపయోగించండి. మొక్క రోగనిరోధక శక్తి కోసం కంపోస్ట్ టీని వర్తించండి.",
-        "chemical": "తీవ్రమైన సందర్భాలలో స్ట్రెప్టోమైసిన్ లేదా ఆక్సిటెట్రాసైక్లిన్-ఆధారిత యాంటీబయాటిక్లను వర్తించండి."
-    },
-    "Tomato___Early_blight": {
-        "disease_name": "టమాటా ___ ప్రారంభ బ్లైట్",
-        "common_name": "టమాటా ప్రారంభ బ్లైట్",
-        "symptoms": "లక్ష్యం వలె కనిపించే మచ్చలలో కేంద్రిక వలయాలు, తరచుగా పాత ఆకులపై ప్రారంభమవుతాయి",
-        "prevention": [
-            "గాలి ప్రసరణ మెరుగుపడడానికి మొక్కలను కట్టండి",
-            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
-            "మొక్క పెరిగేకొద్దీ దిగువ ఆకులను తీసివేయండి",
-            "న ch గిని ఆకులపై చెరగకుండా న ch పెట్టండి"
-        ],
-        "pests": ["ఆల్టర్నేరియా సోలాని (ఫంగస్)"],
-        "organic": "నీం ఆయిల్ లేదా బేకింగ్ సోడా ద్రావణంతో స్ప్రే చేయండి. నియంత్రణ కోసం రాగి ఫంగిసైడ్లను ఉపయోగించండి.",
-        "chemical": "7-10 రోజుల Intervals లో క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Late_blight": {
-        "disease_name": "టమాటా ___ లేట్ బ్లైట్",
-        "common_name": "టమాటా లేట్ బ్లైట్",
-        "symptoms": "వేగంగా విస్తరించే నీటి-soaked మచ్చలు, తడి పరిస్థితులలో ఆకుల క్రింద తెలుపు ఫంగల్ వృద్ధి",
-        "prevention": [
-            "వ్యాధి కనిపించే ముందు ఫంగిసైడ్లను వర్తించండి",
-            "సోకిన మొక్కలను వెంటనే తీసివేసి నాశనం చేయండి",
-            "ఓవర్హెడ్ నీటిపారుదల నివారించండి",
-            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఎంచుకోండి"
-        ],
-        "pests": ["ఫైటోఫ్తోరా ఇన్ఫెస్టాన్స్ (ఊమైసీట్)"],
-        "organic": "రాగి సల్ఫేట్ లేదా హైడ్రోజన్ పెరాక్సైడ్ ద్రావణాన్ని వర్తించండి. సోకిన మొక్కలను వెంటనే తీసివేయండి.",
-        "chemical": "నివారణ చర్యగా మెటలాక్సిల్ లేదా క్లోరోథాలోనిల్-ఆధారిత సిస్టమిక్ ఫంగిసైడ్లను ఉపయోగించండి."
-    },
-    "Tomato___Leaf_Mold": {
-        "disease_name": "టమాటా ___ ఆకు తుప్పు",
-        "common_name": "టమాటా ఆకు తుప్పు",
-        "symptoms": "ఆకుల పై ఉపరితలాలపై పసుపు రంగు మచ్చలు, కింది భాగాలలో ఆలివ్-గ్రీన్ తుప్పు",
-        "prevention": [
-            "గ్రీన్హౌస్ సెట్టింగ్స్లో మంచి గాలి ప్రసరణను నిర్వహించండి",
-            "సరైన వెంటిలేషన్ ద్వారా తేమను తగ్గించండి",
-            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
-            "సోకిన ఆకులను తక్షణం తీసివేయండి"
-        ],
-        "pests": ["పాసలోరా ఫుల్వా (ఫంగస్)"],
-        "organic": "వెంటిలేషన్ను మెరుగుపరచండి. పొటాషియం బైకార్బోనేట్ లేదా సల్ఫర్-ఆధారిత ఫంగిసైడ్లతో స్ప్రే చేయండి.",
-        "chemical": "ఇన్ఫెక్షన్ యొక్క మొదటి సంకేతంలో క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Septoria_leaf_spot": {
-        "disease_name": "టమాటా ___ సెప్టోరియా ఆకు మచ్చ",
-        "common_name": "టమాటా సెప్టోరియా ఆకు మచ్చ",
-        "symptoms": "చిన్న, వృత్తాకార మచ్చలు ముదురు సరిహద్దులతో మరియు తేలికపాటి కేంద్రాలతో, తరచుగా నల్ల పైక్నిడియాతో",
-        "prevention": [
-            "వ్యాధి యొక్క మొదటి సంకేతంలో ఫంగిసైడ్లను వర్తించండి",
-            "సోకిన ఆకులను తీసివేసి వాటిని నాశనం చేయండి",
-            "ఓవర్హెడ్ నీటిపారుదల నివారించండి",
-            "గాలి ప్రసరణ మెరుగుపడడానికి మొక్కలను కట్టండి"
-        ],
-        "pests": ["సెప్టోరియా లైకోపెర్సికి (ఫంగస్)"],
-        "organic": "రాగి ఫంగిసైడ్లు లేదా నీం ఆయిల్ను ఉపయోగించండి. సోకిన ఆకులను తీసివేసి నాశనం చేయండి.",
-        "chemical": "ప్రతి 7-10 రోజులకు క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Spider_mites Two-spotted_spider_mite": {
-        "disease_name": "టమాటా ___ స్పైడర్ మైట్స్ టూ-స్పాటెడ్ స్పైడర్ మైట్",
-        "common_name": "టమాటా పై రెండు చుక్కల స్పైడర్ మైట్",
-        "symptoms": "ఆకులపై స్టిప్లింగ్, సూక్ష్మ జాలకం, ఆకు పసుపు రంగు మరియు చివరికి ఆకుల రాల్చడం",
-        "prevention": [
-            "ప్రెడేటరీ మైట్స్ను విడుదల చేయండి",
-            "ఇన్ఫెస్టేషన్ గుర్తించబడినప్పుడు మైటిసైడ్లను వర్తించండి",
-            "మైట్ పునరుత్పత్తిని నిరుత్సాహపరచడానికి తేమను పెంచండి",
-            "భారీగా సోకిన ఆకులను తీసివేయండి"
-        ],
-        "pests": ["టెట్రానిచస్ urticae (మైట్)"],
-        "organic": "ఫైటోసియులస్ పెర్సిమిలిస్ ప్రెడేటరీ మైట్స్ను విడుదల చేయండి. నీం ఆయిల్ లేదా ఇన్సెక్టిసైడల్ సోప్తో స్ప్రే చేయండి.",
-        "chemical": "మైట్స్ గుర్తించబడినప్పుడు అబామెక్టిన్ లేదా స్పైరోమెసిఫెన్-ఆధారిత మైటిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Target_Spot": {
-        "disease_name": "టమాటా ___ టార్గెట్ స్పాట్",
-        "common_name": "టమాటా టార్గెట్ స్పాట్",
-        "symptoms": "లక్ష్యాన్ని పోలి ఉండే కేంద్రిక వలయాలు కలిగిన వృత్తాకార మచ్చలు, తరచుగా పసుపు రంగు హాలోలతో",
-        "prevention": [
-            "నివారణగా ఫంగిసైడ్లను వర్తించండి",
-            "పంట తర్వాత సోకిన మొక్కల శిధిలాలను తీసివేయండి",
-            "నాన్-హోస్ట్ పంటలతో పంట భ్రమణం అభ్యసించండి",
-            "సరైన దూరం ద్వారా గాలి ప్రసరణను మెరుగుపరచండి"
-        ],
-        "pests": ["కోరినెస్పోరా కాసిసికోలా (ఫంగస్)"],
-        "organic": "రాగి-ఆధారిత ఫంగిసైడ్లు లేదా బేకింగ్ సోడా స్ప్రేలను ఉపయోగించండి. మొక్కల దూరాన్ని మెరుగుపరచండి.",
-        "chemical": "నివారణగా క్లోరోథాలోనిల్ లేదా మ్యాంకోజెబ్-ఆధారిత ఫంగిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Tomato_Yellow_Leaf_Curl_Virus": {
-        "disease_name": "టమాటా ___ టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్",
-        "common_name": "టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్",
-        "symptoms": "ఆకుల పైకి వంకరలు, ఆకుల అంచుల పసుపు రంగు, నిలిచిన వృద్ధి",
-        "prevention": [
-            "అందుబాటులో ఉన్నప్పుడు నిరోధక రకాలను ఉపయోగించండి",
-            "ఇన్సెక్టిసైడ్లతో వైట్ఫ్లై జనాభాను నియంత్రించండి",
-            "వైరస్ మూలాన్ని తగ్గించడానికి సోకిన మొక్కలను తీసివేయండి",
-            "వైట్ఫ్లైలను నిరుత్సాహపరచడానికి రిఫ్లెక్టివ్ మల్చ్లను ఉపయోగించండి"
-        ],
-        "pests": ["బెమిసియా టాబాసి (వైట్ఫ్లై) - వెక్టర్", "టమాటా యెల్లో లీఫ్ కర్ల్ వైరస్"],
-        "organic": "వైట్ఫ్లైల కోసం పసుపు స్టికీ ట్రాప్లను ఉపయోగించండి. నీం ఆయిల్తో స్ప్రే చేయండి. సోకిన మొక్కలను తీసివేయండి.",
-        "chemical": "వైట్ఫ్లై నియంత్రణ కోసం ఇమిడాక్లోప్రిడ్ లేదా థియామెథోక్సామ్ సిస్టమిక్ ఇన్సెక్టిసైడ్లను వర్తించండి."
-    },
-    "Tomato___Tomato_mosaic_virus": {
-        "disease_name": "టమాటా ___ టమాటా మొజైక్ వైరస్",
-        "common_name": "టమాటా మొజైక్ వైరస్",
-        "symptoms": "ఆకులపై మచ్చల తేలికపాటి మరియు ముదురు ఆకుపచ్చ నమూనాలు, ఆకు వికృతీకరణ, తగ్గిన పండ్ల దిగుబడి",
-        "prevention": [
-            "వైరస్-ఉచిత ధృవీకరించిన విత్తనాలను ఉపయోగించండి",
-            "బ్లీచ్ సొల్యూషన్తో సాధనాలను క్రమం తప్పకుండా శుభ్రపరచండి",
-            "ఆఫిడ్ జనాభాను నియంత్రించండి",
-            "సోకిన మొక్కలను తీసివేసి నాశనం చేయండి"
-        ],
-        "pests": ["వివిధ ఆఫిడ్ ప్రజాతులు - వెక్టర్లు", "టమాటా మొజైక్ వైరస్"],
-        "organic": "పాల స్ప్రే (1 భాగం పాలు 9 భాగాలు నీరు) ఉపయోగించండి. నీం ఆయిల్తో ఆఫిడ్లను నియంత్రించండి.",
-        "chemical": "ప్రభావవంతమైన రసాయన చికిత్స లేదు. నివారణ మరియు వెక్టర్ నియంత్రణపై దృష్టి పెట్టండి."
-    },
-    "Tomato___healthy": {
-        "disease_name": "టమాటా ఆరోగ్యకరమైన",
-        "common_name": "ఆరోగ్యకరమైన టమాటా మొక్క",
-        "symptoms": "కనిపించే వ్యాధి లక్షణాలు లేవు",
-        "prevention": [
-            "సరైన మొక్క పోషణను నిర్వహించండి",
-            "పంట భ్రమణం అభ్యసించండి",
-            "వ్యాధి యొక్క ప్రారంభ సంకేతాల కోసం క్రమం తప్పకుండా పర్యవేక్షించండి",
-            "ధృవీకరించబడిన వ్యాధి-ఉచిత విత్తనాలను ఉపయోగించండి"
-        ],
-        "pests": ["ఏవీ లేవు"],
-        "organic": "ప్రస్తుత సేంద్రీయ పద్ధతులను కొనసాగించండి. చికిత్స అవసరం లేదు.",
-        "chemical": "ఆరోగ్యకరమైన మొక్కలకు రసాయన చికిత్స అవసరం లేదు."
-    }
-}
+# Load the trained model
+def load_model():
+    """
+    Loads the plant disease detection model with the backend selected by
+    Config.PEST_MODEL_BACKEND. The tflite and onnx backends run the exported
+    artifact without importing full TensorFlow. Load errors propagate to the
+    model registry, which records them and serves mock predictions instead.
+    """
+    backend = Config.PEST_MODEL_BACKEND.lower()
+    model = load_backend(backend, MODEL_PATHS.get(backend, ""), num_threads=Config.PEST_NUM_THREADS)
+    print(f"✅ Model loaded successfully! (backend: {model.name})")
+    return model
+
+# Temperature fitted offline by `python pest_train_model.py calibrate`
+TEMPERATURE = load_temperature(Config.PEST_CALIBRATION_PATH)
+
+def watched_paths():
+    return [MODEL_PATHS.get(Config.PEST_MODEL_BACKEND.lower(), "")]
+
+def model_version():
+    """
+    Version of the loaded artifact (and calibration, which changes confidences)
+    """
+    version = artifact_version(MODEL_PATHS.get(Config.PEST_MODEL_BACKEND.lower()))
+    if version and TEMPERATURE != 1.0:
+        version = f"{version}-t{TEMPERATURE:.4f}"
+    return version
+
+def warmup_model(model):
+    """
+    Dummy inference so the first real request doesn't pay for lazy initialisation
+    """
+    with model_lock:
+        model.predict(np.zeros((1, 160, 160, 3), dtype=np.float32))
+
+# The model is loaded on first use (or by the warmup hook in create_app) and
+# hot-reloaded when its file changes
+registry.register("pest", load_model, warmup=warmup_model, version=model_version, watch=watched_paths)
+
+def get_model():
+    return registry.get("pest")
+
+def current_model_version():
+    # None while running on mock predictions
+    return registry.version("pest")
+
+# Results for identical uploads are reused instead of re-running the model
+detection_cache = DetectionCache(
+    maxsize=Config.PEST_CACHE_SIZE,
+    retention_hours=Config.PEST_CACHE_RETENTION_HOURS
+)
+
+# Serializes model calls from the batching thread and the batch endpoint;
+# TFLite interpreters in particular are not thread-safe
+model_lock = threading.Lock()
+
+def run_model(batch, model=None):
+    """
+    Runs one forward pass over a stacked batch of preprocessed images, with
+    the given model or else the one currently serving.
+    """
+    with model_lock:
+        return (model or get_model()).predict(batch)
+
+# Concurrent requests are grouped into batches so that each model call
+# serves several uploads instead of paying the per-call overhead once per image
+batcher = MicroBatcher(
+    run_model,
+    max_batch_size=Config.PEST_BATCH_SIZE,
+    max_wait_ms=Config.PEST_BATCH_WAIT_MS,
+    name="pest-batcher"
+)
+
+def decode_upload(data):
+    """
+    Decodes the uploaded bytes straight from memory into an RGB image, only at
+    the resolution needed for the preview and the model input.
+    """
+    draft_size = max(Config.PEST_PREVIEW_SIZE, 160)
+    return decode_image(data, min_size=(draft_size, draft_size), max_pixels=Config.PEST_MAX_IMAGE_PIXELS)
+
+def preview_path(image_hash):
+    return os.path.join(Config.UPLOAD_FOLDER, "previews", f"{image_hash}.jpg")
+
+def save_preview(img, image_hash):
+    """
+    Stores a downscaled JPEG preview named after the content hash, so identical
+    uploads share one preview file.
+    """
+    path = preview_path(image_hash)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        preview = img.copy()
+        preview.thumbnail((Config.PEST_PREVIEW_SIZE, Config.PEST_PREVIEW_SIZE))
+        preview.save(path, "JPEG", quality=80)
+    return path
 
-def translate_to_telugu(text):
+def score_predictions(probs, k=None):
     """
-    Enhanced translation function with comprehensive Telugu translations
+    Turns a batch of raw model outputs into calibrated top-k results in one
+    vectorized pass. Predictions whose calibrated confidence falls below
+    Config.PEST_REVIEW_THRESHOLD are flagged for review.
     """
-    # Return Telugu translation if available, otherwise return original text
-    for disease_data in telugu_disease_translations.values():
-        for key, value in disease_data.items():
-            if isinstance(value, str) and value == text:
-                return value
-            elif isinstance(value, list) and text in value:
-                return text  # Return original as it's already in the list
+    probs = np.asarray(probs)
+    if probs.ndim == 1:
+        probs = probs[np.newaxis, :]
+    if probs.shape[1] != len(CLASS_NAMES):
+        raise ValueError(f"Model returned {probs.shape[1]} classes, expected {len(CLASS_NAMES)}")
     
-    # Common translations
-    common_translations = {
-        "None": "ఏవీ లేవు",
-        "Unknown Disease": "తెలియని వ్యాధి",
-        "Unknown symptoms": "తెలియని లక్షణాలు",
-        "Unknown pest": "తెలియని కీటకం",
-        "Use organic methods like neem oil, biocontrol agents, and cultural practices": "నీం ఆయిల్, జీవ నియంత్రణ ఏజెంట్లు మరియు సాంస్కృతిక పద్ధతుల వంటి సేంద్రీయ పద్ధతులను ఉపయోగించండి",
-        "Consult with agricultural expert for appropriate chemical treatments": "సరైన రసాయన చికిత్సల కోసం వ్యవసాయ నిపుణునితో సంప్రదించండి"
+    calibrated = apply_temperature(probs, TEMPERATURE)
+    indices, values = top_k(calibrated, k or Config.PEST_TOP_K)
+    
+    results = []
+    for row_indices, row_values in zip(indices.tolist(), values.tolist()):
+        results.append({
+            "label": CLASS_NAMES[row_indices[0]],
+            "confidence": row_values[0],
+            "top_k": [
+                {"label": CLASS_NAMES[i], "confidence": round(v, 4)}
+                for i, v in zip(row_indices, row_values)
+            ],
+            "needs_review": row_values[0] < Config.PEST_REVIEW_THRESHOLD
+        })
+    return results
+
+def mock_prediction():
+    """
+    Random result in the shape of score_predictions' entries, served while
+    the model is not loaded
+    """
+    print("⚠️ Using mock prediction as model is not loaded")
+    # For demo purposes, randomly select a disease
+    predicted_label = random.choice(CLASS_NAMES)
+    confidence = random.uniform(0.85, 0.98)
+    return {
+        "label": predicted_label,
+        "confidence": confidence,
+        "top_k": [{"label": predicted_label, "confidence": round(confidence, 4)}],
+        "needs_review": False
     }
+
+def predict_pest(img, model):
+    """
+    Returns (result, reliable) for a decoded RGB image, where result holds the
+    calibrated label, confidence, top-k alternatives and review flag.
+    reliable is False for mock predictions, which must not be cached. model
+    is the registry snapshot the caller took with its version, so a hot
+    reload in between can't mix the two up.
+    """
+    # If model is not loaded, use a random prediction for demo
+    if model is None:
+        return mock_prediction(), False
     
-    return common_translations.get(text, text)
+    # Resize to 160x160 to match training and normalize into a reused buffer
+    img_array = to_model_input(img)
 
-# Load the trained model
-def load_model():
+    # Run prediction through the batching engine
+    prediction = batcher.predict(img_array, timeout=Config.PEST_PREDICT_TIMEOUT, context=model)
+    result = score_predictions(prediction)[0]
+
+    print("Predicted label:", result["label"])
+    print("Confidence:", result["confidence"])
+
+    return result, True
+
+def save_upload(data, filename):
     """
-    Loads the trained plant disease detection model.
+    Writes the upload buffer to a uniquely named file and returns its path.
     """
-    try:
-        # Load your trained model
-        model = tf.keras.models.load_model("plant_disease_model_final.h5") 
-        print("✅ Model loaded successfully!")
-        return model
-    except Exception as e:
-        print("❌ Error loading model:", e)
-        return None
+    # Generate unique filename
+    unique_filename = f"{uuid.uuid4().hex}_{secure_filename(filename)}"
+    save_path = os.path.join(Config.UPLOAD_FOLDER, unique_filename)
+    
+    # Create upload directory if it doesn't exist
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    
+    with open(save_path, "wb") as out:
+        out.write(data)
+    return save_path
 
-# Initialize model
-model = load_model()
+def process_upload(farmer_id, data, filename, mimetype=None, include_image=False):
+    """
+    Runs the full detection pipeline for one uploaded image: content-hash cache
+    lookup, decode, inference, advisory and PestReport. Shared by the
+    synchronous endpoint and the async job workers.
+    """
+    image_hash = content_hash(data)
+    
+    # Identical image already analysed by this model version. The model and
+    # its version are read together, so results are stored under the
+    # version that produced them even across a hot reload
+    model, version = registry.snapshot("pest")
+    cached = detection_cache.get(image_hash, version)
+    save_path = cached["image_path"] if cached else None
+    
+    if not save_path or not os.path.exists(save_path):
+        save_path = save_upload(data, filename)
+    
+    if cached:
+        predicted_label = cached["predicted_label"]
+        confidence = cached["confidence"]
+        advisory = cached["advisory"]
+        predictions = cached["predictions"] or {}
+        if not os.path.exists(preview_path(image_hash)):
+            save_preview(decode_upload(data), image_hash)
+    else:
+        # Decode once from the upload buffer for both inference and preview
+        img = decode_upload(data)
+        save_preview(img, image_hash)
+        
+        # Get prediction
+        result, reliable = predict_pest(img, model)
+        predicted_label = result["label"]
+        confidence = result["confidence"]
+        predictions = {"top_k": result["top_k"], "needs_review": result["needs_review"]}
+        advisory = get_advisory(predicted_label)
+        if reliable:
+            detection_cache.set(image_hash, version, predicted_label,
+                                confidence, advisory, save_path, predictions)
+    
+    # Save to database
+    pest_report = PestReport(
+        farmer_id=farmer_id,
+        image_path=save_path,
+        predicted_label=predicted_label,
+        confidence=confidence,
+        advisory_json=advisory,
+        needs_review=predictions.get("needs_review", False),
+        model_version=version
+    )
+    db.session.add(pest_report)
+    db.session.commit()
+    
+    response = {
+        "prediction": predicted_label,
+        "confidence": confidence,
+        "advisory": advisory,
+        "top_predictions": predictions.get("top_k", []),
+        "needs_review": predictions.get("needs_review", False),
+        "report_id": pest_report.id,
+        "cached": cached is not None,
+        "image_url": url_for('pest.get_preview', image_hash=image_hash)
+    }
+    
+    # Legacy clients can still ask for the full image inlined as base64
+    if include_image:
+        encoded_image = base64.b64encode(data).decode('utf-8')
+        response["image_data"] = f"data:{mimetype or 'image/jpeg'};base64,{encoded_image}"
+    
+    return response
 
-def predict_pest(image_path):
+def run_detection_job(payload):
+    """
+    Job handler for async detection: the upload was spooled to disk by the
+    endpoint and is removed once processed.
+    """
+    with open(payload["upload_path"], "rb") as f:
+        data = f.read()
     try:
-        # If model is not loaded, use a random prediction for demo
-        if model is None:
-            print("⚠️ Using mock prediction as model is not loaded")
-            # For demo purposes, randomly select a disease
-            predicted_label = random.choice(CLASS_NAMES)
-            confidence = random.uniform(0.85, 0.98)
-            return predicted_label, confidence
-        
-        # Load and preprocess image - use 160x160 to match training
-        img = Image.open(image_path).convert("RGB").resize((160, 160))
-        img_array = np.array(img, dtype=np.float32) / 255.0  # normalize like training
-        img_array = np.expand_dims(img_array, axis=0)
-
-        # Run prediction
-        prediction = model.predict(img_array, verbose=0)
-        predicted_class = int(np.argmax(prediction, axis=1)[0])
-        confidence = float(np.max(prediction))
-
-        print("Prediction array shape:", prediction.shape)
-        print("Predicted index:", predicted_class)
-        
-        # Ensure the predicted class is within the valid range
-        if predicted_class < 0 or predicted_class >= len(CLASS_NAMES):
-            print(f"❌ Invalid predicted class index: {predicted_class}")
-            # Fallback to a random prediction
-            predicted_class = random.randint(0, len(CLASS_NAMES) - 1)
-            confidence = random.uniform(0.7, 0.9)
-        
-        predicted_label = CLASS_NAMES[predicted_class]
-        print("Predicted label:", predicted_label)
-        print("Confidence:", confidence)
+        return process_upload(
+            payload["farmer_id"], data, payload["filename"],
+            mimetype=payload.get("mimetype"),
+            include_image=payload.get("include_image", False)
+        )
+    finally:
+        try:
+            os.remove(payload["upload_path"])
+        except OSError:
+            pass
 
-        return predicted_label, confidence
+job_queue = JobQueue(
+    Config.PEST_JOB_DB,
+    run_detection_job,
+    num_workers=Config.PEST_JOB_WORKERS,
+    retention_hours=Config.PEST_JOB_RETENTION_HOURS,
+    callback_hosts=Config.PEST_CALLBACK_ALLOWED_HOSTS
+)
 
-    except Exception as e:
-        print(f"❌ Error in prediction: {e}")
-        # Fallback to a random prediction
-        predicted_label = random.choice(CLASS_NAMES)
-        confidence = random.uniform(0.7, 0.9)
-        return predicted_label, confidence
+def ensure_job_workers():
+    job_queue.start(current_app._get_current_object())
 
 @pest_bp.route('/detect', methods=['POST'])
 @jwt_required()
@@ -611,87 +354,264 @@ def detect_pest():
             return jsonify({"error": "No selected file"}), 400
         
         if file and allowed_file(file.filename):
-            # Generate unique filename
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            save_path = os.path.join(Config.UPLOAD_FOLDER, unique_filename)
-            
-            # Create upload directory if it doesn't exist
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            # Save file
-            file.save(save_path)
-            
-            # Get prediction
-            predicted_label, confidence = predict_pest(save_path)
-            
-            # Get advisory information
-            advisory_info = disease_info.get(predicted_label, {
-                "precautions": ["Consult local agricultural officer for specific advice"],
-                "pests": ["Unknown pest"],
-                "common_name": "Unknown Disease",
-                "symptoms": "Unknown symptoms",
-                "organic": "Use organic methods like neem oil, biocontrol agents, and cultural practices",
-                "chemical": "Consult with agricultural expert for appropriate chemical treatments"
-            })
+            data = file.read()
+            include_image = request.values.get('include_image', 'false').lower() == 'true'
             
-            # Get Telugu translations for this specific disease
-            telugu_translations = telugu_disease_translations.get(predicted_label, {})
+            # Async mode: spool the upload, enqueue a job and return immediately
+            if request.values.get('async', 'false').lower() == 'true':
+                callback_url = request.values.get('callback_url')
+                if callback_url:
+                    try:
+                        job_queue.validate_callback(callback_url)
+                    except CallbackRejected as e:
+                        return jsonify({"error": str(e)}), 400
+                
+                spool_dir = os.path.join(Config.UPLOAD_FOLDER, "jobs")
+                os.makedirs(spool_dir, exist_ok=True)
+                upload_path = os.path.join(spool_dir, uuid.uuid4().hex)
+                with open(upload_path, "wb") as out:
+                    out.write(data)
+                
+                ensure_job_workers()
+                job_id = job_queue.enqueue({
+                    "farmer_id": farmer_id,
+                    "upload_path": upload_path,
+                    "filename": file.filename,
+                    "mimetype": file.mimetype,
+                    "include_image": include_image
+                }, farmer_id=farmer_id, callback_url=callback_url)
+                
+                return jsonify({
+                    "job_id": job_id,
+                    "status": "queued",
+                    "status_url": url_for('pest.get_job', job_id=job_id)
+                }), 202
             
-            # If no specific translation found, create basic translations
-            if not telugu_translations:
-                telugu_translations = {
-                    "disease_name": translate_to_telugu(predicted_label),
-                    "common_name": translate_to_telugu(advisory_info["common_name"]),
-                    "symptoms": translate_to_telugu(advisory_info["symptoms"]),
-                    "prevention": [translate_to_telugu(precaution) for precaution in advisory_info["precautions"]],
-                    "pests": [translate_to_telugu(pest) for pest in advisory_info["pests"]],
-                    "organic": translate_to_telugu(advisory_info["organic"]),
-                    "chemical": translate_to_telugu(advisory_info["chemical"])
-                }
+            return jsonify(process_upload(
+                farmer_id, data, file.filename,
+                mimetype=file.mimetype, include_image=include_image
+            )), 200
+        
+        return jsonify({"error": "Invalid file type"}), 400
+        
+    except ImageTooLargeError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error in pest detection: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# Decoding releases the GIL, so uploads of one batch request decode in parallel
+decode_pool = ThreadPoolExecutor(max_workers=Config.PEST_DECODE_WORKERS, thread_name_prefix="pest-decode")
+
+def summarize_field(results):
+    """
+    Field-level aggregate over per-image results: dominant disease among the
+    diseased leaves and the share of healthy leaves.
+    """
+    labels = [r["prediction"] for r in results]
+    if not labels:
+        return {"images": 0, "healthy_share": None, "dominant_disease": None, "label_counts": {}}
+    
+    counts = Counter(labels)
+    healthy = sum(n for label, n in counts.items() if label.endswith("___healthy"))
+    diseased = Counter({label: n for label, n in counts.items() if not label.endswith("___healthy")})
+    dominant = diseased.most_common(1)[0] if diseased else None
+    
+    return {
+        "images": len(labels),
+        "healthy_share": round(healthy / len(labels), 4),
+        "dominant_disease": {
+            "label": dominant[0],
+            "common_name": get_advisory(dominant[0])["common_name"],
+            "count": dominant[1],
+            "share": round(dominant[1] / len(labels), 4)
+        } if dominant else None,
+        "label_counts": dict(counts)
+    }
+
+@pest_bp.route('/detect/batch', methods=['POST'])
+@jwt_required()
+def detect_pest_batch():
+    try:
+        farmer_id = get_jwt_identity()
+        files = [f for f in request.files.getlist('images') if f and f.filename]
+        
+        if not files:
+            return jsonify({"error": "No image files provided"}), 400
+        if len(files) > Config.PEST_BATCH_MAX_IMAGES:
+            return jsonify({"error": f"At most {Config.PEST_BATCH_MAX_IMAGES} images per request"}), 400
+        
+        results = [None] * len(files)
+        uploads = {}
+        for i, file in enumerate(files):
+            if not allowed_file(file.filename):
+                results[i] = {"index": i, "filename": file.filename, "error": "Invalid file type"}
+                continue
+            data = file.read()
+            uploads[i] = {"filename": file.filename, "data": data, "hash": content_hash(data)}
+        
+        # Cache hits skip decoding and inference entirely, and identical
+        # images within the batch are decoded and scored once
+        model, version = registry.snapshot("pest")
+        pending = []
+        first_by_hash = {}
+        for i, upload in uploads.items():
+            upload["cached"] = detection_cache.get(upload["hash"], version)
+            if upload["cached"]:
+                continue
+            if upload["hash"] in first_by_hash:
+                upload["same_as"] = first_by_hash[upload["hash"]]
             else:
-                # Ensure we have all required fields
-                if "organic" not in telugu_translations:
-                    telugu_translations["organic"] = translate_to_telugu(advisory_info["organic"])
-                if "chemical" not in telugu_translations:
-                    telugu_translations["chemical"] = translate_to_telugu(advisory_info["chemical"])
-            
-            # Prepare response
-            advisory = {
-                "organic": advisory_info["organic"],
-                "chemical": advisory_info["chemical"],
-                "prevention": advisory_info["precautions"],
-                "pests": advisory_info["pests"],
-                "common_name": advisory_info["common_name"],
-                "symptoms": advisory_info["symptoms"],
-                "telugu": telugu_translations
-            }
-            
-            # Convert image to base64 for frontend display
-            with open(save_path, "rb") as image_file:
-                encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
+                first_by_hash[upload["hash"]] = i
+                pending.append(i)
+        
+        # Decode in parallel straight into rows of one preallocated input tensor
+        batch = np.empty((len(pending), 160, 160, 3), dtype=np.float32)
+        
+        def prepare(row, i):
+            img = decode_upload(uploads[i]["data"])
+            save_preview(img, uploads[i]["hash"])
+            to_model_input(img, out=batch[row])
+        
+        futures = [decode_pool.submit(prepare, row, i) for row, i in enumerate(pending)]
+        decoded = []
+        for row, (i, future) in enumerate(zip(pending, futures)):
+            try:
+                future.result()
+                decoded.append(row)
+            except Exception as e:
+                results[i] = {"index": i, "filename": uploads[i]["filename"], "error": str(e)}
+                uploads.pop(i)
+        
+        # One forward pass for every image that needs inference
+        if decoded:
+            if model is None:
+                scored = [mock_prediction() for _ in decoded]
+            else:
+                scored = score_predictions(run_model(batch[decoded], model))
+            for row, result in zip(decoded, scored):
+                uploads[pending[row]]["result"] = result
+        
+        for i, upload in list(uploads.items()):
+            source = upload.get("same_as")
+            if source is None:
+                continue
+            if source in uploads:
+                upload["result"] = uploads[source]["result"]
+            else:
+                results[i] = {"index": i, "filename": upload["filename"], "error": results[source]["error"]}
+                uploads.pop(i)
+        
+        report_rows = []
+        cache_rows = {}
+        saved_paths = {}
+        for i, upload in uploads.items():
+            cached = upload["cached"]
+            save_path = cached["image_path"] if cached else saved_paths.get(upload["hash"])
+            if not save_path or not os.path.exists(save_path):
+                save_path = save_upload(upload["data"], upload["filename"])
+            saved_paths[upload["hash"]] = save_path
             
-            # Save to database
-            pest_report = PestReport(
-                farmer_id=farmer_id,
-                image_path=save_path,
-                predicted_label=predicted_label,
-                confidence=confidence,
-                advisory_json=advisory
-            )
-            db.session.add(pest_report)
-            db.session.commit()
+            if cached:
+                predicted_label = cached["predicted_label"]
+                confidence = cached["confidence"]
+                advisory = cached["advisory"]
+                predictions = cached["predictions"] or {}
+                if not os.path.exists(preview_path(upload["hash"])):
+                    save_preview(decode_upload(upload["data"]), upload["hash"])
+            else:
+                result = upload["result"]
+                predicted_label = result["label"]
+                confidence = result["confidence"]
+                advisory = get_advisory(predicted_label)
+                predictions = {"top_k": result["top_k"], "needs_review": result["needs_review"]}
+                if model is not None:
+                    cache_rows[upload["hash"]] = (upload["hash"], predicted_label, confidence, advisory, save_path, predictions)
             
-            return jsonify({
+            report_rows.append({
+                "farmer_id": farmer_id,
+                "image_path": save_path,
+                "predicted_label": predicted_label,
+                "confidence": confidence,
+                "advisory_json": advisory,
+                "needs_review": predictions.get("needs_review", False),
+                "model_version": version
+            })
+            results[i] = {
+                "index": i,
+                "filename": upload["filename"],
                 "prediction": predicted_label,
                 "confidence": confidence,
-                "advisory": advisory,
-                "report_id": pest_report.id,
-                "image_data": f"data:image/jpeg;base64,{encoded_image}"
-            }), 200
+                "common_name": advisory["common_name"],
+                "top_predictions": predictions.get("top_k", []),
+                "needs_review": predictions.get("needs_review", False),
+                "cached": cached is not None,
+                "image_url": url_for('pest.get_preview', image_hash=upload["hash"])
+            }
         
-        return jsonify({"error": "Invalid file type"}), 400
+        # Save all reports with one bulk insert
+        if report_rows:
+            db.session.execute(PestReport.__table__.insert(), report_rows)
+        detection_cache.set_many(version, list(cache_rows.values()))
+        db.session.commit()
+        
+        successful = [r for r in results if "error" not in r]
+        return jsonify({
+            "results": results,
+            "summary": summarize_field(successful),
+            "advisories": {r["prediction"]: get_advisory(r["prediction"]) for r in successful},
+            "failed": len(results) - len(successful)
+        }), 200
         
     except Exception as e:
-        print(f"Error in pest detection: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        db.session.rollback()
+        print(f"Error in batch pest detection: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@pest_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    try:
+        ensure_job_workers()
+        
+        # ?wait=N long-polls for up to N seconds until the job finishes
+        wait = min(request.args.get('wait', 0, type=float), Config.PEST_JOB_MAX_WAIT)
+        job = job_queue.wait(job_id, wait) if wait > 0 else job_queue.get(job_id)
+        
+        if not job or job["farmer_id"] != str(get_jwt_identity()):
+            return jsonify({"error": "Job not found"}), 404
+        
+        job.pop("farmer_id")
+        return jsonify(job), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@pest_bp.route('/preview/<image_hash>', methods=['GET'])
+def get_preview(image_hash):
+    # Previews are named by hex content hash; reject anything else
+    if len(image_hash) != 64 or any(c not in "0123456789abcdef" for c in image_hash):
+        return jsonify({"error": "Invalid preview id"}), 400
+    
+    path = preview_path(image_hash)
+    if not os.path.exists(path):
+        return jsonify({"error": "Preview not found"}), 404
+    
+    response = send_from_directory(os.path.abspath(os.path.dirname(path)), os.path.basename(path))
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response
+
+@pest_bp.route('/batch-stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_batch_stats():
+    return jsonify(batcher.stats()), 200
+
+@pest_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    stats = detection_cache.stats()
+    stats["model_version"] = current_model_version() if registry.is_loaded("pest") else None
+    return jsonify(stats), 200
\ No newline at end of file
@@ -1,24 +1,107 @@
 # recommend.py
 from flask import Blueprint, request, jsonify
-from models import db, Recommendation
+from models import db, Recommendation, Farmer, SoilTest
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import os
 import joblib
 import numpy as np
 from config import Config
+from model_registry import registry
+from caching import LRUCache
+from pest_cache import artifact_version
+from compact_forest import CompactForest
+from crop_suitability import SuitabilityIndex, SEASON_PROFILES
+from weather_cache import weather_cache
 
 rec_bp = Blueprint('recommend', __name__)
 
+def crop_model_paths():
+    """
+    Artifacts the configured CROP_MODEL_BACKEND serves from: the sklearn
+    pipeline, the compact forest exported by train_crop_model.py, or (auto)
+    both when the compact file exists, small batches going to the compact one.
+    """
+    backend = Config.CROP_MODEL_BACKEND.lower()
+    paths = []
+    if backend != "compact":
+        paths.append(Config.ML_MODEL_PATH)
+    if backend == "compact" or (backend == "auto" and os.path.exists(Config.CROP_COMPACT_MODEL_PATH)):
+        paths.append(Config.CROP_COMPACT_MODEL_PATH)
+    return paths
+
 # Load the trained model and label encoder
-try:
-    saved_data = joblib.load(Config.ML_MODEL_PATH)
-    pipeline = saved_data["pipeline"]
-    le = saved_data["label_encoder"]
-    features = saved_data["features"]
-    print("Model loaded successfully with features:", features)
-except Exception as e:
-    print(f"Error loading model: {str(e)}")
-    pipeline = None
-    le = None
+def load_crop_model():
+    paths = crop_model_paths()
+    saved_data = {"pipeline": None, "compact": None}
+    
+    if Config.ML_MODEL_PATH in paths:
+        saved_data.update(joblib.load(Config.ML_MODEL_PATH))
+        pipeline = saved_data["pipeline"]
+        saved_data["crop_names"] = np.asarray(saved_data["label_encoder"].inverse_transform(pipeline.classes_))
+    
+    if Config.CROP_COMPACT_MODEL_PATH in paths:
+        compact = CompactForest.load(Config.CROP_COMPACT_MODEL_PATH)
+        if "crop_names" in saved_data and list(saved_data["crop_names"]) != list(compact.classes_):
+            raise ValueError("Compact crop model does not match ML_MODEL_PATH, re-export it")
+        saved_data["compact"] = compact
+        saved_data.setdefault("crop_names", compact.classes_)
+        saved_data.setdefault("features", compact.features)
+    
+    print("Model loaded successfully with features:", saved_data["features"])
+    return saved_data
+
+def warmup_crop_model(saved_data):
+    sample = np.zeros((1, len(saved_data["features"])))
+    for model in (saved_data["pipeline"], saved_data["compact"]):
+        if model is not None:
+            model.predict_proba(sample)
+
+def crop_model_version():
+    versions = [artifact_version(path) for path in crop_model_paths()]
+    return "-".join(version or "missing" for version in versions)
+
+# The model is loaded on first use (or by the warmup hook in create_app) and
+# hot-reloaded when its files change
+registry.register(
+    "crop", load_crop_model, warmup=warmup_crop_model, version=crop_model_version,
+    watch=crop_model_paths, on_swap=lambda: recommendation_cache.clear()
+)
+
+# Model input order
+FEATURE_FIELDS = ['n', 'p', 'k', 'temperature', 'humidity', 'ph', 'rainfall']
+REQUIRED_FIELDS = ['n', 'p', 'k', 'ph', 'temperature', 'humidity', 'rainfall']
+
+# Fields filled in server-side when the client leaves them out
+SOIL_TEST_FIELDS = ['n', 'p', 'k', 'ph']
+WEATHER_FIELDS = ['temperature', 'humidity', 'rainfall']
+
+# Precision inputs are rounded to before prediction, in FEATURE_FIELDS order.
+# Soil health cards report N/P/K in whole kg/ha and pH to one decimal; finer
+# weather differences do not change the recommendation. Rounding makes
+# near-identical submissions share a cache entry.
+QUANTIZATION_STEPS = np.array([1.0, 1.0, 1.0, 0.5, 1.0, 0.1, 5.0])
+
+# Probability rows keyed on (model version, quantized inputs)
+recommendation_cache = LRUCache(Config.RECOMMEND_CACHE_SIZE, ttl=Config.RECOMMEND_CACHE_TTL)
+
+# District tables built offline by crop_suitability.py
+suitability_index = SuitabilityIndex(ttl=Config.SUITABILITY_CACHE_TTL)
+
+# Simple profit estimation (placeholder)
+crop_prices = {
+    "rice": 1800, "wheat": 1600, "maize": 1400, 
+    "cotton": 5000, "sugarcane": 2800
+}
+DEFAULT_CROP_PRICE = 1500
+
+DEFAULT_CROP_DETAILS = {
+    "description": "A suitable crop for your conditions.",
+    "season": "Varies",
+    "water_requirements": "Moderate",
+    "soil_type": "Various",
+    "image": "🌱",
+    "growth_period": "90-120 days"
+}
 
 # Additional crop information for enhanced recommendations
 crop_info = {
@@ -49,81 +132,250 @@ crop_info = {
     # Add more crops as needed
 }
 
+def predict_crop_proba(features_array, saved_data=None):
+    """
+    Runs the forest once and returns (crop names per class column, probability
+    matrix), or None when the model is unavailable.
+    """
+    if saved_data is None:
+        saved_data = registry.get("crop")
+    if not saved_data:
+        return None
+    compact = saved_data["compact"]
+    pipeline = saved_data["pipeline"]
+    # The compact forest skips sklearn's per-call overhead, which dominates
+    # small batches; large ones are faster in sklearn's compiled traversal
+    if compact is not None and (pipeline is None or len(features_array) <= Config.CROP_COMPACT_MAX_ROWS):
+        probabilities = compact.predict_proba(features_array)
+    else:
+        probabilities = pipeline.predict_proba(features_array)
+    return saved_data["crop_names"], probabilities
+
+def quantize_features(features_array):
+    quantized = np.round(np.asarray(features_array, dtype=float) / QUANTIZATION_STEPS) * QUANTIZATION_STEPS
+    # Keep keys stable (0.30000000000000004 -> 0.3)
+    return np.round(quantized, 6)
+
+def cached_crop_proba(features_array, store=True):
+    """
+    predict_crop_proba with memoization: rows are quantized and looked up in
+    the recommendation cache under the current model version, and only the
+    misses go through the forest (in one pass). With store=False the misses
+    are not added to the cache. Returns (crop names, probabilities, model
+    version), or None when the model is unavailable.
+    """
+    X = quantize_features(features_array)
+    saved_data, version = registry.snapshot("crop")
+    if not saved_data:
+        return None
+    
+    keys = [(version, row) for row in map(tuple, X.tolist())]
+    entries = [recommendation_cache.get(key) for key in keys]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    if missing:
+        crop_names, probabilities = predict_crop_proba(X[missing], saved_data)
+        for i, row in zip(missing, probabilities):
+            entries[i] = (crop_names, row)
+            if store:
+                recommendation_cache.set(keys[i], entries[i])
+    
+    return entries[0][0], np.vstack([row for _, row in entries]), version
+
+def lookup_suitability(farmer_id, data):
+    """
+    Suitability cell for a coarse query: the request's (or else the farmer's)
+    district and soil type, the season, and the nearest N/P/K grid point.
+    """
+    farmer = Farmer.query.get(farmer_id)
+    district = data.get('district') or (farmer.district if farmer else None)
+    soil_type = data.get('soil_type') or (farmer.soil_type if farmer else None)
+    if not district:
+        return None
+    return suitability_index.lookup(
+        district, data.get('season', 'kharif'), soil_type, data['n'], data['p'], data['k']
+    )
+
+def fill_missing_inputs(farmer_id, data):
+    """
+    Completes a recommendation request server-side, so the client needs no
+    separate weather call: missing N/P/K/pH come from the farmer's latest
+    SoilTest, temperature and humidity from the shared weather cache (by the
+    request's district, else the farmer's coordinates or district), and
+    anything still missing from the district's seasonal profile. Returns the
+    completed inputs, whose filled_inputs maps each filled field to its source.
+    """
+    missing = [field for field in REQUIRED_FIELDS if data.get(field) is None]
+    if not missing:
+        return data
+    
+    data = dict(data)
+    filled = {}
+    
+    def fill(field, value, source):
+        if field in missing and value is not None and field not in filled:
+            data[field] = float(value)
+            filled[field] = source
+    
+    if any(field in missing for field in SOIL_TEST_FIELDS):
+        soil_test = SoilTest.query.filter_by(farmer_id=farmer_id).order_by(
+            SoilTest.test_date.desc(), SoilTest.id.desc()
+        ).first()
+        if soil_test:
+            for field in SOIL_TEST_FIELDS:
+                fill(field, getattr(soil_test, field), "soil_test")
+    
+    if any(field in missing for field in WEATHER_FIELDS):
+        farmer = Farmer.query.get(farmer_id)
+        district = data.get('district') or (farmer.district if farmer else None)
+        use_coords = not data.get('district') and farmer is not None and farmer.lat is not None and farmer.lng is not None
+        
+        if district or use_coords:
+            try:
+                weather = weather_cache.get_current(
+                    district=district,
+                    lat=farmer.lat if use_coords else None,
+                    lng=farmer.lng if use_coords else None
+                )
+                fill('temperature', weather["main"]["temp"], "weather")
+                fill('humidity', weather["main"]["humidity"], "weather")
+            except Exception as e:
+                print(f"Error fetching weather for recommendation: {e}")
+        
+        # Current weather says nothing about seasonal rainfall, so it (and any
+        # weather the upstream could not provide) comes from the profiles
+        season = str(data.get('season', 'kharif')).lower()
+        profile = suitability_index.district_weather(district, season) if district else None
+        source = "district_profile" if profile else "season_profile"
+        profile = profile or SEASON_PROFILES.get(season, SEASON_PROFILES["kharif"])
+        for field in WEATHER_FIELDS:
+            fill(field, profile[field], source)
+    
+    if filled:
+        data['filled_inputs'] = filled
+    return data
+
+def estimate_yield(n, p, k, rainfall):
+    """
+    Simple yield estimation based on parameters (placeholder logic), in
+    tons/acre. Works on scalars and NumPy columns alike.
+    """
+    base_yield = 2.5  # tons/acre
+    # Adjust based on soil nutrients
+    nutrient_factor = np.minimum(1.0, (n / 100 + p / 50 + k / 150) / 3)
+    # Adjust based on rainfall
+    rainfall_factor = 0.8 + (np.minimum(300, rainfall) / 1000)
+    return np.round(base_yield * nutrient_factor * rainfall_factor, 2)
+
+def estimate_sustainability(ph, humidity, rainfall):
+    """
+    Sustainability score (placeholder logic) in percent, vectorized like
+    estimate_yield.
+    """
+    score = (
+        30 +  # Base
+        (np.minimum(7.5, ph) / 7.5 * 20) +  # pH factor
+        (np.minimum(80, humidity) / 80 * 20) +  # Humidity factor
+        (np.minimum(200, rainfall) / 200 * 30)  # Rainfall factor
+    )
+    return np.minimum(100, np.floor(score)).astype(int)
+
+def crop_lookup_column(crops, table, default):
+    """
+    Per-row values from a crop table (e.g. prices), looked up once per
+    distinct crop.
+    """
+    unique_crops, inverse = np.unique(np.char.lower(np.asarray(crops, dtype=str)), return_inverse=True)
+    values = np.array([table.get(crop, default) for crop in unique_crops], dtype=float)
+    return values[inverse]
+
+def rank_crops(probabilities, top_n):
+    """
+    Column indices of the top_n most probable crops, best first.
+    """
+    top_n = max(1, min(int(top_n), probabilities.shape[-1]))
+    candidates = np.argpartition(-probabilities, top_n - 1)[:top_n]
+    return candidates[np.argsort(-probabilities[candidates])]
+
 @rec_bp.route('/crop', methods=['POST'])
 @jwt_required()
 def recommend_crop():
     try:
         farmer_id = get_jwt_identity()
         data = request.get_json()
+        top_n = int(data.get('top_n', Config.RECOMMEND_TOP_N))
+        coarse = str(data.get('coarse', 'false')).lower() == 'true'
         
-        # Validate required fields
-        required_fields = ['n', 'p', 'k', 'ph', 'temperature', 'humidity', 'rainfall']
-        for field in required_fields:
+        # Missing soil and weather inputs are filled in server-side
+        if not coarse:
+            data = fill_missing_inputs(farmer_id, data)
+        
+        # Validate required fields (coarse queries only need the nutrients)
+        for field in (['n', 'p', 'k'] if coarse else REQUIRED_FIELDS):
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         
-        # Prepare features for model prediction in correct order
-        feature_values = [
-            data['n'], data['p'], data['k'], data['temperature'], 
-            data['humidity'], data['ph'], data['rainfall']
-        ]
-        
-        features_array = np.array([feature_values])
-        
-        # Get prediction
-        if pipeline and le:
-            prediction_idx = pipeline.predict(features_array)[0]
-            predicted_crop = le.inverse_transform([prediction_idx])[0]
+        if coarse:
+            # Answered from the precomputed district table, weather and pH
+            # coming from the table cell
+            cell = lookup_suitability(farmer_id, data)
+            if cell is None:
+                return jsonify({"error": "No suitability table for this district, season and soil type"}), 404
             
-            # Get probabilities if available
-            if hasattr(pipeline, 'predict_proba'):
-                probabilities = pipeline.predict_proba(features_array)[0]
-                confidence = float(probabilities[prediction_idx])
-            else:
-                confidence = 0.8
+            inputs = {field: float(data[field]) for field in ('n', 'p', 'k')}
+            inputs.update({field: cell[field] for field in ('temperature', 'humidity', 'ph', 'rainfall')})
+            ranking = cell["ranking"][:max(1, top_n)]
+            ranked_crops = np.array([crop for crop, _ in ranking])
+            ranked_confidence = np.array([prob for _, prob in ranking])
+            model_version = cell["model_version"]
         else:
-            # Fallback logic if model not available
-            predicted_crop = "wheat"
-            confidence = 0.7
+            # Prepare features for model prediction in correct order
+            inputs = {field: float(data[field]) for field in FEATURE_FIELDS}
+            features_array = np.array([[inputs[field] for field in FEATURE_FIELDS]], dtype=float)
+            
+            # Get prediction: one probability pass ranks every crop
+            predicted = cached_crop_proba(features_array)
+            if predicted:
+                crop_names, probabilities, model_version = predicted
+                ranked = rank_crops(probabilities[0], top_n)
+                ranked_crops = crop_names[ranked]
+                ranked_confidence = probabilities[0][ranked]
+            else:
+                # Fallback logic if model not available
+                ranked_crops = np.array(["wheat"])
+                ranked_confidence = np.array([0.7])
+                model_version = None
         
         # Calculate additional information
         land_size = float(data.get('land_size', 1))
         season = data.get('season', 'kharif')
         
-        # Simple yield estimation based on parameters (placeholder logic)
-        base_yield = 2.5  # tons/acre
-        # Adjust based on soil nutrients
-        nutrient_factor = min(1.0, (float(data['n']) / 100 + float(data['p']) / 50 + float(data['k']) / 150) / 3)
-        # Adjust based on rainfall
-        rainfall_factor = 0.8 + (min(300, float(data['rainfall'])) / 1000)
+        # Yield depends on the inputs only; profit on each ranked crop's price
+        n, p, k = inputs['n'], inputs['p'], inputs['k']
+        rainfall = inputs['rainfall']
+        ranked_yield = np.full(len(ranked_crops), estimate_yield(n, p, k, rainfall))
+        ranked_profit = np.round(
+            ranked_yield * crop_lookup_column(ranked_crops, crop_prices, DEFAULT_CROP_PRICE) * land_size, 2
+        )
+        
+        top_crops = [{
+            "crop": str(crop),
+            "probability": float(confidence),
+            "estimated_yield": f"{crop_yield} tons/acre",
+            "estimated_profit": f"₹{profit}",
+            "crop_details": crop_info.get(str(crop).lower(), DEFAULT_CROP_DETAILS)
+        } for crop, confidence, crop_yield, profit in zip(ranked_crops, ranked_confidence, ranked_yield, ranked_profit)]
         
-        estimated_yield = round(base_yield * nutrient_factor * rainfall_factor, 2)
+        predicted_crop = top_crops[0]["crop"]
+        confidence = top_crops[0]["probability"]
+        estimated_yield = float(ranked_yield[0])
+        estimated_profit = float(ranked_profit[0])
         
-        # Simple profit estimation (placeholder)
-        crop_prices = {
-            "rice": 1800, "wheat": 1600, "maize": 1400, 
-            "cotton": 5000, "sugarcane": 2800
-        }
-        price_per_ton = crop_prices.get(predicted_crop.lower(), 1500)
-        estimated_profit = round(estimated_yield * price_per_ton * land_size, 2)
-        
-        # Sustainability score (placeholder logic)
-        sustainability_score = min(100, int(
-            30 +  # Base
-            (min(7.5, float(data['ph'])) / 7.5 * 20) +  # pH factor
-            (min(80, float(data['humidity'])) / 80 * 20) +  # Humidity factor
-            (min(200, float(data['rainfall'])) / 200 * 30)  # Rainfall factor
+        sustainability_score = int(estimate_sustainability(
+            inputs['ph'], inputs['humidity'], rainfall
         ))
         
         # Get additional crop information
-        crop_details = crop_info.get(predicted_crop.lower(), {
-            "description": "A suitable crop for your conditions.",
-            "season": "Varies",
-            "water_requirements": "Moderate",
-            "soil_type": "Various",
-            "image": "🌱",
-            "growth_period": "90-120 days"
-        })
+        crop_details = top_crops[0]["crop_details"]
         
         # Prepare result
         result = {
@@ -133,6 +385,8 @@ def recommend_crop():
             "estimated_profit": f"₹{estimated_profit}",
             "sustainability_score": f"{sustainability_score}%",
             "crop_details": crop_details,
+            "top_crops": top_crops,
+            "source": "district_table" if coarse else "model",
             "input_parameters": data
         }
         
@@ -140,7 +394,8 @@ def recommend_crop():
         recommendation = Recommendation(
             farmer_id=farmer_id,
             input_json=data,
-            recommended_json=result
+            recommended_json=result,
+            model_version=model_version
         )
         db.session.add(recommendation)
         db.session.commit()
@@ -151,6 +406,144 @@ def recommend_crop():
         return jsonify({"error": str(e)}), 500
 
 
+@rec_bp.route('/crop/batch', methods=['POST'])
+@jwt_required()
+def recommend_crop_batch():
+    """
+    Recommendations for many plots in one request. Body: {"rows": [{...}, ...]}
+    where each row has the same fields as /crop.
+    """
+    try:
+        farmer_id = get_jwt_identity()
+        payload = request.get_json() or {}
+        rows = payload.get('rows') if isinstance(payload, dict) else payload
+        
+        if not isinstance(rows, list) or not rows:
+            return jsonify({"error": "rows must be a non-empty list"}), 400
+        if len(rows) > Config.RECOMMEND_BATCH_MAX_ROWS:
+            return jsonify({"error": f"At most {Config.RECOMMEND_BATCH_MAX_ROWS} rows per request"}), 400
+        
+        # Validate rows; invalid ones are reported individually
+        errors = []
+        valid_rows = []
+        matrix = []
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append({"row": i, "error": "Row must be an object"})
+                continue
+            missing = [field for field in REQUIRED_FIELDS if field not in row]
+            if missing:
+                errors.append({"row": i, "error": f"Missing required field: {missing[0]}"})
+                continue
+            try:
+                matrix.append([float(row[field]) for field in FEATURE_FIELDS])
+                valid_rows.append(i)
+            except (TypeError, ValueError):
+                errors.append({"row": i, "error": "Feature values must be numeric"})
+        
+        if not valid_rows:
+            return jsonify({"results": [], "errors": errors}), 400
+        
+        X = np.array(matrix, dtype=float)
+        n, p, k, temperature, humidity, ph, rainfall = X.T
+        
+        # One predict_proba pass over the uncached rows; predictions are its argmax
+        # Rows of large batches are rarely requested again, so they are only
+        # looked up, keeping them from evicting the single-request entries
+        predicted = cached_crop_proba(X, store=len(X) <= Config.RECOMMEND_CACHE_BATCH_ROWS)
+        if predicted:
+            crop_names, probabilities, model_version = predicted
+            best = probabilities.argmax(axis=1)
+            crops = crop_names[best]
+            confidence = probabilities[np.arange(len(best)), best]
+        else:
+            # Fallback logic if model not available
+            crops = np.full(len(valid_rows), "wheat", dtype=object)
+            confidence = np.full(len(valid_rows), 0.7)
+            model_version = None
+        
+        land_size = np.array([float(rows[i].get('land_size', 1)) for i in valid_rows])
+        estimated_yield = estimate_yield(n, p, k, rainfall)
+        estimated_profit = np.round(
+            estimated_yield * crop_lookup_column(crops, crop_prices, DEFAULT_CROP_PRICE) * land_size, 2
+        )
+        sustainability = estimate_sustainability(ph, humidity, rainfall)
+        
+        results = []
+        records = []
+        for j, i in enumerate(valid_rows):
+            crop = str(crops[j])
+            result = {
+                "row": i,
+                "recommended_crop": crop,
+                "confidence": float(confidence[j]),
+                "estimated_yield": f"{estimated_yield[j]} tons/acre",
+                "estimated_profit": f"₹{estimated_profit[j]}",
+                "sustainability_score": f"{sustainability[j]}%",
+                "crop_details": crop_info.get(crop.lower(), DEFAULT_CROP_DETAILS),
+                "input_parameters": rows[i]
+            }
+            results.append(result)
+            records.append({
+                "farmer_id": farmer_id,
+                "input_json": rows[i],
+                "recommended_json": result,
+                "model_version": model_version
+            })
+        
+        # Save all recommendations with one bulk insert
+        db.session.execute(Recommendation.__table__.insert(), records)
+        db.session.commit()
+        
+        return jsonify({"results": results, "errors": errors}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@rec_bp.route('/district', methods=['GET'])
+@jwt_required()
+def recommend_district():
+    """
+    Whole-district crop ranking from the precomputed suitability tables.
+    Query: district (default: the farmer's), season, soil_type (optional),
+    top_n (optional).
+    """
+    try:
+        farmer = Farmer.query.get(get_jwt_identity())
+        district = request.args.get('district') or (farmer.district if farmer else None)
+        if not district:
+            return jsonify({"error": "district is required"}), 400
+        season = request.args.get('season', 'kharif')
+        soil_type = request.args.get('soil_type')
+        top_n = request.args.get('top_n', type=int)
+        
+        ranking = suitability_index.district_ranking(district, season, soil_type)
+        if not ranking:
+            return jsonify({"error": "No suitability table for this district and season"}), 404
+        
+        return jsonify({
+            "district": district,
+            "season": season,
+            "soil_type": soil_type,
+            "ranking": [
+                dict(item, crop_details=crop_info.get(item["crop"].lower(), DEFAULT_CROP_DETAILS))
+                for item in (ranking[:top_n] if top_n else ranking)
+            ]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@rec_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    stats = recommendation_cache.stats()
+    stats["model_version"] = registry.version("crop") if registry.is_loaded("crop") else None
+    return jsonify(stats), 200
+
+
 @rec_bp.route('/history', methods=['GET'])
 @jwt_required()
 def get_recommendation_history():
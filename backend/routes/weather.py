@@ -1,11 +1,76 @@
-from flask import Blueprint, request, jsonify
-import requests
-import os
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
 from datetime import datetime, timedelta
+from sqlalchemy import func
+from models import db, Farmer
+from config import Config
+from weather_cache import weather_cache, WeatherUnavailable, WeatherPrefetcher, normalize_district
+from http_client import http_client
+from routes.admin import admin_required
 
 weather_bp = Blueprint("weather", __name__)
 
-OPENWEATHER_KEY = os.getenv("OPENWEATHER_KEY", "a63621689253688a2cdd47570e15c520")
+def top_districts(limit=None):
+    """
+    Districts of registered farmers, busiest first, one entry per
+    normalized name.
+    """
+    counts = {}
+    names = {}
+    rows = db.session.query(Farmer.district, func.count(Farmer.id)).filter(
+        Farmer.district.isnot(None)
+    ).group_by(Farmer.district).all()
+    for district, count in rows:
+        key = normalize_district(district)
+        if key:
+            counts[key] = counts.get(key, 0) + count
+            names.setdefault(key, district.strip())
+    ranked = sorted(counts, key=lambda key: -counts[key])
+    if limit:
+        ranked = ranked[:limit]
+    return [names[key] for key in ranked]
+
+def top_prefetch_districts():
+    return top_districts(Config.WEATHER_PREFETCH_TOP_N)
+
+# Warms the cache for the busiest districts before the morning peak
+prefetcher = WeatherPrefetcher(
+    weather_cache,
+    top_prefetch_districts,
+    hours=Config.WEATHER_PREFETCH_HOURS,
+    interval=Config.WEATHER_PREFETCH_INTERVAL,
+    concurrency=Config.WEATHER_BULK_CONCURRENCY
+)
+
+def start_prefetcher(app):
+    if Config.WEATHER_PREFETCH and Config.WEATHER_PREFETCH_TOP_N > 0:
+        prefetcher.start(app)
+
+@weather_bp.before_app_request
+def start_prefetcher_in_worker():
+    # Started on the first request a process serves, so CLI scripts and the
+    # gunicorn master (which only build the app) never poll OpenWeather
+    start_prefetcher(current_app._get_current_object())
+
+def build_weather_response(city, current_data, forecast_data):
+    """
+    Frontend-friendly weather summary for one district.
+    """
+    # Process forecast data to get daily forecasts
+    daily_forecast = process_forecast_data(forecast_data)
+
+    # Generate irrigation advice based on weather conditions
+    irrigation_advice = generate_irrigation_advice(current_data, daily_forecast)
+
+    return {
+        "district": city,
+        "temperature": current_data["main"]["temp"],
+        "humidity": current_data["main"]["humidity"],
+        "conditions": current_data["weather"][0]["description"].title(),
+        "wind": current_data["wind"]["speed"],
+        "forecast": daily_forecast,
+        "irrigation_advice": irrigation_advice
+    }
 
 @weather_bp.route("/", methods=["GET"])
 def get_weather():
@@ -14,42 +79,81 @@ def get_weather():
         return jsonify({"error": "District is required"}), 400
 
     try:
-        # Get current weather
-        current_url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHER_KEY}&units=metric"
-        current_res = requests.get(current_url)
-        current_data = current_res.json()
-
-        if current_data.get("cod") != 200:
-            return jsonify({"error": "Failed to fetch weather data", "details": current_data}), 400
-
-        # Get 5-day forecast
-        forecast_url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={OPENWEATHER_KEY}&units=metric"
-        forecast_res = requests.get(forecast_url)
-        forecast_data = forecast_res.json()
+        # Current weather and 5-day forecast from the shared cache, fetched
+        # concurrently on a miss
+        try:
+            current_data, forecast_data = http_client.gather(
+                lambda: weather_cache.get_current(district=city),
+                lambda: weather_cache.get_forecast(district=city)
+            )
+        except WeatherUnavailable as e:
+            return jsonify({"error": str(e), "details": e.details}), 400
 
-        if forecast_data.get("cod") != "200":
-            return jsonify({"error": "Failed to fetch forecast data", "details": forecast_data}), 400
-
-        # Process forecast data to get daily forecasts
-        daily_forecast = process_forecast_data(forecast_data)
+        # Shape data in frontend-friendly format
+        return jsonify(build_weather_response(city, current_data, forecast_data))
 
-        # Generate irrigation advice based on weather conditions
-        irrigation_advice = generate_irrigation_advice(current_data, daily_forecast)
+    except Exception as e:
+        return jsonify({"error": "Internal server error", "details": str(e)}), 500
 
-        # Shape data in frontend-friendly format
+@weather_bp.route("/bulk", methods=["GET", "POST"])
+@jwt_required()
+@admin_required
+def get_bulk_weather():
+    """
+    Weather for many districts in one call (admin only, since it lists where
+    farmers are and spends the shared API key). Districts come from a JSON
+    body {"districts": [...]}, a comma-separated ?districts= parameter, or,
+    when neither is given, every district with registered farmers (busiest
+    first).
+    """
+    try:
+        body = request.get_json(silent=True)
+        districts = body.get("districts") if isinstance(body, dict) else body
+        if districts is None and request.args.get("districts"):
+            districts = request.args.get("districts").split(",")
+        if districts is None:
+            districts = top_districts()
+        if not isinstance(districts, list):
+            return jsonify({"error": "districts must be a list"}), 400
+        
+        # One entry per normalized name, in request order
+        unique = {}
+        for district in districts:
+            if isinstance(district, str) and normalize_district(district):
+                unique.setdefault(normalize_district(district), district.strip())
+        districts = list(unique.values())
+        if len(districts) > Config.WEATHER_BULK_MAX_DISTRICTS:
+            return jsonify({"error": f"At most {Config.WEATHER_BULK_MAX_DISTRICTS} districts per request"}), 400
+        
+        fetched = weather_cache.get_many(districts, concurrency=Config.WEATHER_BULK_CONCURRENCY)
+        
+        results = {}
+        errors = {}
+        for district, outcome in fetched.items():
+            if isinstance(outcome, Exception):
+                errors[district] = {
+                    "error": str(outcome),
+                    "details": getattr(outcome, "details", None)
+                }
+            else:
+                results[district] = build_weather_response(district, *outcome)
+        
         return jsonify({
-            "district": city,
-            "temperature": current_data["main"]["temp"],
-            "humidity": current_data["main"]["humidity"],
-            "conditions": current_data["weather"][0]["description"].title(),
-            "wind": current_data["wind"]["speed"],
-            "forecast": daily_forecast,
-            "irrigation_advice": irrigation_advice
-        })
-
+            "districts": results,
+            "errors": errors,
+            "count": len(results),
+            "failed": len(errors)
+        }), 200
+        
     except Exception as e:
         return jsonify({"error": "Internal server error", "details": str(e)}), 500
 
+@weather_bp.route("/cache-stats", methods=["GET"])
+def get_cache_stats():
+    stats = weather_cache.stats()
+    stats["prefetcher"] = prefetcher.stats()
+    return jsonify(stats), 200
+
 def process_forecast_data(forecast_data):
     """Process the 5-day forecast data to extract daily forecasts"""
     daily_forecast = []
@@ -30,6 +30,7 @@ CREATE TABLE IF NOT EXISTS recommendations (
   farmer_id INT NOT NULL,
   input_json JSON NOT NULL,
   recommended_json JSON NOT NULL,
+  model_version VARCHAR(64),
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (farmer_id) REFERENCES farmers(id) ON DELETE CASCADE
 );
@@ -54,6 +55,66 @@ CREATE TABLE IF NOT EXISTS pest_reports (
   predicted_label VARCHAR(128),
   confidence DECIMAL(5,2),
   advisory_json JSON,
+  needs_review BOOLEAN DEFAULT FALSE,
+  model_version VARCHAR(64),
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_pest_reports_needs_review (needs_review),
   FOREIGN KEY (farmer_id) REFERENCES farmers(id) ON DELETE CASCADE
 );
+
+CREATE TABLE IF NOT EXISTS pest_result_cache (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  content_hash CHAR(64) NOT NULL,
+  model_version VARCHAR(64) NOT NULL,
+  image_path VARCHAR(512),
+  predicted_label VARCHAR(128),
+  confidence DOUBLE,
+  advisory_json JSON,
+  predictions_json JSON,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_pest_cache_hash_version (content_hash, model_version),
+  INDEX idx_pest_cache_hash (content_hash)
+);
+
+CREATE TABLE IF NOT EXISTS crop_suitability (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  district VARCHAR(255) NOT NULL,
+  season VARCHAR(16) NOT NULL,
+  soil_type VARCHAR(64) NOT NULL,
+  n SMALLINT NOT NULL,
+  p SMALLINT NOT NULL,
+  k SMALLINT NOT NULL,
+  temperature DOUBLE,
+  humidity DOUBLE,
+  ph DOUBLE,
+  rainfall DOUBLE,
+  ranking_json JSON NOT NULL,
+  model_version VARCHAR(64),
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_crop_suitability_cell (district, season, soil_type, n, p, k)
+);
+
+CREATE TABLE IF NOT EXISTS market_prices (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  state VARCHAR(64) NOT NULL DEFAULT '',
+  district VARCHAR(64) NOT NULL DEFAULT '',
+  market VARCHAR(128) NOT NULL DEFAULT '',
+  commodity VARCHAR(128) NOT NULL,
+  variety VARCHAR(128) NOT NULL DEFAULT '',
+  grade VARCHAR(64) NOT NULL DEFAULT '',
+  arrival_date DATE NOT NULL,
+  min_price DOUBLE,
+  max_price DOUBLE,
+  modal_price DOUBLE NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_market_price_record (commodity, variety, grade, market, district, state, arrival_date),
+  INDEX idx_market_prices_commodity_date (commodity, arrival_date),
+  INDEX idx_market_prices_updated (updated_at)
+);
+
+-- Migrations for databases created before the columns above existed
+-- ALTER TABLE pest_reports ADD COLUMN needs_review BOOLEAN DEFAULT FALSE, ADD INDEX idx_pest_reports_needs_review (needs_review);
+-- ALTER TABLE pest_result_cache ADD COLUMN predictions_json JSON;
+-- ALTER TABLE recommendations ADD COLUMN model_version VARCHAR(64);
+-- ALTER TABLE pest_reports ADD COLUMN model_version VARCHAR(64);
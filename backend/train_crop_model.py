@@ -8,11 +8,13 @@ from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import os
+from compact_forest import compile_forest, save_compact
 
 # Config
 CSV_PATH = "data/crop_data.csv"        # path to your CSV
 OUT_DIR = "ml_models"
 OUT_PIPE = os.path.join(OUT_DIR, "crop_model_pipeline.joblib")
+OUT_COMPACT = os.path.join(OUT_DIR, "crop_model_compact.npz")
 RANDOM_STATE = 42
 
 os.makedirs(OUT_DIR, exist_ok=True)
@@ -69,3 +71,8 @@ obj = {
 }
 joblib.dump(obj, OUT_PIPE)
 print("Saved model pipeline to:", OUT_PIPE)
+
+# 9. Export the compact inference artifact (flattened trees, scaler folded in)
+compact = compile_forest(pipeline, le, features)
+save_compact(OUT_COMPACT, compact)
+print("Saved compact model to:", OUT_COMPACT)
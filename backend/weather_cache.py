@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from caching import SWRCache
+from config import Config
+from http_client import http_client
+
+OPENWEATHER_KEY = os.getenv("OPENWEATHER_KEY", "a63621689253688a2cdd47570e15c520")
+OPENWEATHER_URL = "http://api.openweathermap.org/data/2.5"
+
+
+class WeatherUnavailable(Exception):
+    """Raised when OpenWeather does not return usable data for a location."""
+
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
+
+
+def normalize_district(district):
+    return " ".join((district or "").split()).lower()
+
+
+def location_key(district=None, lat=None, lng=None):
+    """
+    Cache key for a location: coordinates rounded to about 1 km when known,
+    otherwise the normalized district name.
+    """
+    if lat is not None and lng is not None:
+        return ("coord", round(float(lat), 2), round(float(lng), 2))
+    return ("district", normalize_district(district))
+
+
+def location_params(district=None, lat=None, lng=None):
+    if lat is not None and lng is not None:
+        return {"lat": lat, "lon": lng}
+    return {"q": district}
+
+
+class WeatherCache:
+    """
+    Current weather and forecasts per location, shared by the weather
+    endpoint and the recommender. Current conditions and forecasts have
+    separate TTLs; both are served stale while revalidating, concurrent
+    misses for a location make one upstream call, and upstream failures fall
+    back to the last known data.
+    """
+
+    def __init__(self, api_key=OPENWEATHER_KEY, current_ttl=600, forecast_ttl=3600,
+                 stale_ttl=3600, timeout=5, maxsize=1024):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.current = SWRCache(current_ttl, stale_ttl, maxsize=maxsize, name="weather-current")
+        self.forecast = SWRCache(forecast_ttl, stale_ttl, maxsize=maxsize, name="weather-forecast")
+
+    def _request(self, endpoint, district=None, lat=None, lng=None):
+        params = dict(location_params(district, lat, lng), appid=self.api_key, units="metric")
+        return http_client.get(f"{OPENWEATHER_URL}/{endpoint}", params=params, timeout=self.timeout).json()
+
+    def fetch_current(self, district=None, lat=None, lng=None):
+        data = self._request("weather", district, lat, lng)
+        if data.get("cod") != 200:
+            raise WeatherUnavailable("Failed to fetch weather data", data)
+        return data
+
+    def fetch_forecast(self, district=None, lat=None, lng=None):
+        data = self._request("forecast", district, lat, lng)
+        if data.get("cod") != "200":
+            raise WeatherUnavailable("Failed to fetch forecast data", data)
+        return data
+
+    def get_current(self, district=None, lat=None, lng=None):
+        return self.current.get(
+            location_key(district, lat, lng),
+            lambda: self.fetch_current(district, lat, lng)
+        )
+
+    def get_forecast(self, district=None, lat=None, lng=None):
+        return self.forecast.get(
+            location_key(district, lat, lng),
+            lambda: self.fetch_forecast(district, lat, lng)
+        )
+
+    def get_many(self, districts, concurrency=8):
+        """
+        Current weather and forecast for many districts, fetched through the
+        cache with at most `concurrency` districts in flight. Returns
+        {district: (current, forecast)}, with the exception in place of the
+        tuple for districts that failed.
+        """
+        def fetch(district):
+            try:
+                return self.get_current(district=district), self.get_forecast(district=district)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="weather-bulk") as pool:
+            return dict(zip(districts, pool.map(fetch, districts)))
+
+    def warm(self, district, lead=0):
+        """
+        Refreshes a district's entries that would otherwise expire within
+        lead seconds.
+        """
+        key = location_key(district)
+        self.current.warm(key, lambda: self.fetch_current(district), max_age=self.current.ttl - lead)
+        self.forecast.warm(key, lambda: self.fetch_forecast(district), max_age=self.forecast.ttl - lead)
+
+    def stats(self):
+        return {"current": self.current.stats(), "forecast": self.forecast.stats()}
+
+
+def parse_hours(spec):
+    """
+    "5-9" or "5,6,7" -> set of hours of the day.
+    """
+    hours = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            hours.update(range(start, end + 1))
+        elif part:
+            hours.add(int(part))
+    return hours
+
+
+class WeatherPrefetcher:
+    """
+    Keeps the weather cache warm for the busiest districts during the
+    configured hours (the morning peak), so their first requests are cache
+    hits. Every interval seconds it takes the districts from districts_fn
+    (called inside the app context) and refreshes any entry that would expire
+    before the next run, with bounded concurrency.
+    """
+
+    def __init__(self, cache, districts_fn, hours, interval=540, concurrency=8):
+        self.cache = cache
+        self.districts_fn = districts_fn
+        self.hours = parse_hours(hours) if isinstance(hours, str) else set(hours)
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self._app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.last_run = None
+        self.last_count = 0
+        self.last_errors = 0
+
+    def start(self, app):
+        """Starts the prefetch thread once per process (threads do not survive a fork)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._app = app
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._loop, name="weather-prefetcher", daemon=True)
+            thread.start()
+
+    def _loop(self):
+        while True:
+            if datetime.now().hour in self.hours:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Error prefetching weather: {e}")
+            time.sleep(self.interval)
+
+    def run_once(self):
+        with self._app.app_context():
+            districts = self.districts_fn()
+
+        def warm(district):
+            try:
+                self.cache.warm(district, lead=self.interval)
+                return True
+            except Exception as e:
+                print(f"Error prefetching weather for {district}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="weather-prefetch") as pool:
+            results = list(pool.map(warm, districts))
+
+        self.runs += 1
+        self.last_run = time.time()
+        self.last_count = len(results)
+        self.last_errors = results.count(False)
+        return self.last_count
+
+    def stats(self):
+        return {
+            "running": self._pid == os.getpid(),
+            "hours": sorted(self.hours),
+            "interval": self.interval,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "last_count": self.last_count,
+            "last_errors": self.last_errors,
+        }
+
+
+# Shared by all blueprints
+weather_cache = WeatherCache(
+    current_ttl=Config.WEATHER_CURRENT_TTL,
+    forecast_ttl=Config.WEATHER_FORECAST_TTL,
+    stale_ttl=Config.WEATHER_STALE_TTL,
+    timeout=Config.WEATHER_TIMEOUT
+)